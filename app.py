@@ -1,13 +1,15 @@
 import streamlit as st
 import ui_components
-from cv_generator import get_generator, CoverLetterPDF
-from cv_generator_docx import ATSResumeDocx
-from translator_utils import translate_resume_data
-from matcher_utils import calculate_match_score, get_resume_text
+import app_cache
+import profile_store
+import profile_state
+import prerender
+from resume_document import content_hash
 from localization import STRINGS
 import datetime
 import json
 import os
+import uuid
 
 st.set_page_config(page_title="ATS CV Sihirbazı", page_icon="📄", layout="wide")
 
@@ -19,39 +21,32 @@ if 'resume_language' not in st.session_state:
     st.session_state['resume_language'] = 'tr'
 
 if 'data_store' not in st.session_state:
+    # Saved profile is parsed as data (JSON, or the literal in a legacy user_data.py), never imported
     try:
-        from user_data import user_profile
-        # Migration Logic: Check if legacy format (no 'tr'/'en' keys)
-        if 'personal' in user_profile and 'tr' not in user_profile:
-            import copy
-            st.session_state['data_store'] = {
-                'tr': user_profile,
-                'en': copy.deepcopy(user_profile)
-            }
-        else:
-            st.session_state['data_store'] = user_profile
-    except ImportError:
-        empty_profile = {
-            'personal': {},
-            'experience': [],
-            'education': [],
-            'skills': {},
-            'projects': [],
-            'certificates': []
-        }
-        import copy
-        st.session_state['data_store'] = {
-            'tr': empty_profile,
-            'en': copy.deepcopy(empty_profile)
-        }
+        saved_profile = profile_store.store.load()
+    except (OSError, ValueError, SyntaxError) as e:
+        st.error(f"Kayıtlı veri okunamadı: {e}")
+        saved_profile = None
+
+    try:
+        # Migration Logic: legacy format (no 'tr'/'en' keys) becomes the 'tr' profile
+        data_store = profile_store.normalize_store(saved_profile) if saved_profile else profile_store.empty_store()
+        # Typed, validated records; edits bump data_store.version and mark e.g. "tr/experience" dirty
+        data_store = profile_state.observe(data_store, section_depth=2)
+    except profile_state.ProfileValidationError as e:
+        st.error(f"Kayıtlı veri geçersiz: {e}")
+        data_store = profile_state.observe(profile_store.empty_store(), section_depth=2)
+    if 'en' not in data_store:
+        # Shares the Turkish sections until one side is edited
+        data_store.add_variant('en', 'tr')
+    st.session_state['data_store'] = data_store
 
 # Bind active cv_data to selected language
 # This creates a reference, so edits to cv_data update data_store[lang]
 curr_lang = st.session_state['resume_language']
 if curr_lang not in st.session_state['data_store']:
-    # Fallback if key missing
-    import copy
-    st.session_state['data_store'][curr_lang] = copy.deepcopy(st.session_state['data_store'].get('tr', {}))
+    # Fallback if key missing: copy-on-write variant of the Turkish profile
+    st.session_state['data_store'].add_variant(curr_lang, 'tr')
 
 st.session_state['cv_data'] = st.session_state['data_store'][curr_lang]
 
@@ -70,31 +65,51 @@ def get_text(key):
 # Edit States
 if 'edit_exp_idx' not in st.session_state: st.session_state['edit_exp_idx'] = -1
 if 'edit_edu_idx' not in st.session_state: st.session_state['edit_edu_idx'] = -1
+# Identifies this session's background pre-render job
+if 'session_id' not in st.session_state: st.session_state['session_id'] = uuid.uuid4().hex
 
 STEPS = get_text('steps')
 
 # Auto-save function
 def save_cv_data():
-    """Save CV data to user_data.py"""
-    try:
-        user_data_path = os.path.join(os.path.dirname(__file__), 'user_data.py')
-        
-        # Ensure we are saving the latest state of data_store
-        # (cv_data is ref, so it should be up to date)
-        
-        with open(user_data_path, 'w', encoding='utf-8') as f:
-            f.write("user_profile = ")
-            f.write(json.dumps(st.session_state['data_store'], ensure_ascii=False, indent=4))
-            f.write("\n")
+    """Save CV data to user_data.json (debounced, written atomically in the background)"""
+    profile_store.store.save(st.session_state['data_store'])
+    if profile_store.store.last_error:
+        st.error(f"Kaydetme hatası: {profile_store.store.last_error}")
+    else:
         st.toast("✅ Veriler kaydedildi!", icon="🎉")
-    except Exception as e:
-        st.error(f"Kaydetme hatası: {e}")
+
+def autosave():
+    """Saves if the data changed since the last save. Runs at the end of every full rerun and fragment rerun."""
+    # The data store counts its own mutations, so no serialize-and-compare is needed here
+    if 'saved_version' not in st.session_state:
+        st.session_state['saved_version'] = st.session_state['data_store'].version
+    elif st.session_state['data_store'].version != st.session_state['saved_version']:
+        save_cv_data()
+        st.session_state['saved_version'] = st.session_state['data_store'].version
+        # Templates pre-rendered for the old data are stale now
+        prerender.prefetcher.cancel(st.session_state['session_id'])
+        # Dirty sections now mean "changed since the last save"
+        st.session_state['data_store'].tracker.pop_dirty()
+
+def cv_data_hash():
+    """Content hash of cv_data, recomputed only when the data store version changes"""
+    key = (st.session_state['resume_language'], st.session_state['data_store'].version)
+    if st.session_state.get('cv_hash_key') != key:
+        st.session_state['cv_hash'] = content_hash(st.session_state['cv_data'])
+        st.session_state['cv_hash_key'] = key
+    return st.session_state['cv_hash']
 
 def next_step():
     if st.session_state['current_step'] < len(STEPS) - 1:
         st.session_state['current_step'] += 1
     save_cv_data()
 
+def reset_en_editor():
+    """Drops the English editor widget state so the inputs show cv_data_en again"""
+    for key in [k for k in st.session_state.keys() if k.startswith('en_')]:
+        del st.session_state[key]
+
 def prev_step():
     if st.session_state['current_step'] > 0:
         st.session_state['current_step'] -= 1
@@ -114,7 +129,12 @@ with st.sidebar:
     
     # Download
     import json
-    cv_json = json.dumps(st.session_state['cv_data'], ensure_ascii=False, indent=2)
+    # Serialize only when the data changed since the last rerun
+    backup_key = (st.session_state['resume_language'], st.session_state['data_store'].version)
+    if st.session_state.get('cv_json_key') != backup_key:
+        st.session_state['cv_json'] = json.dumps(st.session_state['cv_data'], ensure_ascii=False, indent=2)
+        st.session_state['cv_json_key'] = backup_key
+    cv_json = st.session_state['cv_json']
     st.download_button(
         label=get_text('sidebar_download_backup'),
         data=cv_json,
@@ -145,6 +165,9 @@ with st.sidebar:
         except Exception as e:
             st.error(f"Hata: {e}")
 
+    # Per-cache hit rates, to check the caching layer in production
+    app_cache.render_debug_panel(get_text('sidebar_cache_debug'))
+
 # --- Render Progress Indicator ---
 current_step_idx = st.session_state['current_step']
 current_step_name = STEPS[current_step_idx]
@@ -234,133 +257,139 @@ elif st.session_state['current_step'] == 1:
 # --- Step 2: Experience ---
 elif st.session_state['current_step'] == 2:
     st.info(get_text('s2_info'))
+
+    @st.fragment
+    def experience_editor():
+        """Experience form and list; its widgets rerun only this fragment"""
+        # --- Handle Edit State ---
+        edit_idx = st.session_state['edit_exp_idx']
     
-    # --- Handle Edit State ---
-    edit_idx = st.session_state['edit_exp_idx']
-    
-    # Defaults
-    def_title, def_comp, def_loc, def_start, def_end, def_desc = "", "", "", None, None, ""
-    btn_label = get_text('s2_btn_add')
+        # Defaults
+        def_title, def_comp, def_loc, def_start, def_end, def_desc = "", "", "", None, None, ""
+        btn_label = get_text('s2_btn_add')
     
-    if edit_idx != -1 and edit_idx < len(st.session_state['cv_data']['experience']):
-        # Pre-fill data
-        item = st.session_state['cv_data']['experience'][edit_idx]
-        def_title = item.get('title', '')
-        def_comp = item.get('company', '')
-        def_loc = item.get('location', '')
-        def_desc = item.get('description', '')
+        if edit_idx != -1 and edit_idx < len(st.session_state['cv_data']['experience']):
+            # Pre-fill data
+            item = st.session_state['cv_data']['experience'][edit_idx]
+            def_title = item.get('title', '')
+            def_comp = item.get('company', '')
+            def_loc = item.get('location', '')
+            def_desc = item.get('description', '')
         
-        # Parse Dates
-        try:
-            if item.get('startDate'):
-                # Support both dot and slash
-                s_date = item['startDate'].replace('/', '.')
-                parts = s_date.split('.')
-                def_start = datetime.date(int(parts[1]), int(parts[0]), 1)
-            
-            if item.get('endDate'):
-                if item['endDate'] in ["Devam Ediyor", "Present"]:
-                    def_end = None
-                else:
-                    s_date = item['endDate'].replace('/', '.')
+            # Parse Dates
+            try:
+                if item.get('startDate'):
+                    # Support both dot and slash
+                    s_date = item['startDate'].replace('/', '.')
                     parts = s_date.split('.')
-                    def_end = datetime.date(int(parts[1]), int(parts[0]), 1)
-        except:
-            pass
+                    def_start = datetime.date(int(parts[1]), int(parts[0]), 1)
             
-        btn_label = get_text('s2_btn_update')
-        st.info(f"{get_text('s2_editing')} **{def_title}**")
-        if st.button(get_text('s2_btn_cancel_edit')):
-            st.session_state['edit_exp_idx'] = -1
-            st.rerun()
+                if item.get('endDate'):
+                    if item['endDate'] in ["Devam Ediyor", "Present"]:
+                        def_end = None
+                    else:
+                        s_date = item['endDate'].replace('/', '.')
+                        parts = s_date.split('.')
+                        def_end = datetime.date(int(parts[1]), int(parts[0]), 1)
+            except:
+                pass
+            
+            btn_label = get_text('s2_btn_update')
+            st.info(f"{get_text('s2_editing')} **{def_title}**")
+            if st.button(get_text('s2_btn_cancel_edit')):
+                st.session_state['edit_exp_idx'] = -1
+                st.rerun(scope="fragment")
 
-    # Input Form
-    k_suffix = str(edit_idx)
-    with st.expander(get_text('s2_expander'), expanded=True):
-        title = st.text_input(get_text('s2_job_title'), value=def_title, key=f"exp_title_{k_suffix}")
+        # Input Form
+        k_suffix = str(edit_idx)
+        with st.expander(get_text('s2_expander'), expanded=True):
+            title = st.text_input(get_text('s2_job_title'), value=def_title, key=f"exp_title_{k_suffix}")
         
-        c_comp, c_loc = st.columns(2)
-        company = c_comp.text_input(get_text('s2_company'), value=def_comp, key=f"exp_comp_{k_suffix}")
-        location = c_loc.text_input(get_text('s1_city'), value=def_loc, key=f"exp_loc_{k_suffix}", placeholder="Ankara, Türkiye")
+            c_comp, c_loc = st.columns(2)
+            company = c_comp.text_input(get_text('s2_company'), value=def_comp, key=f"exp_comp_{k_suffix}")
+            location = c_loc.text_input(get_text('s1_city'), value=def_loc, key=f"exp_loc_{k_suffix}", placeholder="Ankara, Türkiye")
         
-        c1, c2 = st.columns(2)
-        start_date = c1.date_input(get_text('s2_start_date'), value=def_start, min_value=datetime.date(1970,1,1), key=f"exp_start_{k_suffix}")
+            c1, c2 = st.columns(2)
+            start_date = c1.date_input(get_text('s2_start_date'), value=def_start, min_value=datetime.date(1970,1,1), key=f"exp_start_{k_suffix}")
         
-        is_current = c2.checkbox(get_text('s2_current_job'), value=(def_end is None and edit_idx != -1) if edit_idx != -1 else True, key=f"exp_curr_{k_suffix}")
+            is_current = c2.checkbox(get_text('s2_current_job'), value=(def_end is None and edit_idx != -1) if edit_idx != -1 else True, key=f"exp_curr_{k_suffix}")
         
-        if not is_current:
-            end_date_val = c2.date_input(get_text('s2_end_date'), value=def_end, key=f"exp_end_{k_suffix}")
-            end_date_str = end_date_val.strftime("%m/%Y") if end_date_val else ""
-        else:
-            end_date_str = "Present" if st.session_state.get('language') == 'en' else "Devam Ediyor"
+            if not is_current:
+                end_date_val = c2.date_input(get_text('s2_end_date'), value=def_end, key=f"exp_end_{k_suffix}")
+                end_date_str = end_date_val.strftime("%m/%Y") if end_date_val else ""
+            else:
+                end_date_str = "Present" if st.session_state.get('language') == 'en' else "Devam Ediyor"
             
-        start_date_str = start_date.strftime("%m/%Y") if start_date else ""
+            start_date_str = start_date.strftime("%m/%Y") if start_date else ""
         
-        with st.expander(get_text('s2_desc_hint')):
-            st.markdown("""
-            **Etki Yaratan Fiiller:**
-            *   *Yönetti, Geliştirdi, Optimize Etti, Tasarladı, Kurdu*
-            *   *Analiz Etti, Artırdı, Azalttı, Liderlik Etti, Koordine Etti*
-            """)
+            with st.expander(get_text('s2_desc_hint')):
+                st.markdown("""
+                **Etki Yaratan Fiiller:**
+                *   *Yönetti, Geliştirdi, Optimize Etti, Tasarladı, Kurdu*
+                *   *Analiz Etti, Artırdı, Azalttı, Liderlik Etti, Koordine Etti*
+                """)
         
-        desc = st.text_area(get_text('s2_desc_label'), value=def_desc, height=150, key=f"exp_desc_{k_suffix}")
+            desc = st.text_area(get_text('s2_desc_label'), value=def_desc, height=150, key=f"exp_desc_{k_suffix}")
         
-        # Metric Check logic (kept same)
-        import re
-        if desc and not re.search(r'\d+|%', desc):
-             st.warning("⚠️ **Geliştirme Önerisi:** Sayısal veri (KPI, %) ekleyin.")
-
-        # Text Enhancer Button (kept same)
-        c_desc1, c_desc2 = st.columns([1,1])
-        if c_desc2.button(get_text('s2_btn_enhance')):
-             # ... (Same logic as before, omitted for brevity, user has library installed?)
-             # Assuming text_enhancer import logic is same
-             pass
-
-        if c_desc1.button(btn_label):
-            if title and company and start_date:
-                new_item = {
-                    'title': title,
-                    'company': company,
-                    'location': location,
-                    'startDate': start_date_str,
-                    'endDate': end_date_str,
-                    'description': desc
-                }
+            # Metric Check logic (kept same)
+            import re
+            if desc and not re.search(r'\d+|%', desc):
+                 st.warning("⚠️ **Geliştirme Önerisi:** Sayısal veri (KPI, %) ekleyin.")
+
+            # Text Enhancer Button (kept same)
+            c_desc1, c_desc2 = st.columns([1,1])
+            if c_desc2.button(get_text('s2_btn_enhance')):
+                 # ... (Same logic as before, omitted for brevity, user has library installed?)
+                 # Assuming text_enhancer import logic is same
+                 pass
+
+            if c_desc1.button(btn_label):
+                if title and company and start_date:
+                    new_item = {
+                        'title': title,
+                        'company': company,
+                        'location': location,
+                        'startDate': start_date_str,
+                        'endDate': end_date_str,
+                        'description': desc
+                    }
                 
-                if edit_idx != -1:
-                    # Update Existing
-                    st.session_state['cv_data']['experience'][edit_idx] = new_item
-                    st.success(get_text('s2_btn_update') + "!")
-                    st.session_state['edit_exp_idx'] = -1
-                else:
-                    # Add New
-                    st.session_state['cv_data']['experience'].append(new_item)
-                    st.success(get_text('s2_btn_add') + "!")
+                    if edit_idx != -1:
+                        # Update Existing
+                        st.session_state['cv_data']['experience'][edit_idx] = new_item
+                        st.success(get_text('s2_btn_update') + "!")
+                        st.session_state['edit_exp_idx'] = -1
+                    else:
+                        # Add New
+                        st.session_state['cv_data']['experience'].append(new_item)
+                        st.success(get_text('s2_btn_add') + "!")
                 
-                st.rerun()
-            else:
-                st.error("Lütfen en azından Unvan ve Şirket girin.")
+                    st.rerun(scope="fragment")
+                else:
+                    st.error("Lütfen en azından Unvan ve Şirket girin.")
 
-    # Show Items with Edit Button
-    st.write(get_text('s2_added_header'))
-    if not st.session_state['cv_data']['experience']:
-        st.caption(get_text('s2_no_exp'))
-    else:
-        for i, exp in enumerate(st.session_state['cv_data']['experience']):
-            with st.container():
-                cols = st.columns([4, 1, 1])
-                cols[0].markdown(f"**{exp['title']}** @ {exp['company']}")
+        # Show Items with Edit Button
+        st.write(get_text('s2_added_header'))
+        if not st.session_state['cv_data']['experience']:
+            st.caption(get_text('s2_no_exp'))
+        else:
+            for i, exp in enumerate(st.session_state['cv_data']['experience']):
+                with st.container():
+                    cols = st.columns([4, 1, 1])
+                    cols[0].markdown(f"**{exp['title']}** @ {exp['company']}")
                 
-                if cols[1].button(get_text('btn_edit'), key=f"edit_exp_{i}"):
-                    st.session_state['edit_exp_idx'] = i
-                    st.rerun()
+                    if cols[1].button(get_text('btn_edit'), key=f"edit_exp_{i}"):
+                        st.session_state['edit_exp_idx'] = i
+                        st.rerun(scope="fragment")
                     
-                if cols[2].button(get_text('btn_delete'), key=f"del_exp_{i}"):
-                    st.session_state['cv_data']['experience'].pop(i)
-                    if st.session_state['edit_exp_idx'] == i: st.session_state['edit_exp_idx'] = -1
-                    st.rerun()
-            st.divider()
+                    if cols[2].button(get_text('btn_delete'), key=f"del_exp_{i}"):
+                        st.session_state['cv_data']['experience'].pop(i)
+                        if st.session_state['edit_exp_idx'] == i: st.session_state['edit_exp_idx'] = -1
+                        st.rerun(scope="fragment")
+                st.divider()
+        autosave()
+
+    experience_editor()
 
     c1, c2 = st.columns([1, 5])
     c1.button(get_text('btn_prev'), on_click=prev_step)
@@ -369,92 +398,98 @@ elif st.session_state['current_step'] == 2:
 # --- Step 3: Education ---
 elif st.session_state['current_step'] == 3:
     st.info(get_text('s3_info'))
+
+    @st.fragment
+    def education_editor():
+        """Education form and list; its widgets rerun only this fragment"""
+        # --- Edit State Logic ---
+        edit_idx = st.session_state['edit_edu_idx']
+        def_school, def_degree, def_start, def_end, def_gpa, def_rank = "", "", None, None, "", ""
+        btn_label = get_text('s3_btn_add')
     
-    # --- Edit State Logic ---
-    edit_idx = st.session_state['edit_edu_idx']
-    def_school, def_degree, def_start, def_end, def_gpa, def_rank = "", "", None, None, "", ""
-    btn_label = get_text('s3_btn_add')
-    
-    if edit_idx != -1 and edit_idx < len(st.session_state['cv_data']['education']):
-        item = st.session_state['cv_data']['education'][edit_idx]
-        def_school = item.get('school', '')
-        def_degree = item.get('degree', '')
-        def_gpa = item.get('gpa', '')
-        def_rank = item.get('rank', '')
+        if edit_idx != -1 and edit_idx < len(st.session_state['cv_data']['education']):
+            item = st.session_state['cv_data']['education'][edit_idx]
+            def_school = item.get('school', '')
+            def_degree = item.get('degree', '')
+            def_gpa = item.get('gpa', '')
+            def_rank = item.get('rank', '')
         
-        # Try to parse Year string "YYYY - YYYY"
-        try:
-            if item.get('year') and '-' in item['year']:
-                y_start, y_end = item['year'].split('-')
-                def_start = datetime.date(int(y_start.strip()), 1, 1)
-                def_end = datetime.date(int(y_end.strip()), 1, 1)
-        except:
-            pass
+            # Try to parse Year string "YYYY - YYYY"
+            try:
+                if item.get('year') and '-' in item['year']:
+                    y_start, y_end = item['year'].split('-')
+                    def_start = datetime.date(int(y_start.strip()), 1, 1)
+                    def_end = datetime.date(int(y_end.strip()), 1, 1)
+            except:
+                pass
             
-        btn_label = get_text('s3_btn_update')
-        st.info(f"{get_text('s2_editing')} **{def_school}**")
-        if st.button(get_text('s2_btn_cancel_edit'), key="cancel_edu"):
-            st.session_state['edit_edu_idx'] = -1
-            st.rerun()
+            btn_label = get_text('s3_btn_update')
+            st.info(f"{get_text('s2_editing')} **{def_school}**")
+            if st.button(get_text('s2_btn_cancel_edit'), key="cancel_edu"):
+                st.session_state['edit_edu_idx'] = -1
+                st.rerun(scope="fragment")
     
-    with st.expander(get_text('s3_expander'), expanded=True):
-        k_suffix = str(edit_idx)
-        col_s1, col_s2 = st.columns(2)
-        school = col_s1.text_input(get_text('s3_school'), value=def_school, key=f"edu_school_{k_suffix}")
-        degree = col_s2.text_input(get_text('s3_degree'), value=def_degree, key=f"edu_degree_{k_suffix}")
+        with st.expander(get_text('s3_expander'), expanded=True):
+            k_suffix = str(edit_idx)
+            col_s1, col_s2 = st.columns(2)
+            school = col_s1.text_input(get_text('s3_school'), value=def_school, key=f"edu_school_{k_suffix}")
+            degree = col_s2.text_input(get_text('s3_degree'), value=def_degree, key=f"edu_degree_{k_suffix}")
         
-        # GPA and Rank Row
-        col_g1, col_g2 = st.columns(2)
-        gpa = col_g1.text_input(get_text('s3_gpa'), value=def_gpa, placeholder="3.43/4.00", key=f"edu_gpa_{k_suffix}")
-        rank = col_g2.text_input(get_text('s3_rank'), value=def_rank, placeholder=get_text('s3_rank_placeholder'), key=f"edu_rank_{k_suffix}")
+            # GPA and Rank Row
+            col_g1, col_g2 = st.columns(2)
+            gpa = col_g1.text_input(get_text('s3_gpa'), value=def_gpa, placeholder="3.43/4.00", key=f"edu_gpa_{k_suffix}")
+            rank = col_g2.text_input(get_text('s3_rank'), value=def_rank, placeholder=get_text('s3_rank_placeholder'), key=f"edu_rank_{k_suffix}")
         
-        c1, c2 = st.columns(2)
-        start_edu = c1.date_input(get_text('s3_start_date'), key=f"edu_start_{k_suffix}", value=def_start, min_value=datetime.date(1950,1,1))
-        end_edu = c2.date_input(get_text('s3_end_date'), key=f"edu_end_{k_suffix}", value=def_end)
+            c1, c2 = st.columns(2)
+            start_edu = c1.date_input(get_text('s3_start_date'), key=f"edu_start_{k_suffix}", value=def_start, min_value=datetime.date(1950,1,1))
+            end_edu = c2.date_input(get_text('s3_end_date'), key=f"edu_end_{k_suffix}", value=def_end)
         
-        year_str = ""
-        if start_edu and end_edu:
-             year_str = f"{start_edu.year} - {end_edu.year}"
-
-        if st.button(btn_label, key="add_edu_btn"):
-            if school and degree:
-                new_item = {
-                    'school': school,
-                    'degree': degree,
-                    'year': year_str,
-                    'gpa': gpa,
-                    'rank': rank
-                }
+            year_str = ""
+            if start_edu and end_edu:
+                 year_str = f"{start_edu.year} - {end_edu.year}"
+
+            if st.button(btn_label, key="add_edu_btn"):
+                if school and degree:
+                    new_item = {
+                        'school': school,
+                        'degree': degree,
+                        'year': year_str,
+                        'gpa': gpa,
+                        'rank': rank
+                    }
                 
-                if edit_idx != -1:
-                    st.session_state['cv_data']['education'][edit_idx] = new_item
-                    st.success(get_text('s3_btn_update') + "!")
-                    st.session_state['edit_edu_idx'] = -1
+                    if edit_idx != -1:
+                        st.session_state['cv_data']['education'][edit_idx] = new_item
+                        st.success(get_text('s3_btn_update') + "!")
+                        st.session_state['edit_edu_idx'] = -1
+                    else:
+                        st.session_state['cv_data']['education'].append(new_item)
+                        st.success(get_text('s3_btn_add') + "!")
+                    st.rerun(scope="fragment")
                 else:
-                    st.session_state['cv_data']['education'].append(new_item)
-                    st.success(get_text('s3_btn_add') + "!")
-                st.rerun()
-            else:
-                st.error(get_text('s3_error_required'))
+                    st.error(get_text('s3_error_required'))
 
-    st.write(get_text('s3_added_header'))
-    if not st.session_state['cv_data']['education']:
-        st.caption(get_text('s3_no_edu'))
-    else:
-        for i, edu in enumerate(st.session_state['cv_data']['education']):
-            with st.container():
-                cols = st.columns([4, 1, 1])
-                cols[0].markdown(f"**{edu['school']}** - {edu['degree']}")
+        st.write(get_text('s3_added_header'))
+        if not st.session_state['cv_data']['education']:
+            st.caption(get_text('s3_no_edu'))
+        else:
+            for i, edu in enumerate(st.session_state['cv_data']['education']):
+                with st.container():
+                    cols = st.columns([4, 1, 1])
+                    cols[0].markdown(f"**{edu['school']}** - {edu['degree']}")
                 
-                if cols[1].button(get_text('btn_edit'), key=f"edit_edu_{i}"):
-                    st.session_state['edit_edu_idx'] = i
-                    st.rerun()
+                    if cols[1].button(get_text('btn_edit'), key=f"edit_edu_{i}"):
+                        st.session_state['edit_edu_idx'] = i
+                        st.rerun(scope="fragment")
                 
-                if cols[2].button(get_text('btn_delete'), key=f"del_edu_{i}"):
-                    st.session_state['cv_data']['education'].pop(i)
-                    if st.session_state['edit_edu_idx'] == i: st.session_state['edit_edu_idx'] = -1
-                    st.rerun()
-            st.divider()
+                    if cols[2].button(get_text('btn_delete'), key=f"del_edu_{i}"):
+                        st.session_state['cv_data']['education'].pop(i)
+                        if st.session_state['edit_edu_idx'] == i: st.session_state['edit_edu_idx'] = -1
+                        st.rerun(scope="fragment")
+                st.divider()
+        autosave()
+
+    education_editor()
 
     c1, c2 = st.columns([1, 5])
     c1.button(get_text('btn_prev'), on_click=prev_step)
@@ -617,44 +652,143 @@ elif st.session_state['current_step'] == 6:
 # --- Step 7: Job Analysis (Shifted from 5) ---
 elif st.session_state['current_step'] == 7:
     st.info(get_text('s5_info'))
-    
-    job_desc = st.text_area(get_text('s5_text_area'), height=200, placeholder=get_text('s5_placeholder'), key="job_desc_input")
-    
-    if job_desc:
-        resume_text = get_resume_text(st.session_state['cv_data'])
-        score, matched, missing = calculate_match_score(resume_text, job_desc)
-        
-        # Custom UI Result Display
-        
-        c1, c2 = st.columns([1, 2])
-        with c1:
-            st.markdown(f"""
-            <div style="background: white; padding: 1.5rem; border-radius: 12px; border: 1px solid #E5E7EB; text-align: center;">
-                <h3 style="margin: 0; color: #4F46E5; font-size: 2.5rem;">%{score}</h3>
-                <p style="margin: 0; color: #6B7280; font-size: 0.9rem;">{get_text('s5_match_score')}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with c2:
-            st.markdown(ui_components.get_job_matcher_results_html({'matched': matched, 'missing': missing}), unsafe_allow_html=True)
-    
+
+    @st.fragment
+    def job_analysis_panel():
+        """JD input and match result; typing reruns only this fragment, which tokenizes and scores just the JD"""
+        job_desc = st.text_area(get_text('s5_text_area'), height=200, placeholder=get_text('s5_placeholder'), key="job_desc_input")
+
+        if job_desc:
+            score, matched, missing = app_cache.match_score(
+                st.session_state['cv_data'], job_desc,
+                language=st.session_state.get('resume_language', 'tr'), data_hash=cv_data_hash()
+            )
+
+            # Custom UI Result Display
+
+            c1, c2 = st.columns([1, 2])
+            with c1:
+                st.markdown(f"""
+                <div style="background: white; padding: 1.5rem; border-radius: 12px; border: 1px solid #E5E7EB; text-align: center;">
+                    <h3 style="margin: 0; color: #4F46E5; font-size: 2.5rem;">%{score}</h3>
+                    <p style="margin: 0; color: #6B7280; font-size: 0.9rem;">{get_text('s5_match_score')}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with c2:
+                st.markdown(ui_components.get_job_matcher_results_html({'matched': matched, 'missing': missing}), unsafe_allow_html=True)
+
+            corpus = app_cache.jd_index()
+            if corpus is not None:
+                st.caption(get_text('s5_weighted').format(count=corpus.n_docs))
+
+            # Lives in the fragment so it appears as soon as a JD is typed; changing the step needs a full rerun
+            if st.button(get_text('s5_btn_analyze'), type="primary"):
+                next_step()
+                st.rerun()
+
+    job_analysis_panel()
+
+    @st.fragment
+    def jd_corpus_panel():
+        """Saved postings ranked against the profile in one batch; uploads rerun only this fragment"""
+        lang = st.session_state.get('resume_language', 'tr')
+        with st.expander(get_text('s5_corpus_title')):
+            uploads = st.file_uploader(get_text('s5_corpus_upload'), type=['txt', 'jsonl'], accept_multiple_files=True, key="jd_corpus_upload")
+            if uploads and st.button(get_text('s5_corpus_btn_add')):
+                import jd_index
+                records = (
+                    record
+                    for upload in uploads
+                    for record in jd_index.iter_records(upload.name, upload.getvalue().decode('utf-8').splitlines(keepends=True))
+                )
+                added = jd_index.add_records(jd_index.open_index(), records, lang)
+                st.success(get_text('s5_corpus_added').format(count=added))
+
+            rows = app_cache.rank_job_descriptions(st.session_state['cv_data'], lang, data_hash=cv_data_hash())
+            if not rows:
+                st.caption(get_text('s5_corpus_empty'))
+                return
+            st.dataframe(
+                [
+                    {
+                        get_text('s5_corpus_col_job'): row['title'],
+                        get_text('s5_match_score'): row['score'],
+                        get_text('s5_corpus_col_matched'): ", ".join(row['matched']),
+                        get_text('s5_corpus_col_missing'): ", ".join(row['missing'])
+                    }
+                    for row in rows
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+
+    jd_corpus_panel()
+
     st.divider()
-    c1, c2, c3 = st.columns([1, 2, 2])
+    c1, c2 = st.columns([1, 4])
     with c1:
         st.button(get_text('btn_prev'), on_click=prev_step)
     with c2:
         st.button(get_text('s5_btn_skip'), on_click=next_step, type="secondary")
-    with c3:
-        if job_desc:
-            st.button(get_text('s5_btn_analyze'), on_click=next_step, type="primary")
-        else:
-             # Just a placeholder to align, or show nothing
-             pass
 
 # --- Step 8: Template Selection (Shifted from 6) ---
 elif st.session_state['current_step'] == 8:
     st.info(get_text('s6_info'))
-    
+
+    # Fonts, keyword automaton and translation memory are built once per server process,
+    # here rather than at startup so the first steps never load fpdf
+    app_cache.warm_up()
+    # Export worker processes start now, so step 9 does not wait for them
+    import export
+    export.warm_up()
+
+    # Every template (and the DOCX) renders in the background into the shared render cache,
+    # so the cards get real previews and step 9 opens without rendering
+    prefetch_job = prerender.prefetcher.prefetch(
+        st.session_state['session_id'],
+        (st.session_state['resume_language'], st.session_state['data_store'].version),
+        st.session_state['cv_data'],
+        language=st.session_state.get('resume_language', 'tr')
+    )
+
+    previews_polling = not prefetch_job.done
+
+    # The preview slots live outside the polling fragment. A slot is only redrawn when its
+    # PDF's content hash changes, so polling does not send the finished previews every second.
+    preview_slots = {}
+    for col, template in zip(st.columns(3), prerender.TEMPLATES):
+        with col:
+            preview_slots[template] = st.empty()
+    # The slots are new on every full run and start out empty
+    st.session_state['preview_hashes'] = {}
+
+    def show_previews():
+        import pdf_utils
+        shown = st.session_state['preview_hashes']
+        status = prefetch_job.status()
+        for template, slot in preview_slots.items():
+            if status.get(template) == prerender.DONE:
+                pdf_utils.display_pdf_once(
+                    slot, shown, template, prefetch_job.futures[template].result(), height=320, thumbnail=True
+                )
+            elif status.get(template) in (prerender.PENDING, prerender.RUNNING) and template not in shown:
+                slot.caption(get_text('s6_rendering'))
+                shown[template] = None
+
+    show_previews()
+
+    if previews_polling:
+        @st.fragment(run_every=1.0)
+        def poll_previews():
+            """Fills the preview slots as the background renders finish"""
+            show_previews()
+            # Rerun the page once so polling stops
+            if prefetch_job.done:
+                st.rerun()
+
+        poll_previews()
+
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -688,20 +822,20 @@ elif st.session_state['current_step'] == 9:
 
     # --- Live PDF Preview (New Feature) ---
     import pdf_utils
+    import export
     st.subheader(get_text('s7_preview_title'))
-    
-    # Generate PDF for Preview
-    # Ensure language is correct for preview
-    preview_lang = st.session_state.get('resume_language', 'tr')
-    preview_pdf = get_generator(st.session_state['selected_template'], language=preview_lang)
-    
-    # If using English preview but data is not translated yet, it might look mixed.
-    # But usually we generate from main data.
-    preview_pdf.generate(st.session_state['cv_data'])
-    preview_bytes = preview_pdf.get_pdf_bytes()
-    
+
+    # The files render concurrently in the background. Each slot below shows a placeholder
+    # and is filled as soon as its file is ready; a failing file does not block the others.
+    # Use current language. The preview and the PDF download are the same file.
+    pdf_lang = st.session_state.get('resume_language', 'tr')
+    exports = export.ExportCoordinator()
+    exports.submit_pdf('pdf', st.session_state['cv_data'], st.session_state['selected_template'], language=pdf_lang)
+    exports.submit_docx('docx', st.session_state['cv_data'])
+
     with st.expander(get_text('s7_preview_expander'), expanded=True):
-        pdf_utils.display_pdf(preview_bytes)
+        preview_slot = st.empty()
+        preview_slot.caption(get_text('s6_rendering'))
 
     st.divider()
 
@@ -720,20 +854,8 @@ elif st.session_state['current_step'] == 9:
         st.markdown("### 📄 PDF")
         st.caption(get_text('s7_pdf_desc'))
 
-        # Generate PDF
-        # Use current language
-        pdf_lang = st.session_state.get('resume_language', 'tr')
-        pdf = get_generator(st.session_state['selected_template'], language=pdf_lang)
-        pdf.generate(st.session_state['cv_data'])
-        pdf_bytes = bytes(pdf.get_pdf_bytes())
-
-        st.download_button(
-            label=get_text('s7_btn_download_pdf'),
-            data=pdf_bytes,
-            file_name=f"CV_{st.session_state['cv_data']['personal'].get('fullName', 'resume')}_{st.session_state['selected_template']}.pdf",
-            mime="application/pdf",
-            use_container_width=True
-        )
+        pdf_slot = st.empty()
+        pdf_slot.caption(get_text('s6_rendering'))
 
         save_cv_data()
 
@@ -741,19 +863,9 @@ elif st.session_state['current_step'] == 9:
         st.markdown("### 📝 DOCX")
         st.caption(get_text('s7_docx_desc'))
 
-        # Generate DOCX
-        docx = ATSResumeDocx()
-        docx.generate(st.session_state['cv_data'])
-        docx_bytes = bytes(docx.get_bytes())
-
-        st.download_button(
-            label=get_text('s7_btn_download_docx'),
-            data=docx_bytes,
-            file_name=f"CV_{st.session_state['cv_data']['personal'].get('fullName', 'resume')}.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            use_container_width=True
-        )
-        
+        docx_slot = st.empty()
+        docx_slot.caption(get_text('s6_rendering'))
+
     st.divider()
     
     # Translation Section
@@ -769,13 +881,18 @@ elif st.session_state['current_step'] == 9:
         if st.button(get_text('s7_btn_prepare_en')):
              with st.spinner(get_text('s7_translating')):
                 try:
-                    st.session_state['cv_data_en'] = translate_resume_data(st.session_state['cv_data'])
+                    # The source hashes stay beside the English profile, out of its renders
+                    st.session_state['cv_data_en'], st.session_state['cv_data_en_sources'] = (
+                        app_cache.translate(st.session_state['cv_data'])
+                    )
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
 
     if 'cv_data_en' in st.session_state:
         st.success(get_text('s7_success_trans'))
+        if 'trans_sync_count' in st.session_state:
+            st.info(get_text('s7_sync_done').format(count=st.session_state.pop('trans_sync_count')))
         
         with st.expander(get_text('s7_expander_edit_en'), expanded=False):
             # Personal
@@ -814,25 +931,36 @@ elif st.session_state['current_step'] == 9:
                     new_val = st.text_input(f"{key}", value=val, key=f"en_skill_{key}")
                     st.session_state['cv_data_en']['skills'][key] = new_val
 
-            if st.button(get_text('s7_btn_reset_trans')):
+            c_sync, c_reset = st.columns(2)
+            # Only fields whose Turkish source changed are re-translated, manual edits stay
+            if c_sync.button(get_text('s7_btn_sync_trans')):
+                with st.spinner(get_text('s7_translating')):
+                    try:
+                        # Imported lazily, the translator is only needed from here on
+                        from translator_utils import sync_translation
+                        synced, count = sync_translation(
+                            st.session_state['cv_data'], st.session_state['cv_data_en'],
+                            sources=st.session_state.setdefault('cv_data_en_sources', {}),
+                            backend=app_cache.translator_backend(), memory=app_cache.translation_memory()
+                        )
+                        st.session_state['cv_data_en'] = synced
+                        st.session_state['trans_sync_count'] = count
+                        reset_en_editor()
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}")
+
+            if c_reset.button(get_text('s7_btn_reset_trans')):
                 del st.session_state['cv_data_en']
+                st.session_state.pop('cv_data_en_sources', None)
+                reset_en_editor()
                 st.rerun()
 
-        # Generate PDF Button from Edited Data
-        try:
-            pdf_en = get_generator(st.session_state['selected_template'], language='en')
-            pdf_en.generate(st.session_state['cv_data_en'])
-            pdf_en_bytes = bytes(pdf_en.get_pdf_bytes())
-
-            st.download_button(
-                label=get_text('s7_btn_download_en'),
-                data=pdf_en_bytes,
-                file_name=f"Resume_{st.session_state['cv_data']['personal'].get('fullName', 'resume')}_EN.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
-        except Exception as e:
-            st.error(f"Error: {e}")
+        # Generate PDF Button from Edited Data (submitted after the editor wrote its changes back)
+        # English text runs longer, shrink it to one page instead of spilling over
+        exports.submit_pdf('pdf_en', st.session_state['cv_data_en'], st.session_state['selected_template'], language='en', fit_pages=1)
+        en_slot = st.empty()
+        en_slot.caption(get_text('s6_rendering'))
 
     st.divider()
 
@@ -843,11 +971,45 @@ elif st.session_state['current_step'] == 9:
         save_cv_data()
         st.rerun()
 
+    # Fill the slots in the order the files finish
+    full_name = st.session_state['cv_data']['personal'].get('fullName', 'resume')
+    for name, file_bytes, error in exports.as_completed():
+        if name == 'pdf':
+            if error is not None:
+                preview_slot.error(f"Error: {error}")
+                pdf_slot.error(f"Error: {error}")
+                continue
+            with preview_slot.container():
+                pdf_utils.display_pdf(file_bytes)
+            pdf_slot.download_button(
+                label=get_text('s7_btn_download_pdf'),
+                data=file_bytes,
+                file_name=f"CV_{full_name}_{st.session_state['selected_template']}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+        elif name == 'docx':
+            if error is not None:
+                docx_slot.error(f"Error: {error}")
+                continue
+            docx_slot.download_button(
+                label=get_text('s7_btn_download_docx'),
+                data=file_bytes,
+                file_name=f"CV_{full_name}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
+            )
+        elif name == 'pdf_en':
+            if error is not None:
+                en_slot.error(f"Error: {error}")
+                continue
+            en_slot.download_button(
+                label=get_text('s7_btn_download_en'),
+                data=file_bytes,
+                file_name=f"Resume_{full_name}_EN.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+
 # Auto-save mechanism - track changes and save automatically
-if 'last_cv_data' not in st.session_state:
-    st.session_state['last_cv_data'] = json.dumps(st.session_state['cv_data'], ensure_ascii=False, sort_keys=True)
-else:
-    current_data_str = json.dumps(st.session_state['cv_data'], ensure_ascii=False, sort_keys=True)
-    if current_data_str != st.session_state['last_cv_data']:
-        save_cv_data()
-        st.session_state['last_cv_data'] = current_data_str
+autosave()
@@ -0,0 +1,239 @@
+"""
+Streamlit caching layer for the app.
+Process-wide resources (fonts, keyword automaton, translation memory, translator client)
+are created once per server with st.cache_resource. Per-input results (match scores,
+translations) are cached with st.cache_data by content hash, with a TTL and an entry
+limit; rendered files live in render_cache, shared with the export workers. Every cache
+counts calls and misses for the sidebar debug panel.
+"""
+import threading
+
+import streamlit as st
+
+import render_cache
+from resume_document import compile_resume, content_hash
+
+RESULT_TTL = 60 * 60  # seconds
+RESULT_MAX_ENTRIES = 256
+
+_stats = {}  # cache name -> [calls, misses]
+_created = set()  # process-wide resources built so far
+_stats_lock = threading.Lock()
+
+
+def _count(name, call=0, miss=0):
+    with _stats_lock:
+        entry = _stats.setdefault(name, [0, 0])
+        entry[0] += call
+        entry[1] += miss
+
+
+def stats():
+    """Returns {cache name: {'calls', 'hits', 'misses', 'hit_rate'}}"""
+    with _stats_lock:
+        snapshot = {name: tuple(values) for name, values in _stats.items()}
+    result = {}
+    for name, (calls, misses) in sorted(snapshot.items()):
+        hits = max(calls - misses, 0)
+        result[name] = {
+            'calls': calls,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / calls if calls else 0.0
+        }
+    return result
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+# --- Process-wide resources ---
+# The cached function runs once per server process; the public wrapper counts calls.
+
+@st.cache_resource(show_spinner=False)
+def _font_registry():
+    import font_registry as registry_module
+    _count('resource:fonts', miss=1)
+    _created.add('fonts')
+    return registry_module.registry.preload()
+
+
+def font_registry():
+    """Main fonts parsed once; every generator attaches them from memory."""
+    _count('resource:fonts', call=1)
+    return _font_registry()
+
+
+@st.cache_resource(show_spinner=False)
+def _keyword_automaton():
+    from ats_keyword_analyzer import get_keyword_automaton
+    _count('resource:keyword_automaton', miss=1)
+    _created.add('keyword_automaton')
+    return get_keyword_automaton()
+
+
+def keyword_automaton():
+    _count('resource:keyword_automaton', call=1)
+    return _keyword_automaton()
+
+
+@st.cache_resource(show_spinner=False)
+def _translation_memory():
+    import translation_memory as memory_module
+    _count('resource:translation_memory', miss=1)
+    _created.add('translation_memory')
+    return memory_module.get_memory()
+
+
+def translation_memory():
+    _count('resource:translation_memory', call=1)
+    return _translation_memory()
+
+
+@st.cache_resource(show_spinner=False)
+def _translator_backend():
+    from translator_utils import GoogleBackend
+    _count('resource:translator', miss=1)
+    _created.add('translator')
+    return GoogleBackend()
+
+
+def translator_backend():
+    _count('resource:translator', call=1)
+    return _translator_backend()
+
+
+def warm_up():
+    """Creates the shared resources; cheap after the first call in the process."""
+    font_registry()
+    keyword_automaton()
+    translation_memory()
+
+
+# --- Per-input results ---
+# Arguments starting with "_" are not hashed by Streamlit; the content hash stands in for them.
+
+@st.cache_data(ttl=RESULT_TTL, max_entries=RESULT_MAX_ENTRIES, show_spinner=False)
+def _resume_keywords(data_hash, language, _data):
+    from matcher_utils import get_resume_text, resume_terms
+    _count('resume_keywords', miss=1)
+    return resume_terms(get_resume_text(compile_resume(_data, data_hash=data_hash)), language)
+
+
+def resume_keywords(data, language='tr', data_hash=None):
+    """Term set (words and phrases) of the profile, tokenized once per profile content."""
+    _count('resume_keywords', call=1)
+    return _resume_keywords(data_hash or content_hash(data), language, data)
+
+
+def jd_index():
+    """Local JD corpus index (None without one); sees JDs added by the CLI since the last call."""
+    import jd_index as jd_index_module
+    return jd_index_module.get_index()
+
+
+@st.cache_data(ttl=RESULT_TTL, max_entries=RESULT_MAX_ENTRIES, show_spinner=False)
+def _match_score(data_hash, job_desc, language, index_generation, _index, _data):
+    from matcher_utils import calculate_match_score
+    _count('match_score', miss=1)
+    keywords = resume_keywords(_data, language, data_hash=data_hash)
+    return calculate_match_score(None, job_desc, language, resume_keywords=keywords, index=_index)
+
+
+def match_score(data, job_desc, language='tr', data_hash=None):
+    """
+    calculate_match_score(get_resume_text(data), job_desc), cached per (profile, JD, corpus).
+    A new JD only tokenizes the JD. Pass `data_hash` (content_hash(data)) when the
+    caller already knows it, so the profile is not serialized on every call.
+    Terms are IDF-weighted when a local JD corpus index exists.
+    """
+    _count('match_score', call=1)
+    index = jd_index()
+    generation = index.generation if index is not None else 0
+    return _match_score(data_hash or content_hash(data), job_desc, language, generation, index, data)
+
+
+@st.cache_data(ttl=RESULT_TTL, max_entries=RESULT_MAX_ENTRIES, show_spinner=False)
+def _rank_job_descriptions(data_hash, language, index_generation, top, _index, _data):
+    import batch_match
+    _count('jd_ranking', miss=1)
+    keywords = resume_keywords(_data, language, data_hash=data_hash)
+    return batch_match.rank_job_descriptions(keywords, _index, top, language)
+
+
+def rank_job_descriptions(data, language='tr', data_hash=None, top=20):
+    """
+    The local JD corpus ranked for the profile (batch_match), [] without a corpus.
+    Cached per (profile, corpus generation); the term-document matrix is built once per generation.
+    """
+    _count('jd_ranking', call=1)
+    index = jd_index()
+    if index is None:
+        return []
+    return _rank_job_descriptions(data_hash or content_hash(data), language, index.generation, top, index, data)
+
+
+@st.cache_data(ttl=RESULT_TTL, max_entries=RESULT_MAX_ENTRIES, show_spinner=False)
+def _translation(data_hash, _data):
+    from translator_utils import translate_resume_data
+    _count('translation', miss=1)
+    sources = {}
+    translated = translate_resume_data(_data, backend=translator_backend(), memory=translation_memory(), sources=sources)
+    return translated, sources
+
+
+def translate(data):
+    """
+    (English variant of `data`, its source hashes for sync_translation).
+    st.cache_data returns a fresh copy on every hit, so the caller may edit the result.
+    """
+    _count('translation', call=1)
+    return _translation(content_hash(data), data)
+
+
+def clear():
+    """Drops cached results (not the process-wide resources) and the counters."""
+    _resume_keywords.clear()
+    _match_score.clear()
+    _rank_job_descriptions.clear()
+    _translation.clear()
+    render_cache.cache.clear()
+    reset_stats()
+
+
+def render_debug_panel(title="🔧 Cache"):
+    """Sidebar expander with per-cache hit rates."""
+    with st.expander(title, expanded=False):
+        rows = [
+            {
+                'cache': name,
+                'calls': values['calls'],
+                'hits': values['hits'],
+                'hit rate': f"{values['hit_rate'] * 100:.0f}%"
+            }
+            for name, values in stats().items()
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+        else:
+            st.caption("—")
+
+        render_stats = render_cache.cache.stats()
+        st.caption(
+            f"Render cache: {render_stats['entries']} files, "
+            f"{render_stats['bytes'] / 1024:.0f} KB / {render_stats['max_bytes'] / 1024 / 1024:.0f} MB, "
+            f"{render_stats['hits']} hits, {render_stats['misses']} misses"
+        )
+        # Only report the memory once a step opened it, the panel must not load it at startup
+        if 'translation_memory' in _created:
+            memory_stats = translation_memory().stats()
+            st.caption(
+                f"Translation memory: {memory_stats['entries']} segments, "
+                f"hit rate {memory_stats['hit_rate'] * 100:.0f}%"
+            )
+
+        if st.button("Clear caches", key="cache_debug_clear"):
+            clear()
+            st.rerun()
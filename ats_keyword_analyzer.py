@@ -3,9 +3,12 @@ ATS Keyword Density Analyzer
 Analyzes CV content for keyword frequency and suggests improvements
 """
 
-import re
 from collections import Counter
 
+import tokenizer
+from keyword_automaton import KeywordAutomaton
+from resume_document import compile_resume
+
 # Data Analyst/Data Scientist için kritik ATS keyword'leri
 CRITICAL_KEYWORDS = {
     'Technical Skills': [
@@ -32,43 +35,42 @@ CRITICAL_KEYWORDS = {
     ]
 }
 
+# Profile fields scanned for keywords, in order
+PROFILE_TEXT_FIELDS = (
+    ('personal', ('summary',)),
+    ('experience', ('title', 'description')),
+    ('education', ('degree',)),
+    ('skills', ('category', 'items')),
+)
+
+_automaton = None
+# {keyword: normalized form}, folded once together with the automaton
+_normalized = None
+
+# The keywords are English terms, text and keywords are folded with English casing rules
+KEYWORD_LANGUAGE = 'en'
+
+def normalize_keyword(keyword):
+    return tokenizer.normalize(keyword, KEYWORD_LANGUAGE)
+
+def get_keyword_automaton():
+    """Automaton over every CRITICAL_KEYWORDS entry (tokenized like the text), built on first use"""
+    global _automaton, _normalized
+    if _automaton is None:
+        _normalized = {
+            keyword: normalize_keyword(keyword) for keywords in CRITICAL_KEYWORDS.values() for keyword in keywords
+        }
+        _automaton = KeywordAutomaton(_normalized.values())
+    return _automaton
+
 def extract_text_from_profile(profile):
-    """Extract all text content from user profile"""
-    text_parts = []
-
-    # Personal summary
-    if 'personal' in profile and 'summary' in profile['personal']:
-        text_parts.append(profile['personal']['summary'])
-
-    # Experience descriptions
-    if 'experience' in profile:
-        for exp in profile['experience']:
-            if 'title' in exp:
-                text_parts.append(exp['title'])
-            if 'description' in exp:
-                text_parts.append(exp['description'])
-
-    # Education
-    if 'education' in profile:
-        for edu in profile['education']:
-            if 'degree' in edu:
-                text_parts.append(edu['degree'])
-
-    # Skills
-    if 'skills' in profile:
-        for category, items in profile['skills'].items():
-            text_parts.append(category)
-            text_parts.append(items)
-
-    return ' '.join(text_parts)
+    """Extract all text content from user profile (raw dict or ResumeDocument)"""
+    return compile_resume(profile).text(PROFILE_TEXT_FIELDS)
 
 def analyze_keywords(profile):
     """Analyze keyword density in CV"""
     text = extract_text_from_profile(profile)
 
-    # Clean and normalize text
-    text = text.lower()
-
     results = {
         'found_keywords': {},
         'missing_keywords': {},
@@ -77,6 +79,13 @@ def analyze_keywords(profile):
         'unique_keywords': 0
     }
 
+    # Clean and normalize text: the shared tokenizer keeps CI/CD, A/B, C++ intact
+    text = tokenizer.normalize(text, KEYWORD_LANGUAGE)
+
+    # Count every keyword in a single pass over the text
+    counts = get_keyword_automaton().count(text)
+    normalized = _normalized
+
     # Analyze each category
     for category, keywords in CRITICAL_KEYWORDS.items():
         results['found_keywords'][category] = []
@@ -84,8 +93,7 @@ def analyze_keywords(profile):
 
         for keyword in keywords:
             # Case-insensitive search
-            keyword_lower = keyword.lower()
-            count = len(re.findall(r'\b' + re.escape(keyword_lower) + r'\b', text))
+            count = counts.get(normalized[keyword], 0)
 
             if count > 0:
                 results['found_keywords'][category].append({
@@ -171,7 +179,8 @@ def generate_report(profile):
     return "\n".join(report)
 
 if __name__ == "__main__":
-    from user_data import user_profile
+    from profile_store import load_profile
+    user_profile = load_profile()
     report = generate_report(user_profile)
     print(report)
 
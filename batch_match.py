@@ -0,0 +1,243 @@
+"""
+Ranks every job description in the local JD corpus (jd_index) against one resume.
+
+Each JD is represented by its JobMatcher top terms (per-language stop words, skill phrases
+and repeated n-grams) with their BM25 weights, the terms calculate_match_score(...,
+index=) scores. They are computed once per JD and language and kept beside the index
+segments (a "rows-<language>" sidecar, see inverted_index.py), so a new posting only
+costs its own row. The rows form a sparse term-document matrix held both as CSR (JD ->
+terms) and per-term columns (term -> JDs). Scoring a resume is one sparse
+matrix-vector product over the columns of the resume's terms, so it costs the number of
+matrix entries the resume touches, not the JD text.
+
+A row keeps the weights of the corpus it was computed in. The matrix only preselects;
+the JDs shown are rescored against the current corpus, exactly as a single match.
+
+Usage:
+    python -m batch_match                               # user_data.json vs every indexed JD
+    python -m batch_match --jds postings/ --top 50      # index new postings first
+    python -m batch_match --profile cv_yedek.json --language en
+"""
+import argparse
+import heapq
+import json
+import sys
+import threading
+import time
+from array import array
+
+from matcher_utils import JobMatcher
+
+DEFAULT_TOP = 20
+# JDs rescored per JD shown, so rows weighted in a smaller corpus cannot crowd out better ones
+RESCORE_FACTOR = 2
+
+
+def _segment_rows(index, segment, language):
+    """[[term, weight], ...] per document of a segment, from its sidecar or computed and stored."""
+    name = f"rows-{language}"
+    rows = index.read_sidecar(segment, name)
+    if rows is None:
+        rows = [None] * segment.n_docs
+        for doc_id, text in index.iter_payloads([segment]):
+            matcher = JobMatcher(text, language)
+            weights = matcher.weights(index)
+            rows[doc_id - segment.doc_base] = [[term, weights[term]] for term in matcher.top_terms(index)]
+        try:
+            index.write_sidecar(segment, name, rows)
+        except OSError:
+            pass  # A read-only index still works, its rows are computed again next time
+    return rows
+
+
+class TermDocMatrix:
+    """Weighted JobMatcher top terms of every JD of an index generation, as CSR rows and per-term columns."""
+
+    def __init__(self, index, language='tr', base=None):
+        with index.reading() as segments:
+            self._build(index, language, base, segments)
+
+    def _build(self, index, language, base, segments):
+        self.index = index
+        self.language = language
+        self.generation = index.generation
+        self.deleted = index.deleted
+        self.segment_paths = [segment.path for segment in segments]
+
+        # Segments are immutable: an earlier matrix whose segments are still in place is
+        # extended by the rows of the new segments only (a merge renumbers doc ids, then
+        # every row is read again from the merged sidecar)
+        if base is not None and base.index is index and self.segment_paths[:len(base.segment_paths)] == base.segment_paths:
+            self.terms = list(base.terms)
+            self.vocabulary = dict(base.vocabulary)
+            self.row_ptr = base.row_ptr[:]
+            self.col_idx = base.col_idx[:]
+            self.values = base.values[:]
+            self.norms = base.norms[:]
+            # Columns are copied only when a new row touches them
+            self.columns = dict(base.columns)
+            new_segments = segments[len(base.segment_paths):]
+        else:
+            self.terms = []
+            self.vocabulary = {}
+            self.row_ptr = array('L', [0])
+            self.col_idx = array('L')
+            self.values = array('d')
+            self.norms = array('d')
+            self.columns = {}
+            new_segments = segments
+
+        copied = set()
+        for segment in new_segments:
+            for i, row in enumerate(_segment_rows(index, segment, language)):
+                doc_id = segment.doc_base + i
+                norm = 0.0
+                for term, weight in row or ():
+                    column = self.vocabulary.get(term)
+                    if column is None:
+                        column = self.vocabulary[term] = len(self.terms)
+                        self.terms.append(term)
+                        self.columns[term] = (array('L'), array('d'))
+                        copied.add(term)
+                    elif term not in copied:
+                        doc_ids, weights = self.columns[term]
+                        self.columns[term] = (doc_ids[:], weights[:])
+                        copied.add(term)
+                    self.col_idx.append(column)
+                    self.values.append(weight)
+                    doc_ids, weights = self.columns[term]
+                    doc_ids.append(doc_id)
+                    weights.append(weight)
+                    norm += weight
+                self.row_ptr.append(len(self.col_idx))
+                self.norms.append(norm)
+
+    @property
+    def shape(self):
+        return len(self.norms), len(self.terms)
+
+    @property
+    def nnz(self):
+        return len(self.values)
+
+    def score(self, resume_keywords):
+        """Preselection score (0-100) of every JD: weight of its terms found in the resume / its total weight."""
+        totals = array('d', [0.0]) * len(self.norms)
+        columns = self.columns
+        for term in resume_keywords:
+            column = columns.get(term)
+            if column is None:
+                continue
+            for doc_id, weight in zip(*column):
+                totals[doc_id] += weight
+        return array('d', (
+            total * 100 / norm if norm else 0.0 for total, norm in zip(totals, self.norms)
+        ))
+
+    def terms_of(self, doc_id):
+        """The terms of one JD's row, highest weight first."""
+        start, end = self.row_ptr[doc_id], self.row_ptr[doc_id + 1]
+        return [self.terms[column] for column in self.col_idx[start:end]]
+
+    def rank(self, resume_keywords, top=DEFAULT_TOP):
+        """
+        Rows of the `top` best matching JDs: doc_id, title, source, score, matched, missing.
+        Score and lists are calculate_match_score(..., index=)'s for the JD.
+        """
+        with self.index.reading():
+            return self._rank(resume_keywords, top)
+
+    def _rank(self, resume_keywords, top):
+        scores = self.score(resume_keywords)
+        deleted = self.deleted
+        candidates = (doc_id for doc_id in range(len(scores)) if doc_id not in deleted and self.norms[doc_id])
+        preselected = heapq.nlargest(top * RESCORE_FACTOR, candidates, key=scores.__getitem__)
+        rows = []
+        for doc_id in preselected:
+            # As calculate_match_score does, with the current corpus weights
+            matcher = JobMatcher(self.index.payload(doc_id), self.language)
+            found = {term for term in matcher.top_terms(self.index) if term in resume_keywords}
+            score, matched, missing = matcher.score(found, self.index) if matcher.terms else (0, [], [])
+            meta = self.index.doc(doc_id)
+            rows.append({
+                'doc_id': doc_id,
+                'title': meta.get('title', ''),
+                'source': meta.get('source', ''),
+                'score': score,
+                'matched': matched,
+                'missing': missing
+            })
+        rows.sort(key=lambda row: -row['score'])
+        return rows[:top]
+
+
+_matrices = {}  # (index path, language) -> matrix of the latest generation seen
+_matrix_lock = threading.Lock()
+
+
+def get_matrix(index, language='tr'):
+    """Matrix of the index's current generation; after a change only the new JDs' rows are added."""
+    key = (index.path, language)
+    with _matrix_lock:
+        matrix = _matrices.get(key)
+        if matrix is None or matrix.index is not index or matrix.generation != index.generation:
+            matrix = _matrices[key] = TermDocMatrix(index, language, base=matrix)
+        return matrix
+
+
+def rank_job_descriptions(resume_keywords, index, top=DEFAULT_TOP, language='tr'):
+    """Best matching JDs of the corpus for a resume_terms() set, scored as calculate_match_score(..., index=)."""
+    return get_matrix(index, language).rank(resume_keywords, top)
+
+
+def main(argv=None):
+    import jd_index
+    from batch_render import select_language
+    from matcher_utils import get_resume_text, resume_terms
+    from profile_store import load_profile
+
+    parser = argparse.ArgumentParser(description="Rank the local JD corpus against a resume.")
+    parser.add_argument('--profile', default=None, help="Profile JSON (default: the app's saved profile)")
+    parser.add_argument('--jds', default=None, help="Index the JDs in this .txt/.jsonl file or directory first")
+    parser.add_argument('--index', default=None, help="Index directory (default: $ATS_JD_INDEX)")
+    parser.add_argument('--language', default='tr', choices=['tr', 'en'])
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    args = parser.parse_args(argv)
+
+    index = jd_index.open_index(args.index)
+    if args.jds:
+        added = jd_index.add_corpus(index, args.jds, args.language)
+        print(f"Indexed {added} new job descriptions")
+    if not index.n_docs:
+        print("The JD corpus is empty; add postings with --jds or python -m jd_index add")
+        return 1
+
+    if args.profile:
+        with open(args.profile, encoding='utf-8') as f:
+            profile = json.load(f)
+    else:
+        profile = load_profile()
+    data = select_language(profile, args.language)
+    if data is None:
+        print(f"No '{args.language}' profile data in {args.profile or 'the saved profile'}")
+        return 1
+    keywords = resume_terms(get_resume_text(data), args.language)
+
+    t0 = time.perf_counter()
+    matrix = get_matrix(index, args.language)
+    built = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rows = matrix.rank(keywords, args.top)
+    ranked = time.perf_counter() - t0
+
+    for position, row in enumerate(rows, 1):
+        print(f"{position:>3}. %{row['score']:<3} {row['title']}  ({row['source']})")
+        print(f"       matched: {', '.join(row['matched']) or '-'}")
+        print(f"       missing: {', '.join(row['missing']) or '-'}")
+    print(f"{matrix.shape[0]} JDs x {matrix.shape[1]} terms ({matrix.nnz} entries), "
+          f"matrix built in {built * 1000:.0f} ms, scored in {ranked * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
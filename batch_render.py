@@ -0,0 +1,229 @@
+"""
+Batch rendering of many profiles × templates × languages on a process pool.
+
+Usage:
+    python -m batch_render profiles/ --out renders/
+    python -m batch_render cohort.jsonl --out renders/ --templates Klasik,Modern --languages tr,en --formats pdf,docx
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+TEMPLATES = ["Klasik", "Modern", "Akademik"]
+LANGUAGES = ["tr", "en"]
+FORMATS = ["pdf", "docx"]
+
+_UNSAFE_NAME = re.compile(r'[^\w.\-]+')
+
+
+def iter_profiles(path):
+    """
+    Yields (profile_id, profile) from a directory of .json files or a .jsonl file.
+    Profiles are read one at a time so large cohorts never sit in memory at once.
+    A .jsonl row without an "id" is identified as "<file name>:<line>", so rows of
+    different files never share an id.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.json'):
+                with open(os.path.join(path, name), encoding='utf-8') as f:
+                    yield os.path.splitext(name)[0], json.load(f)
+    else:
+        name = os.path.basename(path)
+        with open(path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                profile = json.loads(line)
+                profile_id = profile.pop('id', None) if isinstance(profile, dict) else None
+                yield (f"{name}:{line_no}" if profile_id is None else str(profile_id)), profile
+
+
+def select_language(profile, language):
+    """
+    Accepts both the multi-language store ({'tr': ..., 'en': ...}) and a single-language backup.
+    Returns None when there is no profile in `language` (a store without that variant is not
+    rendered from another language's data), so callers skip it instead of mixing languages.
+    """
+    if not isinstance(profile, dict):
+        return None
+    if 'personal' not in profile:
+        profile = profile.get(language)
+    if not isinstance(profile, dict) or 'personal' not in profile:
+        return None
+    return profile
+
+
+def safe_name(profile_id):
+    """
+    profile_id reduced to a file name component (no path separators, no leading dots).
+    An id that had to be changed gets a short hash of the original, so two ids never
+    reduce to the same name.
+    """
+    profile_id = str(profile_id)
+    name = _UNSAFE_NAME.sub('_', profile_id).lstrip('.')
+    if name == profile_id:
+        return name
+    digest = hashlib.sha1(profile_id.encode('utf-8')).hexdigest()[:8]
+    return f"{name or 'profile'}-{digest}"
+
+
+def _init_worker():
+    # Parse fonts once per worker process, every later render attaches them from memory
+    from cv_generator import get_generator
+    get_generator(TEMPLATES[0])
+
+
+def render_profile(profile_id, profile, templates, languages, formats, out_dir):
+    """
+    Renders every requested combination for one profile and writes the files.
+    Returns a list of (artifact_name, seconds, error_or_None); seconds is None for a
+    language the profile has no data in, which is skipped.
+    """
+    from cv_generator import get_generator
+
+    results = []
+    file_id = safe_name(profile_id)
+    for language in languages:
+        data = select_language(profile, language)
+        if data is None:
+            results.append((f"{file_id}_{language}", None, f"No '{language}' profile data"))
+            continue
+
+        jobs = []
+        if 'pdf' in formats:
+            for template in templates:
+                jobs.append((f"{file_id}_{template}_{language}.pdf", 'pdf', template))
+        if 'docx' in formats:
+            jobs.append((f"{file_id}_{language}.docx", 'docx', None))
+
+        for name, fmt, template in jobs:
+            t0 = time.perf_counter()
+            try:
+                if fmt == 'pdf':
+                    content = get_generator(template, language=language).generate(data).view
+                else:
+                    from cv_generator_docx import ATSResumeDocx
+                    docx = ATSResumeDocx(language=language)
+                    docx.generate(data)
+                    content = docx.get_bytes()
+
+                with open(os.path.join(out_dir, name), 'wb') as f:
+                    f.write(content)
+                results.append((name, time.perf_counter() - t0, None))
+            except Exception as e:
+                results.append((name, time.perf_counter() - t0, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def run_batch(input_path, out_dir, templates=TEMPLATES, languages=LANGUAGES, formats=FORMATS, workers=None):
+    """
+    Renders all profiles in `input_path` and returns a summary dict.
+    Only a bounded number of profiles is in flight at a time.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+
+    latencies = []
+    failures = []
+    skipped = []
+    file_ids = set()
+    pending = {}  # future -> profile_id
+    started = time.perf_counter()
+
+    def collect(done):
+        for future in done:
+            profile_id = pending.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                failures.append((profile_id, f"{type(e).__name__}: {e}"))
+                continue
+            for name, seconds, error in results:
+                if seconds is None:
+                    skipped.append((name, error))
+                    continue
+                latencies.append(seconds)
+                if error:
+                    failures.append((name, error))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for profile_id, profile in iter_profiles(input_path):
+            # Names are compared case-insensitively, as on macOS and Windows file systems
+            file_id = safe_name(profile_id).lower()
+            if file_id in file_ids:
+                failures.append((profile_id, "Duplicate profile id, its files would overwrite another profile's"))
+                continue
+            file_ids.add(file_id)
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            future = executor.submit(render_profile, profile_id, profile, templates, languages, formats, out_dir)
+            pending[future] = profile_id
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'renders': len(latencies),
+        'failures': failures,
+        'skipped': skipped,
+        'seconds': elapsed,
+        'renders_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': _percentile(latencies, 0.50),
+        'p95': _percentile(latencies, 0.95),
+        'workers': workers
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render resumes for many profiles in parallel.")
+    parser.add_argument('input', help="Directory of profile .json files or a .jsonl file")
+    parser.add_argument('--out', default='renders', help="Output directory")
+    parser.add_argument('--templates', default=",".join(TEMPLATES))
+    parser.add_argument('--languages', default=",".join(LANGUAGES))
+    parser.add_argument('--formats', default=",".join(FORMATS))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(
+        args.input,
+        args.out,
+        templates=[t for t in args.templates.split(',') if t],
+        languages=[l for l in args.languages.split(',') if l],
+        formats=[f for f in args.formats.split(',') if f],
+        workers=args.workers
+    )
+
+    print(f"Renders: {summary['renders']} in {summary['seconds']:.2f}s on {summary['workers']} workers")
+    print(f"Throughput: {summary['renders_per_sec']:.1f} renders/sec")
+    print(f"Latency: p50 {summary['p50'] * 1000:.1f} ms, p95 {summary['p95'] * 1000:.1f} ms")
+    print(f"Skipped: {len(summary['skipped'])}")
+    for name, reason in summary['skipped'][:20]:
+        print(f"  SKIPPED: {name} - {reason}")
+    print(f"Failures: {len(summary['failures'])}")
+    for name, error in summary['failures'][:20]:
+        print(f"  FAILED: {name} - {error}")
+
+    return 1 if summary['failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,73 +1,58 @@
+from contextlib import contextmanager
+import time
+
 from fpdf import FPDF
-import os
+import font_registry
+from resume_document import LABELS, compile_resume
+
+# Bump in every change to template layout or rendered content, so cached renders are invalidated
+GENERATOR_VERSION = "2.2.0"
+
+class RenderResult:
+    """
+    PDF buffer from a single output() call, plus render metadata. The buffer is not copied:
+    write `view` to a file, bytes(result) makes the one copy where a bytes object is needed
+    (st.download_button, the render cache, pickling to another process).
+    """
+    def __init__(self, buffer, pages=0, section_times=None, scale=1.0):
+        self.buffer = buffer
+        self.pages = pages
+        self.section_times = section_times or {}
+        self.scale = scale
+
+    def __bytes__(self):
+        return bytes(self.buffer)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    @property
+    def size(self):
+        return len(self.buffer)
+
+    @property
+    def view(self):
+        """Zero-copy view of the PDF bytes."""
+        return memoryview(self.buffer)
 
 class BaseResumePDF(FPDF):
     def __init__(self, language='tr'):
         super().__init__()
         self.language = language
+        self._measuring = False
+        # Layout scale for font sizes, line heights and ln() gaps (see fit_pages)
+        self.scale = 1.0
+        self.fit_passes = 0
+        self._primitive_depth = 0
         # For English, use tighter layout to prevent text overflow
         margin = 12 if language == 'en' else 15
         self.set_auto_page_break(auto=True, margin=margin)
         
         # Localized Headers
-        self.labels = {
-            'tr': {
-                'SUMMARY': "ÖZET",
-                'EXPERIENCE': "İŞ DENEYİMİ",
-                'EDUCATION': "EĞİTİM",
-                'SKILLS': "TEKNİK BECERİLER",
-                'EXPERIENCE_ACADEMIC': "PROFESYONEL DENEYİM",
-                'EDUCATION_ACADEMIC': "EĞİTİM GEÇMİŞİ",
-                'SKILLS_ACADEMIC': "YETKİNLİKLER",
-                'EXPERIENCE_MODERN': "DENEYİM",
-                'EDUCATION_MODERN': "EĞİTİM",
-                'SKILLS_MODERN': "YETENEKLER",
-                'PROJECTS': "PROJELER",
-                'CERTIFICATES': "SERTİFİKALAR ve EĞİTİMLER"
-            },
-            'en': {
-                'SUMMARY': "SUMMARY",
-                'EXPERIENCE': "EXPERIENCE",
-                'EDUCATION': "EDUCATION",
-                'SKILLS': "TECHNICAL SKILLS",
-                'EXPERIENCE_ACADEMIC': "PROFESSIONAL EXPERIENCE",
-                'EDUCATION_ACADEMIC': "EDUCATION HISTORY",
-                'SKILLS_ACADEMIC': "COMPETENCIES",
-                'EXPERIENCE_MODERN': "EXPERIENCE",
-                'EDUCATION_MODERN': "EDUCATION",
-                'SKILLS_MODERN': "SKILLS",
-                'PROJECTS': "PROJECTS",
-                'CERTIFICATES': "CERTIFICATIONS & TRAINING"
-            }
-        }
-        
-        # Font setup
-        font_dir = os.path.join(os.path.dirname(__file__), 'fonts')
+        self.labels = LABELS
         
-        # Prefer Roboto if available (better for TR)
-        regular_font = os.path.join(font_dir, 'Roboto-Regular.ttf')
-        bold_font = os.path.join(font_dir, 'Roboto-Bold.ttf')
-        italic_font = os.path.join(font_dir, 'Roboto-Italic.ttf')
-        
-        # Fallback to DejaVu if Roboto missing
-        if not os.path.exists(regular_font):
-             regular_font = os.path.join(font_dir, 'DejaVuSans.ttf')
-             bold_font = os.path.join(font_dir, 'DejaVuSans-Bold.ttf')
-             italic_font = os.path.join(font_dir, 'DejaVuSans-Oblique.ttf')
-
-        if os.path.exists(regular_font):
-            self.add_font('DejaVu', '', regular_font, uni=True)
-            
-            # Bold Logic
-            if os.path.exists(bold_font):
-                self.add_font('DejaVu', 'B', bold_font, uni=True)
-            else:
-                self.add_font('DejaVu', 'B', regular_font, uni=True)
-            
-            # Italic Logic
-            if os.path.exists(italic_font):
-                self.add_font('DejaVu', 'I', italic_font, uni=True)
-
+        # Font setup (parsed once per process, shared across instances)
+        if font_registry.registry.attach_main_fonts(self, 'DejaVu'):
             self.main_font = 'DejaVu'
             self.set_font(self.main_font, '', 11)
         else:
@@ -106,12 +91,95 @@ class BaseResumePDF(FPDF):
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-    def generate(self, data, theme_color="#19375f"):
+    # --- Layout scaling ---
+    # Templates call these with their nominal sizes; the scale is applied once here.
+    # fpdf calls them internally too (page breaks, line wrapping) with values that
+    # are already scaled, so only the outermost call is scaled.
+
+    @contextmanager
+    def _primitive(self):
+        self._primitive_depth += 1
+        try:
+            yield
+        finally:
+            self._primitive_depth -= 1
+
+    def _scaled(self, value):
+        if value and self.scale != 1.0 and self._primitive_depth == 0:
+            return value * self.scale
+        return value
+
+    def set_font(self, family=None, style='', size=0):
+        size = self._scaled(size)
+        with self._primitive():
+            super().set_font(family, style, size)
+
+    def ln(self, h=None):
+        h = self._scaled(h)
+        with self._primitive():
+            super().ln(h)
+
+    def cell(self, w=None, h=None, *args, **kwargs):
+        h = self._scaled(h)
+        with self._primitive():
+            return super().cell(w, h, *args, **kwargs)
+
+    def multi_cell(self, w, h=None, *args, **kwargs):
+        h = self._scaled(h)
+        with self._primitive():
+            return super().multi_cell(w, h, *args, **kwargs)
+
+    def write(self, h=None, *args, **kwargs):
+        h = self._scaled(h)
+        with self._primitive():
+            return super().write(h, *args, **kwargs)
+
+    def add_page(self, *args, **kwargs):
+        with self._primitive():
+            super().add_page(*args, **kwargs)
+
+    def _fit_scale(self, data, theme_color, fit_pages, min_scale=0.7, max_passes=8):
+        """
+        Largest scale in [min_scale, 1.0] at which `data` fits in `fit_pages` pages.
+        Uses measurement passes only (bisection), at most `max_passes` of them.
+        Returns (scale, passes). If nothing fits, returns min_scale.
+        """
+        def pages_at(scale):
+            probe = type(self)(self.language)
+            probe.scale = scale
+            return probe.measure(data, theme_color)['pages']
+
+        passes = 1
+        if pages_at(1.0) <= fit_pages:
+            return 1.0, passes
+
+        lo, hi = min_scale, 1.0
+        while passes < max_passes:
+            mid = (lo + hi) / 2
+            passes += 1
+            if pages_at(mid) <= fit_pages:
+                lo = mid
+            else:
+                hi = mid
+        return round(lo, 3), passes
+
+    def generate(self, data, theme_color="#19375f", fit_pages=None):
+        """
+        Renders `data` and returns a RenderResult (the PDF bytes plus page count,
+        per-section timings and the layout scale).
+        With fit_pages=N, font sizes, line heights and spacing are shrunk by a single
+        scale factor until the resume fits in N pages. The chosen scale is kept in
+        self.scale and the number of measurement passes in self.fit_passes.
+        """
+        if fit_pages:
+            self.scale, self.fit_passes = self._fit_scale(data, theme_color, fit_pages)
+
         # Set Theme Color
         self.primary_color = self._hex_to_rgb(theme_color)
+        doc = compile_resume(data, self.language)
         
         # Set Metadata for ATS
-        p = data.get('personal', {})
+        p = doc.personal
         full_name = p.get('fullName', 'Resume')
         self.set_title(f"{full_name} - CV")
         self.set_author(full_name)
@@ -120,36 +188,90 @@ class BaseResumePDF(FPDF):
         
         # Inject Keywords for ATS
         keywords = []
-        if data.get('skills'):
-            for cat, items in data['skills'].items():
-                if items:
-                    keywords.append(f"{cat}: {items}")
+        for cat, items in doc.raw_skills.items():
+            if items:
+                keywords.append(f"{cat}: {items}")
         
         if keywords:
             self.set_keywords(", ".join(keywords))
         
-        self.add_page()
-        self.add_personal_info(p)
-        
-        if data.get('experience'):
-            self.add_experience(data['experience'])
-            
-        if data.get('education'):
-            self.add_education(data['education'])
+        self._layout(doc)
 
-        if data.get('projects'):
-            self.add_projects(data['projects'])
-            
-        if data.get('certificates'):
-            self.add_certificates(data['certificates'])
-            
-        if data.get('skills'):
-            self.add_skills(data['skills'])
+        # Serialize exactly once; RenderResult keeps the buffer without copying it
+        t0 = time.perf_counter()
+        buffer = self.output()
+        self.section_times['output'] = time.perf_counter() - t0
 
-        return self.output(dest='S')
+        return RenderResult(buffer, pages=self.page, section_times=self.section_times, scale=self.scale)
+
+    def _layout(self, doc):
+        """Runs the add_* layout logic on a ResumeDocument, recording where each section starts and ends."""
+        self.section_marks = []
+        self.section_times = {}
+        self.add_page()
+        self._layout_section('personal', self.add_personal_info, doc.personal)
+        
+        if doc.experience:
+            self._layout_section('experience', self.add_experience, doc.experience)
+            
+        if doc.education:
+            self._layout_section('education', self.add_education, doc.education)
+
+        if doc.projects:
+            self._layout_section('projects', self.add_projects, doc.projects)
+            
+        if doc.certificates:
+            self._layout_section('certificates', self.add_certificates, doc.certificates)
+            
+        if doc.skills:
+            self._layout_section('skills', self.add_skills, doc.skills)
+
+    def _layout_section(self, name, add_fn, section_data):
+        start = (self.page, self.get_y())
+        t0 = time.perf_counter()
+        add_fn(section_data)
+        self.section_times[name] = time.perf_counter() - t0
+        self.section_marks.append((name, start, (self.page, self.get_y())))
+
+    def _out(self, s):
+        # Measurement mode: layout runs normally but nothing is written to the content stream
+        if self._measuring:
+            return
+        super()._out(s)
+
+    def measure(self, data, theme_color="#19375f"):
+        """
+        Dry-run of generate(): same layout and multi_cell line breaking, but no
+        content stream, font embedding or compression. The instance is used up,
+        create a new generator for the real render.
+        Returns {'pages': int, 'sections': [{'name', 'page', 'y', 'height'}], 'end_y': float}
+        """
+        self.primary_color = self._hex_to_rgb(theme_color)
+        self._measuring = True
+        try:
+            self._layout(compile_resume(data, self.language))
+        finally:
+            self._measuring = False
+
+        page_height = self.page_break_trigger - self.t_margin
+        sections = []
+        for name, (start_page, start_y), (end_page, end_y) in self.section_marks:
+            if start_page == end_page:
+                height = end_y - start_y
+            else:
+                height = (self.page_break_trigger - start_y) + (end_y - self.t_margin)
+                height += (end_page - start_page - 1) * page_height
+            sections.append({'name': name, 'page': start_page, 'y': start_y, 'height': height})
+
+        return {
+            'pages': self.page,
+            'sections': sections,
+            'end_y': self.get_y()
+        }
 
     def get_pdf_bytes(self):
-        return self.output(dest='S')
+        # Returns the buffer already built by generate(), no second serialization
+        return self.output()
 
 class ClassicTemplate(BaseResumePDF):
     """
@@ -213,8 +335,6 @@ class ClassicTemplate(BaseResumePDF):
         if p.get('phone'): contact_parts.append(p.get('phone'))
         
         country = p.get('country', '')
-        if self.language == 'en': country = country.replace('Türkiye', 'Turkey')
-        
         if p.get('city') and country: contact_parts.append(f"{p.get('city')}, {country}")
 
         if contact_parts:
@@ -275,8 +395,6 @@ class ClassicTemplate(BaseResumePDF):
             if exp.get('company'): parts.append(exp.get('company'))
             
             loc = exp.get('location', '')
-            if self.language == 'en': loc = loc.replace('Türkiye', 'Turkey')
-            
             if loc: parts.append(loc)
             
             if parts:
@@ -466,17 +584,8 @@ class ClassicTemplate(BaseResumePDF):
             self.multi_cell(135, 6, exp.get('title', ''))
             y_end = self.get_y()
             
-            # Date (Right) aligned to top
-            start_d = exp.get('startDate', '')
-            end_d = exp.get('endDate', '')
-            
-            # Dynamic Translation for Date
-            if self.language == 'en':
-                if end_d == 'Devam Ediyor': end_d = 'Present'
-            else:
-                if end_d == 'Present': end_d = 'Devam Ediyor'
-                
-            date_str = f"{start_d} - {end_d}"
+            # Date (Right) aligned to top, 'Present' already localized
+            date_str = f"{exp.get('startDate', '')} - {exp.get('endDate', '')}"
             self.set_xy(145, y_start)
             self.set_font('DejaVu', '', 9)
             self.set_text_color(60, 60, 60)
@@ -495,8 +604,6 @@ class ClassicTemplate(BaseResumePDF):
             if exp.get('company'): parts.append(exp.get('company'))
             
             loc = exp.get('location', '')
-            if self.language == 'en': loc = loc.replace('Türkiye', 'Turkey')
-            
             if loc: parts.append(loc)
             
             if parts:
@@ -563,24 +670,10 @@ class ClassicTemplate(BaseResumePDF):
         self.add_section_title(self.labels[self.language]['SKILLS'])
         skill_size = 9 if self.language == 'en' else 10
         self.set_font('DejaVu', '', skill_size)
-        
-        # Translation Map
-        cat_map = {
-            'Programlama': 'Programming',
-            'Frameworks': 'Frameworks',
-            'Araçlar': 'Tools',
-            'Diller': 'Languages'
-        } if self.language == 'en' else {}
 
-        for cat, items in skills_dict.items():
+        # Category names are already localized by the ResumeDocument
+        for display_cat, items in skills_dict.items():
             if items:
-                display_cat = cat_map.get(cat, cat)
-                
-                # Auto-append Turkish if English resume and Languages category
-                if self.language == 'en' and display_cat == 'Languages':
-                    if 'Turkish' not in items and 'Türkçe' not in items:
-                         items += ", Turkish (Native)"
-                
                 # Category name in dark blue
                 self.set_font('DejaVu', 'B', skill_size)
                 self.set_text_color(25, 55, 95)
@@ -697,8 +790,6 @@ class ModernTemplate(BaseResumePDF):
         if p.get('phone'): info_lines.append(p.get('phone'))
         
         country = p.get('country', '')
-        if self.language == 'en': country = country.replace('Türkiye', 'Turkey')
-        
         if p.get('city') and country: info_lines.append(f"{p.get('city')}, {country}")
 
         if info_lines:
@@ -729,8 +820,6 @@ class ModernTemplate(BaseResumePDF):
             title_company = f"{exp.get('title', '')} - {exp.get('company', '')}"
             
             loc = exp.get('location', '')
-            if self.language == 'en': loc = loc.replace('Türkiye', 'Turkey')
-            
             if loc: title_company += f", {loc}"
             
             start_d = exp.get('startDate', '')
@@ -914,10 +1003,7 @@ class ModernTemplate(BaseResumePDF):
         if p.get('email'): info_lines.append(p.get('email'))
         if p.get('phone'): info_lines.append(p.get('phone'))
         
-        country = p.get('country', '')
-        if self.language == 'en': country = country.replace('Türkiye', 'Turkey')
-        
-        if p.get('city') and country: info_lines.append(f"{p.get('city')}, {country}")
+        if p.get('city') and p.get('country'): info_lines.append(f"{p.get('city')}, {p.get('country')}")
 
         if info_lines:
             self.cell(0, 5, "  •  ".join(info_lines), ln=True, align='L')
@@ -995,24 +1081,10 @@ class ModernTemplate(BaseResumePDF):
     def add_skills(self, skills_dict):
         self.add_section_title(self.labels[self.language]['SKILLS_MODERN'])
         self.set_font('DejaVu', '', 10)
-        
-        # Translation Map
-        cat_map = {
-            'Programlama': 'Programming',
-            'Frameworks': 'Frameworks',
-            'Araçlar': 'Tools',
-            'Diller': 'Languages'
-        } if self.language == 'en' else {}
 
-        for cat, items in skills_dict.items():
+        # Category names are already localized by the ResumeDocument
+        for display_cat, items in skills_dict.items():
             if items:
-                display_cat = cat_map.get(cat, cat)
-                
-                # Auto-append Turkish if English resume and Languages category
-                if self.language == 'en' and display_cat == 'Languages':
-                    if 'Turkish' not in items and 'Türkçe' not in items:
-                         items += ", Turkish (Native)"
-                
                 # Category in dark blue
                 self.set_font('DejaVu', 'B', 10)
                 self.set_text_color(25, 55, 95)
@@ -1150,8 +1222,6 @@ class AcademicTemplate(BaseResumePDF):
             title_company = f"{exp.get('title', '')} - {exp.get('company', '')}"
             
             loc = exp.get('location', '')
-            if self.language == 'en': loc = loc.replace('Türkiye', 'Turkey')
-            
             if loc: title_company += f", {loc}"
             date_str = f"{exp.get('startDate', '')} - {exp.get('endDate', '')}"
 
@@ -1296,6 +1366,10 @@ def get_generator(template_name, language='tr'):
     else:
         return ClassicTemplate(language)
 
+def measure_layout(template_name, data, language='tr', theme_color="#19375f"):
+    """Page count and section positions for `data` without rendering a PDF."""
+    return get_generator(template_name, language).measure(data, theme_color=theme_color)
+
 class CoverLetterPDF(BaseResumePDF):
     def generate_cover_letter_pdf(self, person_data, cover_body):
         self.add_page()
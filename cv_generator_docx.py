@@ -3,6 +3,8 @@ from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from io import BytesIO
 
+from resume_document import compile_resume
+
 
 class ATSResumeDocx:
     """
@@ -87,8 +89,6 @@ class ATSResumeDocx:
         if phone:
             contact_parts.append(phone)
         if city and country:
-            if self.language == 'en':
-                country = country.replace('Türkiye', 'Turkey')
             contact_parts.append(f"{city}, {country}")
 
         if contact_parts:
@@ -138,8 +138,8 @@ class ATSResumeDocx:
         p_format.space_after = Pt(8)
         p_format.space_before = Pt(0)
 
-    def add_experience_item(self, title, company, location, start_date, end_date, description):
-        """Add a job/experience entry with improved styling"""
+    def add_experience_item(self, title, company, location, start_date, end_date, bullets):
+        """Add a job/experience entry with improved styling (location and dates already localized)"""
         # Job title with optimized formatting
         p = self.doc.add_paragraph()
         run = p.add_run(title)
@@ -154,18 +154,12 @@ class ATSResumeDocx:
         # Company & Location
         comp_loc = company
         if location:
-            if self.language == 'en':
-                location = location.replace('Türkiye', 'Turkey')
             comp_loc += f", {location}"
             
         run = p.add_run(comp_loc)
         run.font.size = Pt(10)
         run.italic = True
         
-        # Translate Date
-        if self.language == 'en' and end_date == 'Devam Ediyor':
-            end_date = 'Present'
-            
         # Dates with subtle gray color
         date_str = f"  |  {start_date} - {end_date}"
         run2 = p.add_run(date_str)
@@ -173,17 +167,13 @@ class ATSResumeDocx:
         run2.font.color.rgb = RGBColor(100, 100, 100)  # Gray for dates
 
         # Description with semantic list bullets and improved spacing
-        if description:
-            lines = description.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line:
-                    try:
-                        p = self.doc.add_paragraph(line, style='List Bullet')
-                        p.paragraph_format.line_spacing = 1.15
-                    except KeyError:
-                        p = self.doc.add_paragraph(f"• {line}")
-                        p.paragraph_format.line_spacing = 1.15
+        for line in bullets:
+            try:
+                p = self.doc.add_paragraph(line, style='List Bullet')
+                p.paragraph_format.line_spacing = 1.15
+            except KeyError:
+                p = self.doc.add_paragraph(f"• {line}")
+                p.paragraph_format.line_spacing = 1.15
 
         self.doc.add_paragraph()  # Spacing after entry
 
@@ -209,19 +199,10 @@ class ATSResumeDocx:
         self.doc.add_paragraph()  # Spacing
 
     def add_skills(self, skills_dict):
-        """Add skills section with improved formatting"""
+        """Add skills section with improved formatting (category names already localized)"""
         self.add_section_title(self.labels[self.language]['SKILLS'])
 
-        # Translation Map
-        cat_map = {
-            'Programlama': 'Programming',
-            'Frameworks': 'Frameworks',
-            'Araçlar': 'Tools',
-            'Diller': 'Languages'
-        } if self.language == 'en' else {}
-
         for category, items in skills_dict.items():
-            category = cat_map.get(category, category)
             if items:
                 p = self.doc.add_paragraph()
                 # Category in dark blue
@@ -238,14 +219,16 @@ class ATSResumeDocx:
 
     def generate(self, data):
         """Generate complete resume from data dict"""
+        doc = compile_resume(data, self.language)
+
         # Personal info
-        p = data.get('personal', {})
+        p = doc.personal
         
         # Set Metadata first
         self.set_metadata(
             p.get('fullName', 'Resume'), 
             p.get('summary', ''), 
-            data.get('skills', {})
+            doc.raw_skills
         )
         
         self.add_personal_info(
@@ -260,22 +243,22 @@ class ATSResumeDocx:
         )
 
         # Experience
-        if data.get('experience'):
+        if doc.experience:
             self.add_section_title(self.labels[self.language]['EXPERIENCE'])
-            for exp in data['experience']:
+            for exp in doc.experience:
                 self.add_experience_item(
                     exp.get('title', ''),
                     exp.get('company', ''),
-                    exp.get('location', ''),
-                    exp.get('startDate', ''),
-                    exp.get('endDate', ''),
-                    exp.get('description', '')
+                    exp['location'],
+                    exp['startDate'],
+                    exp['endDate'],
+                    exp['bullets']
                 )
 
         # Education
-        if data.get('education'):
+        if doc.education:
             self.add_section_title(self.labels[self.language]['EDUCATION'])
-            for edu in data['education']:
+            for edu in doc.education:
                 self.add_education_item(
                     edu.get('degree', ''),
                     edu.get('school', ''),
@@ -283,8 +266,8 @@ class ATSResumeDocx:
                 )
 
         # Skills
-        if data.get('skills'):
-            self.add_skills(data['skills'])
+        if doc.skills:
+            self.add_skills(doc.skills)
 
     def save(self, filename):
         """Save document to file"""
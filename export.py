@@ -0,0 +1,176 @@
+"""
+Concurrent export of the final-step files (PDF, DOCX, English PDF).
+Every artifact is an independent job. Rendering is CPU-bound Python, so the jobs run
+on a bounded process pool (threads would take turns on the GIL), or on threads when
+there is a single CPU or ATS_EXPORT_WORKERS=0. A failing artifact does not hold back
+or break the others. Results go through the shared render cache,
+so anything already rendered or pre-rendered is returned at once.
+"""
+import copy
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import render_cache
+
+MAX_WORKERS = 3
+MAX_DISPATCHERS = 8
+
+
+def _init_worker():
+    # Parse fonts once per worker process, every later render attaches them from memory
+    import font_registry
+    font_registry.registry.preload()
+
+
+def _render(kind, data, template, language, theme_color, fit_pages):
+    """Renders one artifact. Runs in a worker process (or the dispatcher thread as a fallback)."""
+    if kind == 'docx':
+        from cv_generator_docx import ATSResumeDocx
+        docx = ATSResumeDocx(language=language)
+        docx.generate(data)
+        return docx.get_bytes()
+    from cv_generator import get_generator
+    return bytes(get_generator(template, language=language).generate(data, theme_color=theme_color, fit_pages=fit_pages))
+
+
+_pool = None
+_dispatcher = None
+_pool_lock = threading.Lock()
+
+
+def _worker_count():
+    configured = os.environ.get('ATS_EXPORT_WORKERS')
+    if configured is not None:
+        return max(int(configured), 0)
+    # On a single CPU worker processes add overhead without any parallelism
+    cpus = os.cpu_count() or 1
+    return min(MAX_WORKERS, cpus) if cpus > 1 else 0
+
+
+def _get_pool():
+    """Process-wide worker pool, None if disabled (ATS_EXPORT_WORKERS=0) or unavailable."""
+    global _pool
+    with _pool_lock:
+        if _pool is None and _worker_count():
+            try:
+                # spawn: forking a server with running threads is not safe
+                _pool = ProcessPoolExecutor(
+                    max_workers=_worker_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            except (OSError, NotImplementedError, ValueError):
+                return None
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_dispatcher():
+    global _dispatcher
+    with _pool_lock:
+        if _dispatcher is None:
+            _dispatcher = ThreadPoolExecutor(max_workers=MAX_DISPATCHERS, thread_name_prefix='export')
+        return _dispatcher
+
+
+def _run(job):
+    # Two attempts: another dispatcher may reset the pool between _get_pool() and submit()
+    for _ in range(2):
+        pool = _get_pool()
+        if pool is None:
+            break
+        try:
+            future = pool.submit(_render, *job)
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            break
+        except RuntimeError:
+            # Shut down by a concurrent _reset_pool(), try its replacement
+            continue
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # A worker died; replace the pool and render this one here
+            _reset_pool(pool)
+            break
+        except CancelledError:
+            # Cancelled by a concurrent _reset_pool(), render it here
+            break
+    return _render(*job)
+
+
+def render_pdf(data, template, language='tr', theme_color=render_cache.DEFAULT_THEME_COLOR, fit_pages=None):
+    """Like render_cache.render_pdf, but a cache miss renders on the worker pool. Blocks until done."""
+    key = render_cache.pdf_key(data, template, language, theme_color, fit_pages)
+    return render_cache.cache.get_or_render(key, lambda: _run(('pdf', data, template, language, theme_color, fit_pages)))
+
+
+def render_docx(data, language='tr'):
+    """Like render_cache.render_docx, but a cache miss renders on the worker pool. Blocks until done."""
+    key = render_cache.make_key(data, 'docx', language, kind='docx')
+    return render_cache.cache.get_or_render(key, lambda: _run(('docx', data, None, language, None, None)))
+
+
+def workers():
+    """Number of worker processes the renders go to, 0 when they run on the calling thread."""
+    return _worker_count() if _get_pool() is not None else 0
+
+
+def warm_up():
+    """Starts the worker processes (fonts parsed) before the final step needs them."""
+    pool = _get_pool()
+    if pool is not None:
+        for _ in range(_worker_count()):
+            pool.submit(os.getpid)
+
+
+class ExportCoordinator:
+    """
+    Export jobs of one final-step run, name -> future.
+    submit_*() returns immediately; as_completed() yields each artifact as soon as it is ready.
+    """
+
+    def __init__(self):
+        self.futures = OrderedDict()
+
+    def submit_pdf(self, name, data, template, language='tr', theme_color=render_cache.DEFAULT_THEME_COLOR, fit_pages=None):
+        # The caller keeps editing its data, the job renders a snapshot
+        data = copy.deepcopy(data)
+        return self._submit(name, render_pdf, data, template, language, theme_color, fit_pages)
+
+    def submit_docx(self, name, data, language='tr'):
+        data = copy.deepcopy(data)
+        return self._submit(name, render_docx, data, language)
+
+    def _submit(self, name, render, *args):
+        # One cache lookup per artifact: a hit returns without rendering
+        future = _get_dispatcher().submit(render, *args)
+        self.futures[name] = future
+        return future
+
+    def result(self, name, timeout=None):
+        """Bytes of one artifact; raises its render error."""
+        return self.futures[name].result(timeout=timeout)
+
+    def as_completed(self, timeout=None):
+        """Yields (name, bytes, error) in completion order; error is None on success."""
+        pending = {future: name for name, future in self.futures.items()}
+        while pending:
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"Export timed out waiting for {', '.join(pending.values())}")
+            for future in done:
+                name = pending.pop(future)
+                error = future.exception()
+                yield name, (future.result() if error is None else None), error
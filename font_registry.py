@@ -0,0 +1,126 @@
+"""
+Process-wide font registry for the PDF generators.
+Each TTF is parsed once; new FPDF documents get a cheap copy of the parsed metrics.
+"""
+import copy
+import os
+import threading
+from io import BytesIO
+
+from fontTools import ttLib
+from fpdf.enums import TextEmphasis
+from fpdf.fonts import SubsetMap, TTFFont
+
+FONT_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
+
+
+class FontRegistry:
+    """
+    Keeps parsed TTFFont objects (cmap, glyph widths, descriptor) in memory.
+
+    fpdf subsets a font's fontTools tables in place when the document is written,
+    so every attached copy gets its own lazily-loaded table set built from the
+    cached file bytes. The expensive metric tables are shared read-only.
+    """
+
+    def __init__(self, font_dir=FONT_DIR):
+        self.font_dir = font_dir
+        self._fonts = {}  # path -> (parsed TTFFont, raw file bytes)
+        self._main_fonts = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_main_fonts(self):
+        """
+        Returns {style: path} for the main font family, or {} if no TTF is available.
+        Prefers Roboto (better for TR), falls back to DejaVu. Resolved once per process.
+        """
+        if self._main_fonts is not None:
+            return self._main_fonts
+
+        regular_font = os.path.join(self.font_dir, 'Roboto-Regular.ttf')
+        bold_font = os.path.join(self.font_dir, 'Roboto-Bold.ttf')
+        italic_font = os.path.join(self.font_dir, 'Roboto-Italic.ttf')
+
+        if not os.path.exists(regular_font):
+            regular_font = os.path.join(self.font_dir, 'DejaVuSans.ttf')
+            bold_font = os.path.join(self.font_dir, 'DejaVuSans-Bold.ttf')
+            italic_font = os.path.join(self.font_dir, 'DejaVuSans-Oblique.ttf')
+
+        fonts = {}
+        if os.path.exists(regular_font):
+            fonts[''] = regular_font
+            # Bold falls back to regular, italic is optional
+            fonts['B'] = bold_font if os.path.exists(bold_font) else regular_font
+            if os.path.exists(italic_font):
+                fonts['I'] = italic_font
+
+        self._main_fonts = fonts
+        return fonts
+
+    def _load(self, pdf, path):
+        with self._lock:
+            entry = self._fonts.get(path)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            with open(path, 'rb') as f:
+                data = f.read()
+            parsed = TTFFont(pdf, BytesIO(data), os.path.basename(path), '')
+            parsed.ttffile = path
+            entry = (parsed, data)
+            self._fonts[path] = entry
+            return entry
+
+    def attach(self, pdf, family, style, path):
+        """Registers the font at `path` on `pdf`, same as pdf.add_font(family, style, path)."""
+        parsed, data = self._load(pdf, path)
+
+        style = "".join(sorted(style.upper()))
+        fontkey = f"{family.lower()}{style}"
+
+        font = copy.copy(parsed)
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.emphasis = TextEmphasis.coerce(style)
+        font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False, lazy=True)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font.subset = SubsetMap(font)
+        pdf.fonts[fontkey] = font
+
+    def preload(self):
+        """Parses the main font family now instead of on the first render."""
+        from fpdf import FPDF
+        pdf = FPDF()
+        for path in self.resolve_main_fonts().values():
+            self._load(pdf, path)
+        return self
+
+    def attach_main_fonts(self, pdf, family='DejaVu'):
+        """Attaches the main font family to `pdf`. Returns False if no TTF is available."""
+        fonts = self.resolve_main_fonts()
+        for style, path in fonts.items():
+            self.attach(pdf, family, style, path)
+        return bool(fonts)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached_fonts': len(self._fonts)
+        }
+
+    def clear(self):
+        with self._lock:
+            self._fonts.clear()
+            self._main_fonts = None
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every BaseResumePDF instance in the process
+registry = FontRegistry()
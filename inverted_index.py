@@ -0,0 +1,518 @@
+"""
+Segmented on-disk inverted index (term -> postings of (doc id, term frequency)).
+Used by the JD corpus index and the recruiter resume index.
+
+An index directory holds immutable binary segments and a manifest:
+
+    manifest.json          segment file names, document counts, deleted doc ids, generation
+    seg-000001.bin         vocabulary, postings and document lengths of one batch of documents
+    docs-000001.json       metadata of the same documents (key, title, source, ...)
+    side-NAME-000001.json  optional per-document values a caller keeps for the same documents
+                           (e.g. batch_match's weighted JD terms), carried over by merges
+    payloads.bin           stored document payloads (e.g. the JD text), append-only
+
+Adding documents writes a new segment and then swaps the manifest atomically, so the
+index is never rebuilt from scratch and readers never see a half-written batch. Replaced
+or removed documents are only marked deleted until the next merge. Small segments are
+merged once there are more than MAX_SEGMENTS. Segments are memory-mapped; only the
+vocabulary is parsed when a segment is opened.
+
+Segments are reference-counted. A refresh or merge retires the segments it replaces,
+and a retired segment is only closed once the last reader (see InvertedIndex.reading)
+has released it, so other sessions and threads can finish iterating its postings.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from profile_store import write_atomic
+
+MANIFEST = 'manifest.json'
+PAYLOADS = 'payloads.bin'
+FORMAT_VERSION = 1
+MAX_SEGMENTS = 8
+
+_MAGIC = b'IIX1'
+# magic, doc_base, n_docs, n_terms, n_postings, terms block size
+_HEADER = struct.Struct('<4sIIIII')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def _uint32(values=()):
+    result = array('I', values)
+    if result.itemsize != 4:
+        result = array('L', values)
+    return result
+
+
+class Segment:
+    """
+    One immutable, memory-mapped batch of documents with ids doc_base .. doc_base + n_docs - 1.
+    Starts with one reference (the index's); closed when the last reference is released.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._refs = 1
+        self._refs_lock = threading.Lock()
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.doc_base, self.n_docs, n_terms, n_postings, terms_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an index segment")
+
+        position = _HEADER.size
+        terms = self._mmap[position:position + terms_size].decode('utf-8')
+        self.terms = {term: i for i, term in enumerate(terms.split('\n'))} if n_terms else {}
+        position += terms_size
+        position += (-position) % 4
+
+        view = self._view = memoryview(self._mmap)
+        self.doc_lengths = view[position:position + 4 * self.n_docs].cast('I')
+        position += 4 * self.n_docs
+        self._offsets = view[position:position + 4 * (n_terms + 1)].cast('I')
+        position += 4 * (n_terms + 1)
+        self._doc_ids = view[position:position + 4 * n_postings].cast('I')
+        position += 4 * n_postings
+        self._tfs = view[position:position + 4 * n_postings].cast('I')
+        self._docs = None
+
+    def df(self, term):
+        i = self.terms.get(term)
+        return 0 if i is None else self._offsets[i + 1] - self._offsets[i]
+
+    def postings(self, term):
+        """(doc ids, term frequencies) as zero-copy uint32 views, doc ids ascending."""
+        i = self.terms.get(term)
+        if i is None:
+            return (), ()
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._doc_ids[start:end], self._tfs[start:end]
+
+    def docs(self):
+        if self._docs is None:
+            docs_path = self.path.replace('seg-', 'docs-').replace('.bin', '.json')
+            with open(docs_path, encoding='utf-8') as f:
+                self._docs = json.load(f)
+        return self._docs
+
+    def acquire(self):
+        with self._refs_lock:
+            if not self._refs:
+                raise ValueError(f"{self.path} is closed")
+            self._refs += 1
+
+    def release(self):
+        """Drops one reference; the last one closes the segment."""
+        with self._refs_lock:
+            self._refs -= 1
+            if self._refs:
+                return
+        self.close()
+
+    def close(self):
+        for view in (self.doc_lengths, self._offsets, self._doc_ids, self._tfs, self._view):
+            view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Only when a caller kept a postings view past its reading() block
+            pass
+        self._file.close()
+
+
+def _sidecar_path(segment_path, name):
+    directory, base = os.path.split(segment_path)
+    return os.path.join(directory, f"side-{name}-{base[len('seg-'):-len('.bin')]}.json")
+
+
+def _sidecars(segment_path):
+    """Names of the sidecars stored for a segment."""
+    directory, base = os.path.split(segment_path)
+    suffix = f"-{base[len('seg-'):-len('.bin')]}.json"
+    return [
+        name[len('side-'):-len(suffix)] for name in os.listdir(directory)
+        if name.startswith('side-') and name.endswith(suffix)
+    ]
+
+
+def write_segment(path, doc_base, doc_lengths, postings):
+    """postings: {term: [(doc id, tf), ...]} with doc ids ascending."""
+    terms = sorted(postings)
+    offsets = _uint32([0])
+    doc_ids = _uint32()
+    tfs = _uint32()
+    for term in terms:
+        for doc_id, tf in postings[term]:
+            doc_ids.append(doc_id)
+            tfs.append(tf)
+        offsets.append(len(doc_ids))
+    write_segment_arrays(path, doc_base, doc_lengths, terms, offsets, doc_ids, tfs)
+
+
+def write_segment_arrays(path, doc_base, doc_lengths, terms, offsets, doc_ids, tfs):
+    """Writes a segment from its arrays: sorted terms, offsets (len(terms) + 1) into doc_ids/tfs."""
+    terms_block = '\n'.join(terms).encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, doc_base, len(doc_lengths), len(terms), len(doc_ids), len(terms_block)))
+        f.write(terms_block)
+        f.write(b'\0' * ((-(_HEADER.size + len(terms_block))) % 4))
+        for values in (_uint32(doc_lengths), offsets, doc_ids, tfs):
+            values.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class InvertedIndex:
+    """
+    Documents are added as (key, term counts, length, metadata, payload). Keys already
+    in the index are skipped (or replaced), so re-adding a corpus only indexes the new documents.
+
+    Doc ids run from 0 to next_doc_id - 1; n_docs counts the ones not deleted.
+    Postings may still list deleted docs until the next merge, readers skip `deleted`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.segments = []
+        self.n_docs = 0
+        self.next_doc_id = 0
+        self.deleted = frozenset()
+        self.total_length = 0
+        self.generation = 0
+        self._manifest_mtime = None
+        self._keys = None
+        os.makedirs(path, exist_ok=True)
+        self.refresh()
+
+    # --- Reading ---
+
+    def refresh(self, force=False):
+        """Reopens the segments if another process changed the index. Returns True if it did."""
+        manifest_path = os.path.join(self.path, MANIFEST)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            if mtime == self._manifest_mtime and not force:
+                return False
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported index version in {manifest_path}")
+            opened = {segment.path: segment for segment in self.segments}
+            segments = []
+            for name in manifest['segments']:
+                segment_path = os.path.join(self.path, name)
+                segments.append(opened.pop(segment_path, None) or Segment(segment_path))
+            # Retired, not closed: readers holding them close them on release
+            for segment in opened.values():
+                segment.release()
+            self.segments = segments
+            self.n_docs = manifest['n_docs']
+            self.next_doc_id = manifest.get('next_doc_id', self.n_docs)
+            self.deleted = frozenset(manifest.get('deleted', ()))
+            self.total_length = manifest['total_length']
+            self.generation = manifest['generation']
+            self._manifest_mtime = mtime
+            self._keys = None
+            return True
+
+    @contextmanager
+    def reading(self):
+        """
+        Keeps the current segments open until the block exits, even if a refresh or merge
+        (from this or another session) retires them meanwhile. Yields those segments.
+        """
+        with self._lock:
+            segments = list(self.segments)
+            for segment in segments:
+                segment.acquire()
+        try:
+            yield segments
+        finally:
+            for segment in segments:
+                segment.release()
+
+    @property
+    def avg_length(self):
+        return self.total_length / self.n_docs if self.n_docs else 0.0
+
+    def df(self, term):
+        return sum(segment.df(term) for segment in self.segments)
+
+    def idf(self, term, df=None):
+        """BM25 idf, always positive."""
+        df = self.df(term) if df is None else df
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def bm25(self, term, tf, length, df=None):
+        """Weight of a term occurring `tf` times in a document of `length` tokens."""
+        if tf <= 0:
+            return 0.0
+        norm = 1 - B + B * (length / self.avg_length if self.avg_length else 1.0)
+        return self.idf(term, df) * tf * (K1 + 1) / (tf + K1 * norm)
+
+    def postings(self, term):
+        """Yields (doc ids, tfs) per segment."""
+        for segment in self.segments:
+            doc_ids, tfs = segment.postings(term)
+            if len(doc_ids):
+                yield doc_ids, tfs
+
+    def doc_length(self, doc_id):
+        segment = self._segment_of(doc_id)
+        return segment.doc_lengths[doc_id - segment.doc_base]
+
+    def doc(self, doc_id):
+        """Metadata stored for a document."""
+        segment = self._segment_of(doc_id)
+        return segment.docs()[doc_id - segment.doc_base]
+
+    def payload(self, doc_id):
+        """The payload stored with a document (e.g. the JD text), or None."""
+        meta = self.doc(doc_id)
+        if 'payload_offset' not in meta:
+            return None
+        with open(os.path.join(self.path, PAYLOADS), 'rb') as f:
+            f.seek(meta['payload_offset'])
+            return json.loads(f.read(meta['payload_size']).decode('utf-8'))
+
+    def iter_payloads(self, segments=None):
+        """Yields (doc id, payload) of every live document with a payload (of `segments`), reading the file once."""
+        deleted = self.deleted
+        with open(os.path.join(self.path, PAYLOADS), 'rb') as f:
+            for segment in self.segments if segments is None else segments:
+                for i, meta in enumerate(segment.docs()):
+                    doc_id = segment.doc_base + i
+                    if doc_id in deleted or 'payload_offset' not in meta:
+                        continue
+                    f.seek(meta['payload_offset'])
+                    yield doc_id, json.loads(f.read(meta['payload_size']).decode('utf-8'))
+
+    def read_sidecar(self, segment, name):
+        """A segment's sidecar `name`: one JSON value per document of the segment, None if missing."""
+        try:
+            with open(_sidecar_path(segment.path, name), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write_sidecar(self, segment, name, values):
+        """Stores one JSON value per document of `segment`; merges carry the values over."""
+        if len(values) != segment.n_docs:
+            raise ValueError(f"Sidecar {name} has {len(values)} values for {segment.n_docs} documents")
+        write_atomic(_sidecar_path(segment.path, name), json.dumps(values, ensure_ascii=False))
+
+    def _segment_of(self, doc_id):
+        for segment in self.segments:
+            if segment.doc_base <= doc_id < segment.doc_base + segment.n_docs:
+                return segment
+        raise KeyError(doc_id)
+
+    def contains(self, term, doc_id):
+        """True if `term` occurs in the document."""
+        segment = self._segment_of(doc_id)
+        doc_ids, _ = segment.postings(term)
+        i = bisect_left(doc_ids, doc_id)
+        return i < len(doc_ids) and doc_ids[i] == doc_id
+
+    def keys(self):
+        """{key: doc id} of the documents not deleted."""
+        with self._lock:
+            if self._keys is None:
+                self._keys = {
+                    doc['key']: segment.doc_base + i
+                    for segment in self.segments
+                    for i, doc in enumerate(segment.docs())
+                }
+                for doc_id in self.deleted:
+                    key = self.doc(doc_id)['key']
+                    if self._keys.get(key) == doc_id:
+                        del self._keys[key]
+            return self._keys
+
+    # --- Writing ---
+
+    def add_documents(self, documents, replace=False):
+        """
+        documents: iterable of (key, term_counts, length, meta, payload); payload may be None.
+        A document whose key is already indexed is skipped, or with `replace` supersedes
+        the old one. Writes one new segment. Returns the number of documents added.
+        """
+        with self._lock:
+            self.refresh()
+            known = self.keys()
+            doc_base = self.next_doc_id
+            postings = {}
+            doc_lengths = []
+            docs = []
+            total_length = 0
+            replaced = []
+
+            payloads_path = os.path.join(self.path, PAYLOADS)
+            with open(payloads_path, 'ab') as payloads:
+                for key, term_counts, length, meta, payload in documents:
+                    if key in known:
+                        if not replace:
+                            continue
+                        replaced.append(known[key])
+                    doc_id = known[key] = doc_base + len(doc_lengths)
+                    for term, tf in term_counts.items():
+                        postings.setdefault(term, []).append((doc_id, tf))
+                    doc_lengths.append(length)
+                    total_length += length
+
+                    meta = dict(meta, key=key)
+                    if payload is not None:
+                        blob = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                        meta['payload_offset'] = payloads.tell()
+                        meta['payload_size'] = len(blob)
+                        payloads.write(blob)
+                    docs.append(meta)
+                payloads.flush()
+                os.fsync(payloads.fileno())
+
+            if not docs:
+                return 0
+
+            name = f"seg-{self.generation + 1:06d}.bin"
+            write_atomic(os.path.join(self.path, name.replace('seg-', 'docs-').replace('.bin', '.json')),
+                         json.dumps(docs, ensure_ascii=False))
+            write_segment(os.path.join(self.path, name), doc_base, doc_lengths, postings)
+            self._write_manifest(
+                [os.path.basename(segment.path) for segment in self.segments] + [name],
+                n_docs=self.n_docs + len(docs) - len(replaced),
+                next_doc_id=doc_base + len(docs),
+                deleted=self.deleted.union(replaced),
+                total_length=self.total_length + total_length - sum(
+                    doc_lengths[doc_id - doc_base] if doc_id >= doc_base else self.doc_length(doc_id)
+                    for doc_id in replaced
+                )
+            )
+            if len(self.segments) > MAX_SEGMENTS:
+                self.merge()
+            return len(docs)
+
+    def delete(self, keys):
+        """Marks the documents with these keys deleted. Returns the number deleted."""
+        with self._lock:
+            self.refresh()
+            known = self.keys()
+            doc_ids = [known.pop(key) for key in set(keys) if key in known]
+            if doc_ids:
+                self._write_manifest(
+                    [os.path.basename(segment.path) for segment in self.segments],
+                    n_docs=self.n_docs - len(doc_ids),
+                    next_doc_id=self.next_doc_id,
+                    deleted=self.deleted.union(doc_ids),
+                    total_length=self.total_length - sum(map(self.doc_length, doc_ids))
+                )
+            return len(doc_ids)
+
+    def merge(self):
+        """Merges all segments into one, dropping deleted documents (doc ids are renumbered)."""
+        with self._lock:
+            self.refresh()
+            if len(self.segments) <= 1 and not self.deleted:
+                return
+            deleted = self.deleted
+            new_ids = {}
+            doc_lengths = []
+            docs = []
+            for segment in self.segments:
+                for i, (length, doc) in enumerate(zip(segment.doc_lengths, segment.docs())):
+                    if segment.doc_base + i not in deleted:
+                        new_ids[segment.doc_base + i] = len(docs)
+                        doc_lengths.append(length)
+                        docs.append(doc)
+            # Postings are copied segment by segment straight into the new arrays;
+            # without gaps in the doc ids they are copied as raw bytes
+            renumber = len(docs) != self.next_doc_id
+            terms = sorted(set().union(*(segment.terms for segment in self.segments)))
+            offsets = _uint32([0])
+            doc_ids = _uint32()
+            tfs = _uint32()
+            for term in terms:
+                for segment in self.segments:
+                    segment_ids, segment_tfs = segment.postings(term)
+                    if not len(segment_ids):
+                        continue
+                    if renumber:
+                        for doc_id, tf in zip(segment_ids, segment_tfs):
+                            if doc_id in new_ids:
+                                doc_ids.append(new_ids[doc_id])
+                                tfs.append(tf)
+                    else:
+                        doc_ids.frombytes(segment_ids.tobytes())
+                        tfs.frombytes(segment_tfs.tobytes())
+                offsets.append(len(doc_ids))
+
+            name = f"seg-{self.generation + 1:06d}.bin"
+            write_atomic(os.path.join(self.path, name.replace('seg-', 'docs-').replace('.bin', '.json')),
+                         json.dumps(docs, ensure_ascii=False))
+            write_segment_arrays(os.path.join(self.path, name), 0, doc_lengths, terms, offsets, doc_ids, tfs)
+            # Sidecars every old segment has are concatenated, without the deleted documents
+            old_sidecars = [_sidecars(segment.path) for segment in self.segments]
+            for sidecar in set.intersection(*map(set, old_sidecars)):
+                values = [
+                    value
+                    for segment in self.segments
+                    for i, value in enumerate(self.read_sidecar(segment, sidecar))
+                    if segment.doc_base + i not in deleted
+                ]
+                write_atomic(_sidecar_path(os.path.join(self.path, name), sidecar), json.dumps(values, ensure_ascii=False))
+            old_paths = [segment.path for segment in self.segments]
+            self._write_manifest([name], n_docs=len(docs), next_doc_id=len(docs), deleted=(), total_length=sum(doc_lengths))
+            for path, sidecars in zip(old_paths, old_sidecars):
+                olds = [path, path.replace('seg-', 'docs-').replace('.bin', '.json')]
+                olds += [_sidecar_path(path, sidecar) for sidecar in sidecars]
+                for old in olds:
+                    if os.path.exists(old):
+                        os.remove(old)
+
+    def _write_manifest(self, segment_names, n_docs, next_doc_id, deleted, total_length):
+        # Caller holds the lock
+        manifest = {
+            'version': FORMAT_VERSION,
+            'segments': segment_names,
+            'n_docs': n_docs,
+            'next_doc_id': next_doc_id,
+            'deleted': sorted(deleted),
+            'total_length': total_length,
+            'generation': self.generation + 1
+        }
+        write_atomic(os.path.join(self.path, MANIFEST), json.dumps(manifest))
+        self.refresh(force=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'documents': self.n_docs,
+                'deleted': len(self.deleted),
+                'segments': len(self.segments),
+                'terms': len(set().union(*(segment.terms for segment in self.segments))) if self.segments else 0,
+                'avg_length': round(self.avg_length, 1),
+                'generation': self.generation
+            }
+
+    def close(self):
+        """Releases the index's segments; ones still being read close when their readers finish."""
+        with self._lock:
+            for segment in self.segments:
+                segment.release()
+            self.segments = []
+            self._manifest_mtime = None
@@ -1,6 +1,8 @@
-import re
 from collections import Counter
 
+import tokenizer
+from resume_document import compile_resume
+
 # Common stopwords to ignore (Turkish & English mix for safety)
 STOPWORDS = set([
     "ve", "ile", "için", "bir", "bu", "şu", "o", "ama", "fakat", "lakin",
@@ -11,22 +13,23 @@ STOPWORDS = set([
     "job", "description", "candidate", "work", "looking", "we", "are"
 ])
 
-def extract_keywords(text: str, top_n: int = 20) -> list:
+# CV fields compared against the JD, in order
+CV_TEXT_FIELDS = (
+    ('personal', ('summary',)),
+    ('experience', ('title', 'company', 'description')),
+    ('education', ('school', 'degree')),
+    ('skills', ('items',)),
+)
+
+def extract_keywords(text: str, top_n: int = 20, language: str = 'tr') -> list:
     """
     Extracts most frequent relevant words from text.
     """
-    text = text.lower()
-    # Remove special chars
-    text = re.sub(r'[^a-zA-ZğüşıöçĞÜŞİÖÇ\s]', ' ', text)
-    
-    words = text.split()
-    # Filter stopwords and short words
-    filtered_words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-    
-    counts = Counter(filtered_words)
+    # Stop words, numbers and short words are dropped; tech tokens like c++ and .net are kept
+    counts = Counter(tokenizer.iter_keywords(text, language, STOPWORDS, keep_numbers=False))
     return [item[0] for item in counts.most_common(top_n)]
 
-def compare_keywords(jd_text: str, cv_data: dict) -> dict:
+def compare_keywords(jd_text: str, cv_data: dict, language: str = 'tr') -> dict:
     """
     Compares JD text with CV content.
     Returns: {
@@ -37,23 +40,12 @@ def compare_keywords(jd_text: str, cv_data: dict) -> dict:
     }
     """
     # 1. Analyze JD
-    jd_kw = set(extract_keywords(jd_text, top_n=30))
+    jd_kw = set(extract_keywords(jd_text, top_n=30, language=language))
     
     # 2. Analyze CV
-    cv_text = ""
-    # Personal Summary
-    cv_text += cv_data.get('personal', {}).get('summary', '') + " "
-    # Experience
-    for exp in cv_data.get('experience', []):
-        cv_text += f"{exp.get('title','')} {exp.get('company','')} {exp.get('description','')} "
-    # Education
-    for edu in cv_data.get('education', []):
-        cv_text += f"{edu.get('school','')} {edu.get('degree','')} "
-    # Skills
-    for items in cv_data.get('skills', {}).values():
-        cv_text += f"{items} "
+    cv_text = compile_resume(cv_data).text(CV_TEXT_FIELDS)
         
-    cv_kw = set(extract_keywords(cv_text, top_n=100))
+    cv_kw = set(extract_keywords(cv_text, top_n=100, language=language))
     
     # 3. Compare
     matches = jd_kw.intersection(cv_kw)
@@ -0,0 +1,194 @@
+"""
+Local corpus of job descriptions in an on-disk inverted index (see inverted_index.py).
+Its document frequencies tell the matcher which JD terms are boilerplate ("team",
+"experience", "communication") and which are specific to a posting, so match scores and
+the missing list are IDF-weighted (BM25) instead of ranked by raw frequency.
+
+Usage:
+    python -m jd_index add postings/              # .txt files (one JD each) and .jsonl files
+    python -m jd_index add new_postings.jsonl     # incremental: known JDs are skipped
+    python -m jd_index stats
+    python -m jd_index terms job.txt              # top JD terms with their weights
+
+The index lives at $ATS_JD_INDEX (default ~/.cache/ats-resume-builder/jd_index).
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import tokenizer
+from inverted_index import InvertedIndex
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ats-resume-builder', 'jd_index')
+# JDs per segment when adding a large corpus
+BATCH_SIZE = 10000
+TITLE_LENGTH = 80
+
+
+def index_terms(text, language='tr', ngrams=False):
+    """
+    (term counts, token count) of one JD, in the term forms the matcher scores:
+    single keywords, known skill phrases and short skills ("R", "Go").
+    With ngrams, also every word pair and triple a JD can score as a repeated phrase.
+    """
+    from matcher_utils import find_short_skills, get_skills, iter_ngrams
+    tokens = tokenizer.tokens(text, language)
+    counts = Counter(
+        token for token in tokens
+        if len(token) >= tokenizer.MIN_KEYWORD_LENGTH or not token.isalnum()
+    )
+    skill_trie, _ = get_skills()
+    counts.update(skill_trie.count(tokens))
+    counts.update(find_short_skills(text))
+    if ngrams:
+        # Skill phrases are already counted by the trie
+        phrases = Counter(' '.join(gram) for _, gram in iter_ngrams(tokens, language))
+        counts.update({phrase: count for phrase, count in phrases.items() if phrase not in counts})
+    return counts, len(tokens)
+
+
+def _title(text, fallback):
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line[:TITLE_LENGTH]
+    return fallback
+
+
+def iter_corpus(path):
+    """
+    Yields (source, title, text) from a .txt file (one JD), a .jsonl file (one JD per
+    line: a string or {"text"/"description", "title", "id"}) or a directory of them.
+    """
+    if os.path.isdir(path):
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                if name.endswith(('.txt', '.jsonl')):
+                    yield from iter_corpus(os.path.join(root, name))
+    else:
+        with open(path, encoding='utf-8') as f:
+            yield from iter_records(path, f)
+
+
+def iter_records(name, lines):
+    """(source, title, text) of one corpus file, given its name and its lines."""
+    if name.endswith('.jsonl'):
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {'text': record}
+            text = record.get('text') or record.get('description') or ''
+            if text.strip():
+                source = f"{name}:{record.get('id', line_no)}"
+                yield source, record.get('title') or _title(text, source), text
+    else:
+        text = ''.join(lines)
+        if text.strip():
+            yield name, _title(text, os.path.basename(name)), text
+
+
+def jd_key(text):
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+def _documents(records, language, known):
+    for source, title, text in records:
+        key = jd_key(text)
+        # Known JDs are skipped before the (costly) tokenization
+        if key not in known:
+            counts, length = index_terms(text, language)
+            yield key, counts, length, {'title': title, 'source': source}, text
+
+
+def add_corpus(index, path, language='tr', batch_size=BATCH_SIZE):
+    """Indexes the JDs under `path` that are not in `index` yet. Returns the number added."""
+    return add_records(index, iter_corpus(path), language, batch_size)
+
+
+def add_records(index, records, language='tr', batch_size=BATCH_SIZE):
+    """Indexes (source, title, text) records that are not in `index` yet. Returns the number added."""
+    added = 0
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            added += index.add_documents(_documents(batch, language, index.keys()))
+            batch = []
+    if batch:
+        added += index.add_documents(_documents(batch, language, index.keys()))
+    return added
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def open_index(path=None):
+    """
+    Process-wide index at `path`, $ATS_JD_INDEX or DEFAULT_PATH, created if missing.
+    Picks up JDs added by another process (e.g. the CLI) on every call.
+    """
+    global _index
+    path = path or os.environ.get('ATS_JD_INDEX') or DEFAULT_PATH
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = InvertedIndex(path)
+        else:
+            _index.refresh()
+        return _index
+
+
+def get_index():
+    """The process-wide index, None while there is none or it holds no JDs."""
+    path = os.environ.get('ATS_JD_INDEX') or DEFAULT_PATH
+    if _index is None and not os.path.exists(os.path.join(path, 'manifest.json')):
+        return None
+    index = open_index(path)
+    return index if index.n_docs else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local job description corpus for IDF-weighted matching.")
+    parser.add_argument('--index', default=os.environ.get('ATS_JD_INDEX') or DEFAULT_PATH, help="Index directory")
+    parser.add_argument('--language', default='tr', choices=['tr', 'en'])
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="Index the JDs in a .txt/.jsonl file or a directory")
+    add.add_argument('path')
+    commands.add_parser('stats', help="Show index statistics")
+    commands.add_parser('merge', help="Merge all segments into one")
+    terms = commands.add_parser('terms', help="Show the weighted terms of a JD file")
+    terms.add_argument('path')
+    args = parser.parse_args(argv)
+
+    index = open_index(args.index)
+    if args.command == 'add':
+        t0 = time.perf_counter()
+        added = add_corpus(index, args.path, args.language)
+        print(f"Added {added} job descriptions in {time.perf_counter() - t0:.2f}s")
+    elif args.command == 'merge':
+        index.merge()
+    elif args.command == 'terms':
+        from matcher_utils import JobMatcher
+        with open(args.path, encoding='utf-8') as f:
+            matcher = JobMatcher(f.read(), args.language)
+        weights = matcher.weights(index)
+        for term in matcher.top_terms(index):
+            print(f"{weights[term]:8.2f}  {term}")
+        return 0
+
+    for name, value in index.stats().items():
+        print(f"{name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
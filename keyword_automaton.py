@@ -0,0 +1,155 @@
+"""
+Aho-Corasick keyword automaton with regex-compatible word boundaries.
+Counts every keyword of a (possibly large) keyword set in one pass over the text.
+"""
+import re
+
+# Alternating runs of word / non-word characters. A regex word boundary (\b) can only
+# fall between two runs, so a keyword wrapped in \b always covers whole runs.
+_RUN_PATTERN = re.compile(r'\w+|\W+')
+
+
+def _is_word(ch):
+    # Same definition of a word character as the re module uses for str patterns
+    return ch.isalnum() or ch == '_'
+
+
+def _runs(text):
+    """
+    _RUN_PATTERN.findall(text), split on spaces first. Normalized text is mostly words
+    joined by single spaces, which str.split and str.isalnum handle without the regex;
+    only tokens with symbols in them (c++, ci/cd) go through it.
+    """
+    pieces = text.split(' ')
+    if all(map(str.isalnum, pieces)):
+        runs = [' '] * (2 * len(pieces) - 1)
+        runs[::2] = pieces
+        return runs
+    runs = []
+    append = runs.append
+    # Non-word text not emitted yet: separators merge with the symbols next to them
+    pending = ''
+    for piece in pieces:
+        if piece.isalnum():
+            if pending:
+                append(pending)
+            append(piece)
+            pending = ' '
+            continue
+        for run in _RUN_PATTERN.findall(piece):
+            if _is_word(run[0]):
+                if pending:
+                    append(pending)
+                append(run)
+                pending = ''
+            else:
+                pending += run
+        pending += ' '
+    pending = pending[:-1]
+    if pending:
+        append(pending)
+    return runs
+
+
+class KeywordAutomaton:
+    """
+    Compiled once from a list of keywords (multi-word phrases allowed).
+    count(text) returns the same counts as len(re.findall(r'\\b' + re.escape(kw) + r'\\b', text))
+    for every keyword: matches must sit on word boundaries and do not overlap
+    with earlier matches of the same keyword.
+
+    The automaton runs over word/non-word runs instead of characters, which keeps
+    the Python-level loop short; the runs are cut with str.split where the text allows.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = []
+        self._index = {}
+        # Node 0 is the root; per node: transitions, failure link, ids of keywords ending here
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._lengths = []
+        # Keywords starting/ending with a non-word char need a word char on the other side of \b
+        self._open_start = []
+        self._open_end = []
+
+        for keyword in keywords:
+            if not keyword or keyword in self._index:
+                continue
+            kid = len(self.keywords)
+            self._index[keyword] = kid
+            self.keywords.append(keyword)
+
+            runs = _RUN_PATTERN.findall(keyword)
+            self._lengths.append(len(runs))
+            self._open_start.append(not _is_word(keyword[0]))
+            self._open_end.append(not _is_word(keyword[-1]))
+
+            node = 0
+            for run in runs:
+                nxt = self._goto[node].get(run)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][run] = nxt
+                node = nxt
+            self._out[node] = self._out[node] + (kid,)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for run, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and run not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(run, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the failure target so every match is reported at its end
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def count(self, text):
+        """Returns {keyword: count} for every keyword found in `text` (keywords with 0 hits omitted)."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        lengths = self._lengths
+        open_start = self._open_start
+        open_end = self._open_end
+        runs = _runs(text)
+        last = len(runs) - 1
+        counts = {}
+        last_end = {}
+
+        node = 0
+        for i, run in enumerate(runs):
+            nxt = goto[node].get(run)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto[node].get(run)
+            node = nxt or 0
+            if not out[node]:
+                continue
+
+            for kid in out[node]:
+                start = i + 1 - lengths[kid]
+                if start < last_end.get(kid, 0):
+                    continue
+                # \b at the very start/end of the text needs a word char there
+                if start == 0 and open_start[kid]:
+                    continue
+                if i == last and open_end[kid]:
+                    continue
+                last_end[kid] = i + 1
+                counts[kid] = counts.get(kid, 0) + 1
+
+        return {self.keywords[kid]: c for kid, c in counts.items()}
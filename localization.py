@@ -31,6 +31,7 @@ STRINGS = {
         'sidebar_upload_backup': "📤 Yedeği Yükle",
         'sidebar_upload_success': "Veriler yüklendi!",
         'sidebar_upload_error': "Geçersiz dosya formatı.",
+        'sidebar_cache_debug': "🔧 Önbellek (Debug)",
         
         # Step 0
         'intro_title': "👋 Merhaba!",
@@ -103,6 +104,15 @@ STRINGS = {
         's5_text_area': "İş İlanı Metni",
         's5_placeholder': "İlan detaylarını buraya yapıştırın...",
         's5_match_score': "Eşleşme Puanı",
+        's5_weighted': "Terimler, {count} ilanlık yerel ilan arşivine göre ağırlıklandırıldı (BM25).",
+        's5_corpus_title': "📚 Kayıtlı İlanları Sırala",
+        's5_corpus_upload': "İlan ekle (.txt: bir ilan, .jsonl: satır başına bir ilan)",
+        's5_corpus_btn_add': "İlanları Arşive Ekle",
+        's5_corpus_added': "{count} yeni ilan eklendi.",
+        's5_corpus_empty': "Arşivde henüz ilan yok. Yukarıdan ekleyin veya `python -m jd_index add` kullanın.",
+        's5_corpus_col_job': "İlan",
+        's5_corpus_col_matched': "Eşleşen",
+        's5_corpus_col_missing': "Eksik",
         's5_btn_skip': "Analiz Yapmadan Geç (Atla)",
         's5_btn_analyze': "Sonuçlarla İlerle",
         
@@ -116,6 +126,7 @@ STRINGS = {
         's6_academic_desc': "Yoğun içerik, minimal boşluk, teknik roller için ideal.",
         's6_btn_select': "Seç:",
         's6_selected_msg': "Seçilen Şablon:",
+        's6_rendering': "⏳ Önizleme hazırlanıyor...",
         
         # Step 7
         's7_success': "Tebrikler! CV'niz oluşturulmaya hazır.",
@@ -138,6 +149,8 @@ STRINGS = {
         's7_header_edu': "#### Eğitim",
         's7_header_skills': "#### Beceriler",
         's7_btn_reset_trans': "🔄 Çeviriyi Sıfırla / Yeniden Çevir",
+        's7_btn_sync_trans': "🔁 Çeviriyi Güncelle (Sadece Değişenler)",
+        's7_sync_done': "Çeviri güncellendi: {count} alan yeniden çevrildi.",
         's7_btn_download_en': "🇬🇧 PDF İNDİR (ENGLISH)",
         's7_tip': "💡 **İpucu:** Online başvurular için DOCX, e-posta veya bağımsız paylaşım için PDF kullanın.",
         's7_btn_restart': "Başa Dön",
@@ -176,6 +189,7 @@ STRINGS = {
         'sidebar_upload_backup': "📤 Upload Backup",
         'sidebar_upload_success': "Data loaded successfully!",
         'sidebar_upload_error': "Invalid file format.",
+        'sidebar_cache_debug': "🔧 Cache (Debug)",
         
         # Step 0
         'intro_title': "👋 Hello!",
@@ -248,6 +262,15 @@ STRINGS = {
         's5_text_area': "Job Description Text",
         's5_placeholder': "Paste job details here...",
         's5_match_score': "Match Score",
+        's5_weighted': "Terms are weighted against a local corpus of {count} job descriptions (BM25).",
+        's5_corpus_title': "📚 Rank Saved Job Descriptions",
+        's5_corpus_upload': "Add postings (.txt: one posting, .jsonl: one per line)",
+        's5_corpus_btn_add': "Add to Corpus",
+        's5_corpus_added': "{count} new job descriptions added.",
+        's5_corpus_empty': "The corpus is empty. Add postings above or run `python -m jd_index add`.",
+        's5_corpus_col_job': "Job",
+        's5_corpus_col_matched': "Matched",
+        's5_corpus_col_missing': "Missing",
         's5_btn_skip': "Skip Analysis",
         's5_btn_analyze': "Proceed with Results",
         
@@ -261,6 +284,7 @@ STRINGS = {
         's6_academic_desc': "Dense content, minimal whitespace, ideal for technical roles.",
         's6_btn_select': "Select:",
         's6_selected_msg': "Selected Template:",
+        's6_rendering': "⏳ Rendering preview...",
         
         # Step 7
         's7_success': "Congratulations! Your CV is ready to be generated.",
@@ -283,6 +307,8 @@ STRINGS = {
         's7_header_edu': "#### Education",
         's7_header_skills': "#### Skills",
         's7_btn_reset_trans': "🔄 Reset / Re-translate",
+        's7_btn_sync_trans': "🔁 Sync Translation (Changed Fields Only)",
+        's7_sync_done': "Translation synced: {count} fields re-translated.",
         's7_btn_download_en': "🇬🇧 DOWNLOAD PDF (ENGLISH)",
         's7_tip': "💡 **Tip:** Use DOCX for online applications, PDF for email or direct sharing.",
         's7_btn_restart': "Start Over",
@@ -1,5 +1,9 @@
 import re
 from collections import Counter
+from functools import lru_cache
+
+import tokenizer
+from resume_document import compile_resume
 
 STOP_WORDS_TR = {
     've', 'veya', 'ile', 'için', 'bir', 'bu', 'şu', 'o', 'de', 'da', 'ki', 'mi', 'mu', 'ama', 'fakat', 
@@ -16,76 +20,275 @@ STOP_WORDS_EN = {
     'candidate', 'apply', 'role', 'team', 'skills', 'ability', 'knowledge', 'proficiency'
 }
 
-def clean_text(text):
-    text = text.lower()
-    # Remove special chars but keep hashtags for things like C# or .NET might use special chars
-    # For simplicity, remove non-alphanumeric except + and #
-    text = re.sub(r'[^a-z0-9\s\+#üğışçö]', ' ', text)
-    return text
+def clean_text(text, language='tr'):
+    """Lowercased text with only the tokens left (C++, C#, .NET, CI/CD survive)"""
+    return tokenizer.normalize(text, language)
 
 def extract_keywords(text, language='tr'):
-    cleaned = clean_text(text)
-    words = cleaned.split()
-    
     stop_words = STOP_WORDS_TR if language == 'tr' else STOP_WORDS_EN
-    
-    # Filter stopwords and short words
-    keywords = [w for w in words if w not in stop_words and len(w) > 2]
-    return keywords
-
-def calculate_match_score(resume_text, job_desc, language='tr'):
-    resume_keywords = set(extract_keywords(resume_text, language))
-    job_keywords = extract_keywords(job_desc, language)
-    
-    # Job keywords frequency to determine importance
-    job_counts = Counter(job_keywords)
-    
-    # Analyze
-    total_job_terms = len(job_counts)
-    if total_job_terms == 0:
-        return 0, [], []
-        
-    matched = []
-    missing = []
-    
-    for term, count in job_counts.most_common(20): # Top 20 most frequent keywords in job desc
-        if term in resume_keywords:
-            matched.append(term)
+    # Stop words and words shorter than 3 characters are dropped, tech tokens like c# are kept
+    return list(tokenizer.iter_keywords(text, language, stop_words))
+
+# Multi-word skills and short skill names that single-word matching cannot see
+EXTRA_SKILLS = (
+    'Data Science', 'Data Engineering', 'Computer Vision', 'Cloud Computing', 'Google Analytics',
+    'Unit Testing', 'Software Development', 'Product Management', 'Customer Service',
+    'Spring Boot', 'React Native', 'Go', 'C', 'C++', 'C#', 'Java', 'JavaScript', 'TypeScript',
+    'Makine Öğrenmesi', 'Derin Öğrenme', 'Veri Analizi', 'Veri Bilimi', 'Proje Yönetimi',
+    'Tedarik Zinciri', 'Doğal Dil İşleme', 'İş Zekası'
+)
+
+TOP_TERMS = 20
+NGRAM_SIZES = (2, 3)
+# A JD n-gram that is not a known skill must repeat to count as a term
+MIN_NGRAM_COUNT = 2
+# Skills this short ("R", "Go", "C") are only recognized when written with a capital
+SHORT_SKILL_LENGTH = 2
+
+
+def iter_ngrams(tokens, language='tr'):
+    """Yields (position, gram) for every word pair and triple a JD could score as a phrase."""
+    stop_words = STOP_WORDS_TR if language == 'tr' else STOP_WORDS_EN
+    for size in NGRAM_SIZES:
+        for i in range(len(tokens) - size + 1):
+            gram = tuple(tokens[i:i + size])
+            if any(token in stop_words or not token.isalpha() or len(token) < 3 for token in gram):
+                continue
+            yield i, gram
+
+
+class TokenTrie:
+    """Trie of phrases (token tuples). scan() finds every phrase in one pass over a token stream."""
+
+    def __init__(self, phrases=()):
+        self._root = {}
+        self.depth = 0
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase):
+        node = self._root
+        for token in phrase:
+            node = node.setdefault(token, {})
+        node[None] = ' '.join(phrase)
+        self.depth = max(self.depth, len(phrase))
+
+    def scan(self, tokens):
+        """Yields (position, phrase) for every occurrence; O(len(tokens) * depth)."""
+        tokens = tokens if isinstance(tokens, list) else list(tokens)
+        root = self._root
+        for i in range(len(tokens)):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                phrase = node.get(None)
+                if phrase is not None:
+                    yield i, phrase
+                if j >= len(tokens):
+                    break
+                node = node.get(tokens[j])
+                j += 1
+
+    def count(self, tokens):
+        return Counter(phrase for _, phrase in self.scan(tokens))
+
+
+_skills = None
+
+def get_skills():
+    """(trie of known skill phrases, regex for the short ones), built on first use"""
+    global _skills
+    if _skills is None:
+        from ats_keyword_analyzer import CRITICAL_KEYWORDS
+        names = [name for names in CRITICAL_KEYWORDS.values() for name in names] + list(EXTRA_SKILLS)
+        short = sorted({name for name in names if len(name) <= SHORT_SKILL_LENGTH and name.isalpha()})
+        trie = TokenTrie(
+            tuple(tokenizer.tokens(name, 'en')) for name in names if name not in short
+        )
+        # "&" is excluded so the R in "R&D" is not the R language
+        short_pattern = re.compile(r'(?<![\w+#.\-&])(?:' + '|'.join(map(re.escape, short)) + r')(?![\w+#\-&])')
+        _skills = (trie, short_pattern)
+    return _skills
+
+# What may precede a capitalized word that only starts a sentence ("Go ahead")
+_SENTENCE_END = frozenset('.!?\n•*-')
+# What may follow a short skill in a list ("Go, Python", "R/SQL", a line of its own)
+_LIST_CONTEXT = re.compile(r'[ \t]*(?:[,/;|)]|$)', re.MULTILINE)
+
+
+def find_short_skills(text):
+    """Short skill names ("R", "Go"); at a sentence start only when listed, not "Go ahead"."""
+    found = Counter()
+    for match in get_skills()[1].finditer(text):
+        i = match.start() - 1
+        while i >= 0 and text[i] in ' \t':
+            i -= 1
+        if (i < 0 or text[i] in _SENTENCE_END) and not _LIST_CONTEXT.match(text, match.end()):
+            continue
+        found[match.group().lower()] += 1
+    return found
+
+
+class JobMatcher:
+    """
+    Scoring terms of one job description: known skills (multi-word ones included),
+    repeated JD bigrams/trigrams and single keywords, the TOP_TERMS most frequent.
+    Built once per JD; matching a resume is a single pass over its tokens.
+    """
+
+    def __init__(self, job_desc, language='tr'):
+        self.language = language
+        stop_words = STOP_WORDS_TR if language == 'tr' else STOP_WORDS_EN
+        tokens = tokenizer.tokens(job_desc, language)
+        skill_trie, _ = get_skills()
+
+        counts = Counter()
+        first_seen = {}
+        def add(term, count, position):
+            counts[term] += count
+            first_seen.setdefault(term, position)
+
+        phrases = {}
+        for position, skill in skill_trie.scan(tokens):
+            add(skill, 1, position)
+            phrases[skill] = tuple(skill.split(' '))
+        for skill, count in find_short_skills(job_desc).items():
+            add(skill, count, -1)
+            phrases[skill] = (skill,)
+
+        ngrams = Counter()
+        ngram_positions = {}
+        for i, gram in iter_ngrams(tokens, language):
+            ngrams[gram] += 1
+            ngram_positions.setdefault(gram, i)
+        # A bigram that only occurs inside a repeated trigram adds nothing
+        in_trigrams = Counter()
+        for gram, count in ngrams.items():
+            if len(gram) == 3 and count >= MIN_NGRAM_COUNT:
+                for part in {gram[:2], gram[1:]}:
+                    in_trigrams[part] = max(in_trigrams[part], count)
+        for gram, count in ngrams.items():
+            term = ' '.join(gram)
+            if count >= MIN_NGRAM_COUNT and term not in counts and in_trigrams[gram] < count:
+                add(term, count, ngram_positions[gram])
+                phrases[term] = gram
+
+        # Single words already covered by a phrase term are not scored twice
+        covered = {token for phrase in phrases.values() if len(phrase) > 1 for token in phrase}
+        for position, token in enumerate(tokens):
+            if token in covered or token in phrases:
+                continue
+            if (len(token) >= tokenizer.MIN_KEYWORD_LENGTH or not token.isalnum()) and token not in stop_words:
+                add(token, 1, position)
+                phrases[token] = (token,)
+
+        self.length = len(tokens)
+        self._first_seen = first_seen
+        self._candidates = counts
+        self._phrases = {term: phrases[term] for term in counts}
+        self._weights = None
+
+        ranked = sorted(counts, key=lambda term: (-counts[term], first_seen[term]))
+        self.terms = ranked[:TOP_TERMS]
+        self.counts = {term: counts[term] for term in self.terms}
+        # Every candidate is searched, so the IDF-weighted top terms need no second scan
+        self._short = {term for term in counts if len(term) <= SHORT_SKILL_LENGTH and term.isalpha()}
+        self._trie = TokenTrie(phrases[term] for term in counts if term not in self._short)
+
+    def weights(self, index):
+        """BM25 weight of every candidate term, with document frequencies from a JD corpus index."""
+        key = (id(index), index.generation)
+        cached = self._weights
+        if cached is None or cached[0] != key:
+            weights = {}
+            with index.reading():
+                for term, count in self._candidates.items():
+                    df = index.df(term)
+                    phrase = self._phrases[term]
+                    if not df and len(phrase) > 1:
+                        # Repeated n-grams are not indexed; a phrase is at most as common as its rarest word
+                        df = min(index.df(token) for token in phrase)
+                    weights[term] = index.bm25(term, count, self.length, df=df)
+            cached = self._weights = (key, weights)
+        return cached[1]
+
+    def top_terms(self, index=None):
+        """The TOP_TERMS scoring terms: most frequent, or highest BM25 weight given a corpus index."""
+        if index is None or not index.n_docs:
+            return self.terms
+        weights = self.weights(index)
+        first_seen = self._first_seen
+        return sorted(weights, key=lambda term: (-weights[term], first_seen[term]))[:TOP_TERMS]
+
+    def find(self, resume_text):
+        """Terms present in `resume_text`, in one pass over its token stream."""
+        found = {phrase for _, phrase in self._trie.scan(tokenizer.iter_tokens(resume_text, self.language))}
+        if self._short:
+            found.update(term for term in find_short_skills(resume_text) if term in self._short)
+        return found
+
+    def score(self, found, index=None):
+        """
+        (score, matched, missing) given the set of terms found in the resume.
+        With a corpus index the terms are IDF-weighted and missing is ordered by weight.
+        """
+        terms = self.top_terms(index)
+        matched = [term for term in terms if term in found]
+        missing = [term for term in terms if term not in found]
+        if terms is self.terms:
+            score = (len(matched) / len(terms)) * 100 if terms else 0
         else:
-            missing.append(term)
-            
-    # Simple score: (matched / total_top_20) * 100
-    # Actually, let's look at top 20 ONLY for scoring to be meaningful
-    relevant_terms_count = len(matched) + len(missing)
-    if relevant_terms_count == 0:
-        score = 0
+            weights = self.weights(index)
+            total = sum(weights[term] for term in terms)
+            score = sum(weights[term] for term in matched) / total * 100 if total else 0
+        return int(score), matched, missing
+
+
+@lru_cache(maxsize=64)
+def get_job_matcher(job_desc, language='tr'):
+    return JobMatcher(job_desc, language)
+
+def resume_terms(resume_text, language='tr'):
+    """
+    Every phrase a JD term could be (all token n-grams up to the longest skill, plus
+    short skills written with a capital), so matching against a JD is set lookups only.
+    """
+    tokens = tokenizer.tokens(resume_text, language)
+    max_size = max(get_skills()[0].depth, max(NGRAM_SIZES))
+    # Short single words only count as the capitalized skill names found below
+    terms = {token for token in tokens if len(token) > SHORT_SKILL_LENGTH or not token.isalpha()}
+    for size in range(2, max_size + 1):
+        terms.update(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    terms.update(find_short_skills(resume_text))
+    return frozenset(terms)
+
+def calculate_match_score(resume_text, job_desc, language='tr', resume_keywords=None, index=None):
+    """
+    Returns (score, matched, missing) for the top JD terms, phrases like
+    "machine learning" or "power bi" included. Linear in the length of both texts.
+    Pass `resume_keywords` (resume_terms() of the resume) to skip re-tokenizing the resume text,
+    and a JD corpus `index` (jd_index.get_index()) to weight the terms by BM25 instead of frequency.
+    """
+    matcher = get_job_matcher(job_desc, language)
+    if not matcher.terms:
+        return 0, [], []
+    if resume_keywords is None:
+        found = matcher.find(resume_text)
     else:
-        score = (len(matched) / relevant_terms_count) * 100
-        
-    return int(score), matched, missing
+        found = {term for term in matcher.top_terms(index) if term in resume_keywords}
+    return matcher.score(found, index)
+
+# Fields used for job matching, in order
+RESUME_TEXT_FIELDS = (
+    ('personal', ('summary',)),
+    ('experience', ('title', 'description')),
+    ('skills', ('items',)),
+    ('education', ('degree', 'school')),
+)
 
 def get_resume_text(data):
     """
     Converts structured JSON resume data into a single string for analysis.
+    Accepts a raw profile dict or a compiled ResumeDocument.
     """
-    text = []
-    
-    # Personal
-    p = data.get('personal', {})
-    text.append(p.get('summary', ''))
-    
-    # Experience
-    for exp in data.get('experience', []):
-        text.append(exp.get('title', ''))
-        text.append(exp.get('description', ''))
-        
-    # Skills
-    for cat, items in data.get('skills', {}).items():
-        text.append(items)
-        
-    # Education
-    for edu in data.get('education', []):
-        text.append(edu.get('degree', ''))
-        text.append(edu.get('school', ''))
-        
-    return " ".join(text)
+    return compile_resume(data).text(RESUME_TEXT_FIELDS)
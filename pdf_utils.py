@@ -1,10 +1,42 @@
 import base64
+import hashlib
 import streamlit as st
 
-def display_pdf(pdf_bytes):
+import preview_server
+
+def display_pdf(pdf_bytes, height=800, thumbnail=False, slot=None):
     """
     Displays a PDF file in Streamlit using an iframe.
+    By default the PDF is embedded as a base64 data URI, which works for any deployment.
+    With $ATS_PREVIEW_URL set, the bytes are served by content hash from the preview
+    server instead, so an unchanged PDF keeps its URL and the browser reuses its cached
+    copy; if that server cannot be started the data URI is used.
+    thumbnail=True hides the viewer toolbar and fits the first page to the width.
+    slot is an st.empty placeholder to draw into instead of the current container.
+    """
+    src = None
+    if preview_server.enabled():
+        try:
+            src = preview_server.get_server().publish(pdf_bytes)
+        except OSError:
+            pass
+    if src is None:
+        src = "data:application/pdf;base64," + base64.b64encode(pdf_bytes).decode('utf-8')
+    if thumbnail:
+        src += "#toolbar=0&navpanes=0&scrollbar=0&view=FitH"
+    pdf_display = f'<iframe src="{src}" width="100%" height="{height}" type="application/pdf"></iframe>'
+    (slot or st).markdown(pdf_display, unsafe_allow_html=True)
+
+
+def display_pdf_once(slot, shown, key, pdf_bytes, **kwargs):
+    """
+    display_pdf into `slot` unless it already shows these bytes.
+    `shown` maps slot keys to the content hash last drawn there; a polling fragment
+    keeps it in session_state so unchanged previews are not sent to the browser again.
     """
-    base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="800" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    if shown.get(key) == digest:
+        return False
+    display_pdf(pdf_bytes, slot=slot, **kwargs)
+    shown[key] = digest
+    return True
@@ -0,0 +1,185 @@
+"""
+Background pre-rendering.
+While the user is on the template step, every template (and the DOCX) is rendered
+for the current data into the shared render cache, so the template cards can show real
+previews and the final step finds its files already rendered.
+A newer data version cancels the jobs still queued for the old one.
+
+The renders run on the export worker processes (export.py), so they do not hold the GIL
+the Streamlit script thread needs; the prefetch threads only wait for them. Without a
+worker pool (a single CPU, ATS_EXPORT_WORKERS=0) they render here, on one thread.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import render_cache
+
+TEMPLATES = ["Klasik", "Modern", "Akademik"]
+MAX_WORKERS = 2
+MAX_OWNERS = 256
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class PrefetchJob:
+    """Renders of one data version for one owner (a session). Artifact name -> future."""
+
+    def __init__(self, version, language, theme_color):
+        self.version = version
+        self.language = language
+        self.theme_color = theme_color
+        self.futures = OrderedDict()
+        self.running = set()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+        for future in self.futures.values():
+            future.cancel()
+
+    def status(self):
+        """Returns {artifact: 'pending'|'running'|'done'|'failed'|'cancelled'}."""
+        result = {}
+        for name, future in self.futures.items():
+            if future.cancelled():
+                result[name] = CANCELLED
+            elif future.done():
+                if future.exception() is not None:
+                    result[name] = FAILED
+                else:
+                    result[name] = DONE if future.result() is not None else CANCELLED
+            else:
+                result[name] = RUNNING if name in self.running else PENDING
+        return result
+
+    @property
+    def done(self):
+        return all(future.done() for future in self.futures.values())
+
+
+class Prefetcher:
+    """
+    Process-wide pre-renderer. A bounded thread pool hands the renders to the export
+    worker processes. One job per owner: prefetch() with a new version cancels the
+    owner's previous job.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._jobs = OrderedDict()  # owner -> PrefetchJob, least recently used first
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rendered = 0
+        self.cancelled = 0
+
+    def _get_executor(self):
+        # Caller holds the lock
+        if self._executor is None:
+            import export
+            # Renders that fall back to this process would compete for the GIL: one at a time
+            max_workers = min(self.max_workers, export.workers()) or 1
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prerender')
+        return self._executor
+
+    def prefetch(self, owner, version, data, templates=TEMPLATES, language='tr',
+                 theme_color=render_cache.DEFAULT_THEME_COLOR, docx=True):
+        """
+        Starts rendering `data` in every template (and as DOCX) unless a job for this
+        owner and version already exists. Returns the job.
+        """
+        with self._lock:
+            job = self._jobs.get(owner)
+            if job is not None and job.version == version and job.language == language and job.theme_color == theme_color:
+                self._jobs.move_to_end(owner)
+                return job
+
+        # The caller keeps editing its data, the workers render a snapshot
+        snapshot = copy.deepcopy(data)
+        new_job = PrefetchJob(version, language, theme_color)
+
+        with self._lock:
+            old_job = self._jobs.pop(owner, None)
+            if old_job is not None and not old_job.done:
+                old_job.cancel()
+                self.cancelled += 1
+            executor = self._get_executor()
+            for template in templates:
+                new_job.futures[template] = executor.submit(self._render, new_job, template, snapshot)
+            if docx:
+                new_job.futures['docx'] = executor.submit(self._render, new_job, 'docx', snapshot)
+            self.submitted += len(new_job.futures)
+
+            self._jobs[owner] = new_job
+            while len(self._jobs) > MAX_OWNERS:
+                self._jobs.popitem(last=False)[1].cancel()
+        return new_job
+
+    def _render(self, job, name, data):
+        # Returns None when the job was cancelled before this render started
+        if job.cancelled.is_set():
+            return None
+        import export
+        job.running.add(name)
+        try:
+            if name == 'docx':
+                result = export.render_docx(data, language=job.language)
+            else:
+                result = export.render_pdf(data, name, language=job.language, theme_color=job.theme_color)
+        finally:
+            job.running.discard(name)
+        with self._lock:
+            self.rendered += 1
+        return result
+
+    def job(self, owner):
+        with self._lock:
+            return self._jobs.get(owner)
+
+    def cancel(self, owner):
+        """Cancels the owner's queued renders (a render already running still finishes)."""
+        with self._lock:
+            job = self._jobs.pop(owner, None)
+            if job is not None and not job.done:
+                self.cancelled += 1
+        if job is not None:
+            job.cancel()
+
+    def status(self, owner):
+        job = self.job(owner)
+        return job.status() if job is not None else {}
+
+    def result(self, owner, name):
+        """Rendered bytes of one artifact of the owner's job, or None if not (yet) available."""
+        job = self.job(owner)
+        future = job.futures.get(name) if job is not None else None
+        if future is None or not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def wait(self, owner, timeout=None):
+        """Waits for the owner's job to finish. Returns True if it did within `timeout`."""
+        job = self.job(owner)
+        if job is None:
+            return True
+        done, not_done = wait(list(job.futures.values()), timeout=timeout)
+        return not not_done
+
+    def stats(self):
+        with self._lock:
+            return {
+                'owners': len(self._jobs),
+                'submitted': self.submitted,
+                'rendered': self.rendered,
+                'cancelled': self.cancelled
+            }
+
+
+# Shared by every session in the process
+prefetcher = Prefetcher()
@@ -0,0 +1,152 @@
+"""
+Local byte endpoint for the live PDF preview.
+PDFs are published under their content hash (/preview/<sha256>.pdf) and served with
+immutable cache headers, so the preview iframe URL only changes when the PDF does and
+the browser never downloads an unchanged preview again.
+
+Opt-in: the server listens on its own port, which a browser can only reach when it runs
+on the same machine or a proxy routes to it. Set $ATS_PREVIEW_PORT and $ATS_PREVIEW_URL,
+the address the browser should use (e.g. http://127.0.0.1:8502 locally, or the proxied
+https URL), to enable it; otherwise previews are embedded as data URIs in the app's page.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = '127.0.0.1'
+MAX_ENTRIES = 32
+URL_PREFIX = '/preview/'
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+    server_version = 'ATSPreview/1.0'
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = self.path.split('?', 1)[0]
+        name = path[len(URL_PREFIX):] if path.startswith(URL_PREFIX) else ''
+        digest = name[:-len('.pdf')] if name.endswith('.pdf') else ''
+        data = self.server.preview.get(digest) if digest else None
+        if data is None:
+            self.send_error(404)
+            return
+
+        etag = f'"{digest}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(data)))
+        # The URL is the content hash, its bytes never change
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PreviewServer:
+    """
+    Serves published PDFs from memory on a background thread.
+    Keeps the last `max_entries` PDFs; port 0 picks a free port.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0, max_entries=MAX_ENTRIES, base_url=None):
+        self.host = host
+        self.port = port
+        self.max_entries = max_entries
+        self._base_url = base_url
+        self._entries = OrderedDict()  # sha256 -> bytes, least recently published first
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self.requests = 0
+
+    def start(self):
+        """Starts the server once. Raises OSError if the port cannot be bound."""
+        with self._lock:
+            if self._httpd is not None:
+                return self
+            httpd = ThreadingHTTPServer((self.host, self.port), _PreviewHandler)
+            httpd.daemon_threads = True
+            httpd.preview = self
+            self.port = httpd.server_address[1]
+            self._httpd = httpd
+            self._thread = threading.Thread(target=httpd.serve_forever, name='pdf-preview', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            httpd, self._httpd = self._httpd, None
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+    @property
+    def base_url(self):
+        return (self._base_url or f"http://{self.host}:{self.port}").rstrip('/')
+
+    def publish(self, data):
+        """Stores `data` and returns its URL; the same bytes always get the same URL."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._entries[digest] = bytes(data)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return f"{self.base_url}{URL_PREFIX}{digest}.pdf"
+
+    def get(self, digest):
+        with self._lock:
+            self.requests += 1
+            return self._entries.get(digest)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(data) for data in self._entries.values()),
+                'requests': self.requests,
+                'url': self.base_url if self._httpd is not None else None
+            }
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def enabled():
+    """True if $ATS_PREVIEW_URL says where the browser reaches the server."""
+    return bool(os.environ.get('ATS_PREVIEW_URL'))
+
+
+def get_server():
+    """
+    Process-wide server, started on first use. Configured by $ATS_PREVIEW_HOST,
+    $ATS_PREVIEW_PORT and $ATS_PREVIEW_URL (the address the browser should use,
+    e.g. behind a proxy). Callers check enabled() first.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = PreviewServer(
+                host=os.environ.get('ATS_PREVIEW_HOST') or DEFAULT_HOST,
+                port=int(os.environ.get('ATS_PREVIEW_PORT') or 0),
+                base_url=os.environ.get('ATS_PREVIEW_URL') or None
+            ).start()
+        return _server
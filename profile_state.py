@@ -0,0 +1,486 @@
+"""
+Observable, typed profile containers.
+Every mutation (item assignment, list append/pop, ...) bumps a version counter and
+marks the touched section dirty, so callers can detect changes without serializing
+and comparing the whole profile.
+
+Profile items are typed records (Personal, Experience, Education, Project, Certificate)
+validated when they enter the tree. Language variants share their sections with the
+source profile copy-on-write instead of being deep-copied: reading a shared container
+through the variant gives a shallow view owned by the variant (the values inside are
+still shared), and the shared data is only copied when either side edits it.
+"""
+import copy
+import threading
+
+
+class ProfileValidationError(ValueError):
+    """Raised when profile data does not have the expected shape."""
+
+
+class ChangeTracker:
+    """
+    Version counter and dirty-section set shared by all containers of one root.
+    Also keeps the loans between language variants: which borrowed section
+    ('en/experience') still shares the objects of which source section ('tr/experience').
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._loans = {}  # borrower section -> (borrower profile, key, lender section)
+        self._lenders = {}  # lender section -> set of borrower sections
+
+    def mark(self, section):
+        with self._lock:
+            self.version += 1
+            if section:
+                self._dirty.add(section)
+
+    @property
+    def dirty(self):
+        with self._lock:
+            return set(self._dirty)
+
+    def pop_dirty(self):
+        """Returns the sections changed since the last call and resets the set."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return dirty
+
+    @property
+    def shared_sections(self):
+        with self._lock:
+            return set(self._loans)
+
+    def lend(self, lender, borrower, profile, key):
+        with self._lock:
+            # Borrowing from a borrower shares objects of both, either side's edit copies them
+            lenders = (lender,)
+            if lender in self._loans:
+                lenders += self._loans[lender][2]
+            self._loans[borrower] = (profile, key, lenders)
+            for section in lenders:
+                self._lenders.setdefault(section, set()).add(borrower)
+
+    def _end_loan(self, borrower):
+        # Caller holds the lock
+        profile, key, lenders = self._loans.pop(borrower)
+        for lender in lenders:
+            borrowers = self._lenders.get(lender)
+            if borrowers is not None:
+                borrowers.discard(borrower)
+                if not borrowers:
+                    del self._lenders[lender]
+        return profile, key
+
+    def before_write(self, section, replace=False):
+        """
+        Called before every mutation; copies shared data out to borrowers first.
+        `replace`: the section itself is replaced or removed, its old content is dropped.
+        """
+        if not self._loans:
+            return
+        with self._lock:
+            pending = []
+            if section in self._loans:
+                # The borrower edits its section: it takes its own copy first, unless it replaces it
+                loan = self._end_loan(section)
+                if not replace:
+                    pending.append(loan)
+            pending += [self._end_loan(borrower) for borrower in list(self._lenders.get(section, ()))]
+            # A whole profile is replaced (store['en'] = ...): its sections' loans end too
+            prefix = section + '/'
+            for borrower in [borrower for borrower in self._loans if borrower.startswith(prefix)]:
+                self._end_loan(borrower)
+            for lender in [lender for lender in self._lenders if lender.startswith(prefix)]:
+                pending.extend(self._end_loan(borrower) for borrower in list(self._lenders[lender]))
+        for profile, key in pending:
+            profile._materialize(key)
+
+
+class _Observable:
+    __slots__ = ()
+
+    def _init_tracking(self, tracker, path, section_depth):
+        self._tracker = tracker if tracker is not None else ChangeTracker()
+        self._path = path
+        self._section_depth = section_depth
+
+    def _child(self, key, value):
+        return _wrap(value, self._tracker, self._path + (key,), self._section_depth)
+
+    def _section(self, key=None):
+        path = self._path if key is None else self._path + (key,)
+        return "/".join(str(part) for part in path[:self._section_depth])
+
+    def _before_change(self, key=None):
+        # Assigning or removing a section (or a whole profile) drops its old content
+        replace = key is not None and len(self._path) < self._section_depth
+        self._tracker.before_write(self._section(key), replace)
+
+    def _shared(self, key, value):
+        """True if `value`, found at `key`, is a container lent by another section."""
+        return isinstance(value, _Observable) and value._section() != self._section(key)
+
+    def _view(self, key, value):
+        # Shallow container of the same type at this position; the values inside stay shared
+        view = type(value).__new__(type(value))
+        if isinstance(value, dict):
+            dict.__init__(view, dict.items(value))
+        else:
+            list.__init__(view, list.__iter__(value))
+        view._init_tracking(self._tracker, self._path + (key,), self._section_depth)
+        return view
+
+    def _own(self, key, value):
+        """Replaces shared data below `value` (at `key`) with copies; returns the owned value."""
+        if not isinstance(value, _Observable):
+            return value
+        if self._shared(key, value):
+            return self._child(key, copy.deepcopy(value))
+        if isinstance(value, dict):
+            for child_key, child in dict.items(value):
+                owned = value._own(child_key, child)
+                if owned is not child:
+                    dict.__setitem__(value, child_key, owned)
+        else:
+            for i, child in enumerate(list.__iter__(value)):
+                owned = value._own(i, child)
+                if owned is not child:
+                    list.__setitem__(value, i, owned)
+        return value
+
+    def _changed(self, key=None):
+        self._tracker.mark(self._section(key))
+
+    @property
+    def version(self):
+        return self._tracker.version
+
+    @property
+    def tracker(self):
+        return self._tracker
+
+    def to_plain(self):
+        """Deep copy as plain dicts/lists."""
+        return copy.deepcopy(self)
+
+
+class ObservableDict(_Observable, dict):
+    """dict that reports mutations to its ChangeTracker. Nested dicts/lists are wrapped too."""
+
+    __slots__ = ('_tracker', '_path', '_section_depth')
+
+    def __init__(self, data=(), _tracker=None, _path=(), _section_depth=1):
+        dict.__init__(self)
+        self._init_tracking(_tracker, _path, _section_depth)
+        for key, value in dict(data).items():
+            dict.__setitem__(self, key, self._child(key, value))
+
+    # Lookups that hand out a borrowed container hand out a view owned by this container,
+    # so an edit through it lands here. items()/values() do not (json.dumps iterates
+    # them), treat those as read-only.
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if self._tracker._loans and self._shared(key, value):
+            value = self._view(key, value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        # Widgets write back unchanged values on every rerun, those are not changes
+        if key in self and dict.__getitem__(self, key) == value:
+            return
+        value = self._child(key, value)
+        self._before_change(key)
+        dict.__setitem__(self, key, value)
+        self._changed(key)
+
+    def __delitem__(self, key):
+        self._before_change(key)
+        dict.__delitem__(self, key)
+        self._changed(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        self._before_change(key)
+        value = dict.pop(self, key)
+        self._changed(key)
+        return value
+
+    def popitem(self):
+        if self:
+            self._before_change(next(reversed(dict.keys(self))))
+        key, value = dict.popitem(self)
+        self._changed(key)
+        return key, value
+
+    def clear(self):
+        if self:
+            for key in list(dict.keys(self)):
+                self._before_change(key)
+            dict.clear(self)
+            self._changed()
+
+    def add_variant(self, target, source):
+        """
+        Sets self[target] to a copy of the profile self[source] in O(1): the sections are
+        shared and copied only when either side edits them (or the variant hands one out).
+        Needs a store observed with section_depth=2, e.g. add_variant('en', 'tr').
+        """
+        profile = dict.__getitem__(self, source)
+        variant = ObservableDict((), _tracker=self._tracker, _path=self._path + (target,),
+                                 _section_depth=self._section_depth)
+        # Ends the loans of the profile being replaced before the new ones are made
+        self._before_change(target)
+        for key, value in dict.items(profile):
+            dict.__setitem__(variant, key, value)
+            if isinstance(value, (ObservableDict, ObservableList)):
+                self._tracker.lend(profile._section(key), variant._section(key), variant, key)
+
+        dict.__setitem__(self, target, variant)
+        self._changed(target)
+        return variant
+
+    def _materialize(self, key):
+        # The shared data is still unmodified here, copy it into this container
+        value = dict.__getitem__(self, key)
+        owned = self._own(key, value)
+        if owned is not value:
+            dict.__setitem__(self, key, owned)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in dict.items(self)}
+
+    def __copy__(self):
+        return dict(dict.items(self))
+
+    def copy(self):
+        return dict(dict.items(self))
+
+    def __reduce__(self):
+        return (dict, (dict(dict.items(self)),))
+
+
+class ObservableList(_Observable, list):
+    """list that reports mutations (append, pop, item assignment, ...) to its ChangeTracker."""
+
+    __slots__ = ('_tracker', '_path', '_section_depth')
+
+    def __init__(self, data=(), _tracker=None, _path=(), _section_depth=1):
+        list.__init__(self)
+        self._init_tracking(_tracker, _path, _section_depth)
+        list.extend(self, (self._child(i, value) for i, value in enumerate(data)))
+
+    def __getitem__(self, index):
+        value = list.__getitem__(self, index)
+        if self._tracker._loans and not isinstance(index, slice) and self._shared(index, value):
+            value = self._view(index, value)
+            list.__setitem__(self, index, value)
+        return value
+
+    def __iter__(self):
+        if not self._tracker._loans:
+            return list.__iter__(self)
+        return (self[i] for i in range(len(self)))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._child(index, item) for item in value]
+        else:
+            value = self._child(index, value)
+        self._before_change()
+        list.__setitem__(self, index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        self._before_change()
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def append(self, value):
+        value = self._child(len(self), value)
+        self._before_change()
+        list.append(self, value)
+        self._changed()
+
+    def extend(self, values):
+        start = len(self)
+        values = [self._child(start + i, value) for i, value in enumerate(values)]
+        self._before_change()
+        list.extend(self, values)
+        self._changed()
+
+    def insert(self, index, value):
+        value = self._child(index, value)
+        self._before_change()
+        list.insert(self, index, value)
+        self._changed()
+
+    def pop(self, index=-1):
+        self._before_change()
+        value = list.pop(self, index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        self._before_change()
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        if self:
+            self._before_change()
+            list.clear(self)
+            self._changed()
+
+    def sort(self, *args, **kwargs):
+        self._before_change()
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        self._before_change()
+        list.reverse(self)
+        self._changed()
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in list.__iter__(self)]
+
+    def __copy__(self):
+        return list(list.__iter__(self))
+
+    def copy(self):
+        return list(list.__iter__(self))
+
+    def __reduce__(self):
+        return (list, (list(list.__iter__(self)),))
+
+
+class Record(ObservableDict):
+    """
+    Typed profile item. Known FIELDS must be text (None becomes '', numbers are
+    converted); other keys are kept as they are.
+    Records are dicts: the empty __slots__ only avoid a per-instance __dict__,
+    the fields themselves still live in the dict storage.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, data=(), _tracker=None, _path=(), _section_depth=1):
+        super().__init__(self.validate(data), _tracker=_tracker, _path=_path, _section_depth=_section_depth)
+
+    @classmethod
+    def validate_field(cls, key, value):
+        if key not in cls.FIELDS:
+            return value
+        if value is None:
+            return ''
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if not isinstance(value, str):
+            raise ProfileValidationError(f"{cls.__name__}.{key} must be text, got {type(value).__name__}")
+        return value
+
+    @classmethod
+    def validate(cls, data):
+        if not isinstance(data, dict):
+            raise ProfileValidationError(f"{cls.__name__} must be an object, got {type(data).__name__}")
+        return {key: cls.validate_field(key, value) for key, value in dict.items(data)}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self.validate_field(key, value))
+
+
+class Personal(Record):
+    __slots__ = ()
+    FIELDS = ('fullName', 'email', 'phone', 'city', 'country', 'linkedin', 'github', 'summary')
+
+
+class Experience(Record):
+    __slots__ = ()
+    FIELDS = ('title', 'company', 'location', 'startDate', 'endDate', 'description')
+
+
+class Education(Record):
+    __slots__ = ()
+    FIELDS = ('school', 'degree', 'year', 'gpa', 'rank')
+
+
+class Project(Record):
+    __slots__ = ()
+    FIELDS = ('name', 'tech', 'description')
+
+
+class Certificate(Record):
+    __slots__ = ()
+    FIELDS = ('name', 'authority', 'date')
+
+
+# List sections of a profile and the record type of their items
+ITEM_TYPES = {
+    'experience': Experience,
+    'education': Education,
+    'projects': Project,
+    'certificates': Certificate
+}
+
+
+def _wrap(value, tracker, path, section_depth):
+    if isinstance(value, (ObservableDict, ObservableList)) and value._tracker is tracker:
+        return value
+
+    # Position relative to the sections: 0 = a section of a profile, 1 = an item of a section
+    level = len(path) - section_depth
+    if level == 0:
+        section = path[-1]
+        if section == 'personal':
+            return Personal(value, _tracker=tracker, _path=path, _section_depth=section_depth)
+        if section in ITEM_TYPES and not isinstance(value, list):
+            raise ProfileValidationError(f"'{section}' must be a list, got {type(value).__name__}")
+        if section == 'skills' and not isinstance(value, dict):
+            raise ProfileValidationError(f"'skills' must be an object, got {type(value).__name__}")
+    elif level == 1 and path[-2] in ITEM_TYPES:
+        return ITEM_TYPES[path[-2]](value, _tracker=tracker, _path=path, _section_depth=section_depth)
+
+    if isinstance(value, dict):
+        return ObservableDict(value, _tracker=tracker, _path=path, _section_depth=section_depth)
+    if isinstance(value, list):
+        return ObservableList(value, _tracker=tracker, _path=path, _section_depth=section_depth)
+    return value
+
+
+def observe(data, section_depth=1):
+    """
+    Wraps and validates `data`: a single profile, or the {'tr': ..., 'en': ...} store
+    with section_depth=2. Dirty sections are reported as "experience" or "tr/experience".
+    Raises ProfileValidationError for malformed data.
+    """
+    if isinstance(data, ObservableDict):
+        return data
+    if not isinstance(data, dict):
+        raise ProfileValidationError(f"Profile must be an object, got {type(data).__name__}")
+    return ObservableDict(data, _section_depth=section_depth)
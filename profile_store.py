@@ -0,0 +1,189 @@
+"""
+Profile persistence.
+Profiles are stored as JSON and written atomically (temp file + rename) by a
+background writer that coalesces bursts of edits into one write.
+A legacy user_data.py is still read, by parsing its literal, never by importing it.
+"""
+import ast
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.environ.get('ATS_PROFILE_PATH') or os.path.join(BASE_DIR, 'user_data.json')
+LEGACY_PATH = os.path.join(BASE_DIR, 'user_data.py')
+
+EMPTY_PROFILE = {
+    'personal': {},
+    'experience': [],
+    'education': [],
+    'skills': {},
+    'projects': [],
+    'certificates': []
+}
+
+
+def normalize_store(profile):
+    """
+    Returns the multi-language store {'tr': ..., ...}; a legacy single profile becomes 'tr'.
+    Missing language variants are added by the caller (see ObservableDict.add_variant).
+    """
+    if 'personal' in profile and 'tr' not in profile:
+        return {'tr': profile}
+    return profile
+
+
+def empty_store():
+    return {'tr': copy.deepcopy(EMPTY_PROFILE)}
+
+
+def read_legacy_profile(path=LEGACY_PATH):
+    """Reads `user_profile = {...}` from a user_data.py file without executing it."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == 'user_profile' for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No user_profile literal in {path}")
+
+
+def load_profile(path=DEFAULT_PATH, legacy_path=LEGACY_PATH):
+    """
+    Returns the saved profile data as stored (same shape user_data.user_profile had),
+    or None if nothing was saved yet. Prefers the JSON file, falls back to user_data.py.
+    """
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    if legacy_path and os.path.exists(legacy_path):
+        return read_legacy_profile(legacy_path)
+    return None
+
+
+def write_atomic(path, text):
+    """Writes `text` so that readers see either the old or the new file, never a partial one."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ProfileStore:
+    """
+    Debounced JSON writer for one profile file.
+    save() only snapshots the data; a background thread writes it once no new
+    save arrived for `delay` seconds (at the latest `max_delay` seconds after the
+    first pending save). flush() writes synchronously.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, delay=1.0, max_delay=5.0):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending = None  # serialized snapshot waiting to be written
+        self._seq = 0  # increases with every accepted save
+        self._written_seq = 0
+        self._first_pending = 0.0
+        self._last_pending = 0.0
+        self._written = None  # last snapshot on disk, identical saves are skipped
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self.saves = 0
+        self.writes = 0
+        self.last_error = None
+
+    def load(self, legacy_path=LEGACY_PATH):
+        return load_profile(self.path, legacy_path)
+
+    def save(self, data):
+        """Schedules `data` to be written. Cheap enough to call on every rerun."""
+        snapshot = json.dumps(data, ensure_ascii=False, indent=4)
+        with self._cond:
+            self.saves += 1
+            if snapshot == self._written and self._pending is None:
+                return
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_pending = now
+            self._seq += 1
+            self._pending = (self._seq, snapshot)
+            self._last_pending = now
+            self._ensure_thread()
+            self._cond.notify()
+
+    def flush(self):
+        """Writes any pending snapshot now. Returns True if something was written."""
+        with self._cond:
+            pending = self._pending
+            self._pending = None
+        if pending is None:
+            return False
+        self._write(*pending)
+        return True
+
+    def _write(self, seq, snapshot):
+        with self._write_lock:
+            # flush() and the background thread may race; never replace newer data with older
+            if seq <= self._written_seq:
+                return
+            try:
+                write_atomic(self.path, snapshot)
+            except OSError as e:
+                self.last_error = e
+                return
+            self._written_seq = seq
+            with self._cond:
+                self._written = snapshot
+                self.writes += 1
+                self.last_error = None
+
+    def _ensure_thread(self):
+        # Caller holds the lock
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='profile-store', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                while True:
+                    now = time.monotonic()
+                    due = min(self._last_pending + self.delay, self._first_pending + self.max_delay)
+                    if now >= due or self._pending is None:
+                        break
+                    self._cond.wait(due - now)
+                pending = self._pending
+                self._pending = None
+            if pending is not None:
+                self._write(*pending)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'saves': self.saves,
+                'writes': self.writes,
+                'pending': self._pending is not None,
+                'last_error': str(self.last_error) if self.last_error else None
+            }
+
+
+# Shared by every session in the process; pending data is written on exit
+store = ProfileStore()
+atexit.register(store.flush)
@@ -0,0 +1,186 @@
+"""
+Content-addressed cache for rendered PDF/DOCX artifacts.
+Keyed by a hash of the normalized profile data and every render option.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_THEME_COLOR = "#19375f"
+
+
+def make_key(data, template, language='tr', theme_color=DEFAULT_THEME_COLOR, kind='pdf'):
+    """
+    Hash of (normalized profile data, template, language, theme color, generator version).
+    Dict key order does not affect the key.
+    """
+    # Imported lazily, fpdf is only loaded once something is rendered
+    from cv_generator import GENERATOR_VERSION
+    payload = json.dumps(
+        [kind, template, language, theme_color.lower(), GENERATOR_VERSION, data],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    LRU cache of finished artifact bytes with a memory budget.
+    If `disk_dir` is set, entries are also written there and survive restarts.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()  # key -> bytes, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Event set when the render in progress finishes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.bin")
+
+    def _store(self, key, value):
+        # Caller holds the lock
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    value = f.read()
+            except OSError:
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._store(key, value)
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if not isinstance(value, bytes):
+            value = bytes(value)
+        with self._lock:
+            self._store(key, value)
+
+        if self.disk_dir:
+            # Write to a temp file first so readers never see a partial artifact
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(value)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return value
+
+    def get_or_render(self, key, render):
+        """
+        Returns cached bytes for `key`, calling `render()` to produce them on a miss.
+        Concurrent callers with the same key wait for the first render instead of repeating it.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            event = self._inflight.get(key)
+            rendering = event is None
+            if rendering:
+                event = self._inflight[key] = threading.Event()
+
+        if not rendering:
+            event.wait()
+            value = self.get(key)
+            # The first render failed (or was too large to keep), render here
+            return value if value is not None else self.put(key, render())
+
+        try:
+            return self.put(key, render())
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# Shared by every session in the process
+cache = RenderCache(disk_dir=os.environ.get('ATS_RENDER_CACHE_DIR') or None)
+
+
+def pdf_key(data, template, language='tr', theme_color=DEFAULT_THEME_COLOR, fit_pages=None):
+    kind = f"pdf-fit{fit_pages}" if fit_pages else 'pdf'
+    return make_key(data, template, language, theme_color, kind=kind)
+
+
+def render_pdf(data, template, language='tr', theme_color=DEFAULT_THEME_COLOR, fit_pages=None):
+    """Returns the PDF bytes for `data`, rendering only if this exact input was not seen before."""
+    key = pdf_key(data, template, language, theme_color, fit_pages)
+
+    def render():
+        from cv_generator import get_generator
+        pdf = get_generator(template, language=language)
+        return pdf.generate(data, theme_color=theme_color, fit_pages=fit_pages)
+
+    return cache.get_or_render(key, render)
+
+
+def render_docx(data, language='tr'):
+    """Returns the DOCX bytes for `data`, rendering only on a cache miss."""
+    key = make_key(data, 'docx', language, kind='docx')
+
+    def render():
+        # Imported lazily, python-docx is only needed for this artifact
+        from cv_generator_docx import ATSResumeDocx
+        docx = ATSResumeDocx(language=language)
+        docx.generate(data)
+        return docx.get_bytes()
+
+    return cache.get_or_render(key, render)
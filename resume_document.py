@@ -0,0 +1,208 @@
+"""
+Compiled intermediate representation (IR) of a resume profile.
+
+The PDF/DOCX generators and the keyword analyzers all read the same ResumeDocument
+instead of walking the raw profile dict and applying their own fixups. Documents are
+memoized by content hash, so one edit costs one normalization pass.
+"""
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+# Section headers used by the PDF templates
+LABELS = {
+    'tr': {
+        'SUMMARY': "ÖZET",
+        'EXPERIENCE': "İŞ DENEYİMİ",
+        'EDUCATION': "EĞİTİM",
+        'SKILLS': "TEKNİK BECERİLER",
+        'EXPERIENCE_ACADEMIC': "PROFESYONEL DENEYİM",
+        'EDUCATION_ACADEMIC': "EĞİTİM GEÇMİŞİ",
+        'SKILLS_ACADEMIC': "YETKİNLİKLER",
+        'EXPERIENCE_MODERN': "DENEYİM",
+        'EDUCATION_MODERN': "EĞİTİM",
+        'SKILLS_MODERN': "YETENEKLER",
+        'PROJECTS': "PROJELER",
+        'CERTIFICATES': "SERTİFİKALAR ve EĞİTİMLER"
+    },
+    'en': {
+        'SUMMARY': "SUMMARY",
+        'EXPERIENCE': "EXPERIENCE",
+        'EDUCATION': "EDUCATION",
+        'SKILLS': "TECHNICAL SKILLS",
+        'EXPERIENCE_ACADEMIC': "PROFESSIONAL EXPERIENCE",
+        'EDUCATION_ACADEMIC': "EDUCATION HISTORY",
+        'SKILLS_ACADEMIC': "COMPETENCIES",
+        'EXPERIENCE_MODERN': "EXPERIENCE",
+        'EDUCATION_MODERN': "EDUCATION",
+        'SKILLS_MODERN': "SKILLS",
+        'PROJECTS': "PROJECTS",
+        'CERTIFICATES': "CERTIFICATIONS & TRAINING"
+    }
+}
+
+# Skill category display names for English resumes
+SKILL_CATEGORY_MAP_EN = {
+    'Programlama': 'Programming',
+    'Frameworks': 'Frameworks',
+    'Araçlar': 'Tools',
+    'Diller': 'Languages'
+}
+
+ONGOING_DATE = {'tr': 'Devam Ediyor', 'en': 'Present'}
+
+_TOKEN_PATTERN = re.compile(r'\S+')
+
+
+def localize_place(value, language):
+    value = value or ''
+    if language == 'en':
+        return value.replace('Türkiye', 'Turkey')
+    return value
+
+
+def localize_end_date(value, language):
+    value = (value or '').strip()
+    if value in ONGOING_DATE.values():
+        return ONGOING_DATE.get(language, value)
+    return value
+
+
+def split_bullets(text):
+    """Description text -> list of non-empty bullet lines."""
+    return [line.strip() for line in (text or '').strip().split('\n') if line.strip()]
+
+
+class ResumeDocument:
+    """
+    Normalized, localized view of one profile in one language.
+    Treat it as read-only, it may be shared between renderers and sessions.
+    """
+
+    def __init__(self, data, language='tr'):
+        self.language = language
+        self.labels = LABELS.get(language, LABELS['tr'])
+
+        p = dict(data.get('personal', {}))
+        if p.get('country'):
+            p['country'] = localize_place(p['country'], language)
+        self.personal = p
+
+        self.experience = []
+        for exp in data.get('experience', []):
+            item = dict(exp)
+            item['startDate'] = (exp.get('startDate') or '').strip()
+            item['endDate'] = localize_end_date(exp.get('endDate', ''), language)
+            item['location'] = localize_place(exp.get('location', ''), language)
+            item['bullets'] = split_bullets(exp.get('description', ''))
+            self.experience.append(item)
+
+        self.education = [dict(edu) for edu in data.get('education', [])]
+        self.projects = [dict(proj) for proj in data.get('projects', [])]
+        self.certificates = [dict(cert) for cert in data.get('certificates', [])]
+
+        # Skills as entered (category -> comma separated items)
+        self.raw_skills = dict(data.get('skills', {}))
+
+        # Skills for display: localized category names, Turkish added to English language lists
+        self.skills = {}
+        for cat, items in self.raw_skills.items():
+            display_cat = SKILL_CATEGORY_MAP_EN.get(cat, cat) if language == 'en' else cat
+            if items and language == 'en' and display_cat == 'Languages':
+                if 'Turkish' not in items and 'Türkçe' not in items:
+                    items += ", Turkish (Native)"
+            self.skills[display_cat] = items
+
+        # Canonical skill list: split, stripped, de-duplicated case-insensitively
+        self.skill_list = []
+        seen = set()
+        for items in self.raw_skills.values():
+            for skill in (items or '').split(','):
+                skill = skill.strip()
+                if skill and skill.lower() not in seen:
+                    seen.add(skill.lower())
+                    self.skill_list.append(skill)
+
+        self._texts = {}
+        self._tokens = None
+
+    def _section_items(self, section):
+        if section == 'personal':
+            return [self.personal]
+        if section == 'skills':
+            return [{'category': cat, 'items': items} for cat, items in self.raw_skills.items()]
+        return getattr(self, section)
+
+    def text(self, spec):
+        """
+        Joins text fields in the order given by `spec`, a tuple of (section, fields) pairs.
+        Fields of one item stay together, e.g. (('experience', ('title', 'description')),)
+        yields title1 desc1 title2 desc2. Skills expose 'category' and 'items'.
+        Results are cached per spec.
+        """
+        cached = self._texts.get(spec)
+        if cached is not None:
+            return cached
+
+        parts = []
+        for section, fields in spec:
+            for item in self._section_items(section):
+                for field in fields:
+                    parts.append(item.get(field, '') or '')
+
+        text = " ".join(parts)
+        self._texts[spec] = text
+        return text
+
+    @property
+    def tokens(self):
+        """Lowercased token stream over every analyzable field, computed once."""
+        if self._tokens is None:
+            self._tokens = _TOKEN_PATTERN.findall(self.text(ALL_TEXT).lower())
+        return self._tokens
+
+
+# Every text field that analyzers may look at
+ALL_TEXT = (
+    ('personal', ('summary',)),
+    ('experience', ('title', 'company', 'description')),
+    ('education', ('degree', 'school')),
+    ('projects', ('name', 'tech', 'description')),
+    ('certificates', ('name', 'authority')),
+    ('skills', ('items',)),
+)
+
+_CACHE_SIZE = 64
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def content_hash(data):
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compile_resume(data, language='tr', data_hash=None):
+    """
+    Returns the ResumeDocument for `data`, reusing the compiled one if this exact
+    content was seen before. Passing a ResumeDocument returns it unchanged.
+    Callers that already hold content_hash(data) pass it as `data_hash`.
+    """
+    if isinstance(data, ResumeDocument):
+        return data
+
+    key = (data_hash or content_hash(data), language)
+    with _cache_lock:
+        doc = _cache.get(key)
+        if doc is not None:
+            _cache.move_to_end(key)
+            return doc
+
+    doc = ResumeDocument(data, language)
+    with _cache_lock:
+        _cache[key] = doc
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return doc
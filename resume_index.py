@@ -0,0 +1,283 @@
+"""
+Recruiter mode: many resumes ranked against one job description.
+
+Profiles (the sidebar backup format, cv_yedek.json, or the multi-language store) are
+indexed once into an on-disk inverted index (inverted_index.py). Every profile is a
+document with its terms over all sections plus per-section terms ("skills:python",
+"experience:sql"), so a query can tell where a JD term was found. Profiles are read one
+at a time and written in batches, so a large folder never sits in memory; re-adding a
+folder only indexes new or changed profiles.
+
+A query takes the JD's scoring terms (calculate_match_score's, IDF-weighted when a JD
+corpus exists), scores only the profiles in their postings, and explains the top-k:
+match score, matched terms with their sections, missing terms.
+
+Usage:
+    python -m resume_index add profiles/            # directory of .json files or a .jsonl file
+    python -m resume_index rank job.txt --top 10
+    python -m resume_index remove ayse_yilmaz mehmet_demir
+    python -m resume_index stats
+
+The index lives at $ATS_RESUME_INDEX (default ~/.cache/ats-resume-builder/resume_index).
+"""
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+
+from batch_render import iter_profiles, select_language
+from inverted_index import B, K1, InvertedIndex
+from jd_index import index_terms
+from resume_document import ResumeDocument, compile_resume, content_hash
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ats-resume-builder', 'resume_index')
+# Profiles per segment when adding a folder
+BATCH_SIZE = 5000
+DEFAULT_TOP = 10
+# Extra relevance for a JD term listed in the skills section rather than only mentioned
+SKILL_BOOST = 0.5
+MAX_STORED_SKILLS = 30
+# Bumped when profile_terms changes, so re-adding a folder re-indexes every profile
+TERMS_VERSION = 2
+
+# Indexed sections, each with its text fields
+SECTIONS = (
+    ('summary', (('personal', ('summary',)),)),
+    ('experience', (('experience', ('title', 'company', 'description')),)),
+    ('education', (('education', ('degree', 'school')),)),
+    ('projects', (('projects', ('name', 'tech', 'description')),)),
+    ('certificates', (('certificates', ('name', 'authority')),)),
+    ('skills', (('skills', ('items',)),)),
+)
+
+
+def profile_terms(data, language='tr'):
+    """
+    (term counts, token count) of one profile: terms over all sections plus "section:term".
+    Word pairs and triples are terms too, so a JD phrase only matches where its words are adjacent.
+    """
+    resume = compile_resume(data, language)
+    counts = Counter()
+    length = 0
+    for section, spec in SECTIONS:
+        section_counts, section_length = index_terms(resume.text(spec), language, ngrams=True)
+        prefix = f"{section}:"
+        for term, count in section_counts.items():
+            counts[term] += count
+            counts[prefix + term] = count
+        length += section_length
+    return counts, length
+
+
+def _documents(profiles, language, known, index):
+    for profile_id, profile in profiles:
+        data = select_language(profile, language)
+        if data is None:
+            continue
+        digest = content_hash(data)
+        # Unchanged profiles are skipped before tokenizing them
+        if profile_id in known:
+            meta = index.doc(known[profile_id])
+            if meta.get('hash') == digest and meta.get('terms') == TERMS_VERSION:
+                continue
+        # Compiled once, outside the shared document cache a whole folder would only churn
+        resume = ResumeDocument(data, language)
+        counts, length = profile_terms(resume, language)
+        experience = resume.experience[0] if resume.experience else {}
+        meta = {
+            'name': resume.personal.get('fullName', ''),
+            'title': experience.get('title', ''),
+            'hash': digest,
+            'terms': TERMS_VERSION,
+            'skills': resume.skill_list[:MAX_STORED_SKILLS]
+        }
+        yield profile_id, counts, length, meta, None
+
+
+def add_profiles(index, path, language='tr', batch_size=BATCH_SIZE):
+    """
+    Indexes the profiles in `path` (a directory of .json files or a .jsonl file).
+    New profiles are added, changed ones replaced. Returns the number indexed.
+    """
+    profiles = iter_profiles(path)
+    added = 0
+    while True:
+        batch = list(itertools.islice(profiles, batch_size))
+        if not batch:
+            return added
+        added += index.add_documents(_documents(batch, language, index.keys(), index), replace=True)
+
+
+class _LengthNorms:
+    """BM25 length normalization per doc id, rebuilt when the index changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._norms = None
+
+    def get(self, index):
+        with self._lock:
+            key = (id(index), index.generation)
+            if key != self._key:
+                norms = array('d', [0.0]) * index.next_doc_id
+                avg_length = index.avg_length or 1.0
+                for segment in index.segments:
+                    for i, length in enumerate(segment.doc_lengths):
+                        norms[segment.doc_base + i] = K1 * (1 - B + B * length / avg_length)
+                self._key, self._norms = key, norms
+            return self._norms
+
+
+_length_norms = _LengthNorms()
+
+
+def _postings(index, term):
+    """{doc id: tf} of a JD term; phrases are indexed as terms, so their words are adjacent."""
+    result = {}
+    for doc_ids, tfs in index.postings(term):
+        result.update(zip(doc_ids, tfs))
+    return result
+
+
+def _sections_of(index, term, doc_id):
+    return [section for section, _ in SECTIONS if index.contains(f"{section}:{term}", doc_id)]
+
+
+def rank(index, job_desc, language='tr', top=DEFAULT_TOP, jd_corpus=None):
+    """
+    The `top` profiles for a JD, best first. Each row: doc_id, key, name, title, score
+    (share of JD term weight found, as in calculate_match_score), relevance (BM25, with a
+    bonus for listed skills; breaks ties), matched [(term, sections)], missing, skills.
+    """
+    # Segments retired by a concurrent refresh stay open until the ranking is done
+    with index.reading():
+        return _rank(index, job_desc, language, top, jd_corpus)
+
+
+def _rank(index, job_desc, language, top, jd_corpus):
+    from matcher_utils import get_job_matcher
+    matcher = get_job_matcher(job_desc, language)
+    terms = matcher.top_terms(jd_corpus)
+    if jd_corpus is not None and jd_corpus.n_docs:
+        weights = matcher.weights(jd_corpus)
+    else:
+        weights = dict.fromkeys(terms, 1.0)
+    total_weight = sum(weights[term] for term in terms)
+    if not terms or not total_weight or not index.n_docs:
+        return []
+
+    norms = _length_norms.get(index)
+    deleted = index.deleted
+    coverage = {}
+    relevance = {}
+    for term in terms:
+        postings = _postings(index, term)
+        if not postings:
+            continue
+        query_weight = weights[term]
+        idf = index.idf(term, df=len(postings))
+        for doc_id, tf in postings.items():
+            coverage[doc_id] = coverage.get(doc_id, 0.0) + query_weight
+            relevance[doc_id] = relevance.get(doc_id, 0.0) + query_weight * idf * tf * (K1 + 1) / (tf + norms[doc_id])
+        for doc_ids, _ in index.postings(f"skills:{term}"):
+            for doc_id in doc_ids:
+                relevance[doc_id] += query_weight * idf * SKILL_BOOST
+
+    candidates = (doc_id for doc_id in coverage if doc_id not in deleted)
+    best = heapq.nlargest(top, candidates, key=lambda doc_id: (coverage[doc_id], relevance[doc_id], -doc_id))
+
+    rows = []
+    for doc_id in best:
+        meta = index.doc(doc_id)
+        matched = []
+        missing = []
+        for term in terms:
+            sections = _sections_of(index, term, doc_id)
+            if sections:
+                matched.append((term, sections))
+            else:
+                missing.append(term)
+        rows.append({
+            'doc_id': doc_id,
+            'key': meta['key'],
+            'name': meta.get('name', ''),
+            'title': meta.get('title', ''),
+            'score': int(coverage[doc_id] / total_weight * 100),
+            'relevance': round(relevance[doc_id], 2),
+            'matched': matched,
+            'missing': missing,
+            'skills': meta.get('skills', [])
+        })
+    return rows
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def open_index(path=None):
+    """Process-wide index at `path`, $ATS_RESUME_INDEX or DEFAULT_PATH, created if missing."""
+    global _index
+    path = path or os.environ.get('ATS_RESUME_INDEX') or DEFAULT_PATH
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = InvertedIndex(path)
+        else:
+            _index.refresh()
+        return _index
+
+
+def main(argv=None):
+    import jd_index
+
+    parser = argparse.ArgumentParser(description="Rank many resumes against one job description.")
+    parser.add_argument('--index', default=None, help="Index directory (default: $ATS_RESUME_INDEX)")
+    parser.add_argument('--language', default='tr', choices=['tr', 'en'])
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="Index a directory of profile .json files or a .jsonl file")
+    add.add_argument('path')
+    rank_parser = commands.add_parser('rank', help="Rank the indexed profiles against a JD file")
+    rank_parser.add_argument('job_desc')
+    rank_parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    remove = commands.add_parser('remove', help="Remove profiles by id")
+    remove.add_argument('keys', nargs='+')
+    commands.add_parser('stats', help="Show index statistics")
+    commands.add_parser('merge', help="Merge segments and drop removed profiles")
+    args = parser.parse_args(argv)
+
+    index = open_index(args.index)
+    if args.command == 'add':
+        t0 = time.perf_counter()
+        added = add_profiles(index, args.path, args.language)
+        print(f"Indexed {added} new or changed profiles in {time.perf_counter() - t0:.2f}s")
+    elif args.command == 'remove':
+        print(f"Removed {index.delete(args.keys)} profiles")
+    elif args.command == 'merge':
+        index.merge()
+    elif args.command == 'rank':
+        with open(args.job_desc, encoding='utf-8') as f:
+            job_desc = f.read()
+        t0 = time.perf_counter()
+        rows = rank(index, job_desc, args.language, args.top, jd_corpus=jd_index.get_index())
+        elapsed = time.perf_counter() - t0
+        for position, row in enumerate(rows, 1):
+            print(f"{position:>3}. %{row['score']:<3} {row['name']} - {row['title']}  [{row['key']}]")
+            matched = ", ".join(f"{term} ({'/'.join(sections)})" for term, sections in row['matched'])
+            print(f"       matched: {matched or '-'}")
+            print(f"       missing: {', '.join(row['missing']) or '-'}")
+        print(f"Ranked {index.n_docs} profiles in {elapsed * 1000:.1f} ms")
+        return 0
+
+    for name, value in index.stats().items():
+        print(f"{name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
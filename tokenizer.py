@@ -0,0 +1,159 @@
+"""
+Shared tokenizer for the job matcher, the JD analyzer and the ATS keyword analyzer.
+Patterns and case-folding tables are compiled once at import.
+
+- Turkish-aware case folding: in Turkish text 'I' folds to 'ı' and 'İ' to 'i'.
+  Words written only in ASCII letters (English terms, acronyms such as "BI" or "IT")
+  fold as ASCII, so "Intelligence" stays "intelligence" in a Turkish JD.
+- Technical tokens survive: C++, C#, .NET, Node.js, ASP.NET, CI/CD, A/B, scikit-learn.
+- Streaming: tokens() and iter_tokens() accept a string or any iterable of strings (e.g.
+  an open file); iter_tokens() tokenizes one chunk at a time.
+- Each chunk is case-folded, cleaned and split on whitespace with str methods; only the
+  pieces that are not a plain word (c++, node.js) go through the token regex, and their
+  tokens are cached.
+"""
+import re
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import contains, not_
+
+# One greedy alternative covers almost every token, which keeps the regex fast:
+# words joined by . - / (node.js, asp.net, e-commerce, ci/cd), optionally ending in ++ or #
+_TOKEN_SOURCE = r"\w+(?:[./\-]\w+)*(?:\+\+|#)?|(?<![\w.])\.net\b"
+_TOKEN_PATTERN = re.compile(_TOKEN_SOURCE, re.IGNORECASE)
+# The same tokens in already folded text, where IGNORECASE would only slow the scan down
+_FOLDED_TOKEN_PATTERN = re.compile(_TOKEN_SOURCE)
+
+# Only short slash pairs are one term (ci/cd, a/b, ui/ux, tcp/ip); "türkçe/ingilizce" is two words
+_MAX_SLASH_PART = 3
+
+# Characters that are never part of a token; blanked before the split, so that most
+# pieces of text are plain words and never reach the regex
+_BLANKS = ',;:!?()[]{}"\'%&*|<>=@$~^`\\“”‘’–—•…'
+
+# Stand-ins for 'I' and 'İ' while Turkish text is folded as a whole: a token written only
+# in ASCII folds as ASCII ("BI" is "bi"), which is known only once the tokens are cut
+_DOTLESS_MARK = '\u026a'
+_DOTTED_MARK = '\u0268'
+
+# str.lower() maps 'I' to 'i' and 'İ' to 'i' + combining dot; fix both before lowering
+_FOLD_TABLES = {
+    'tr': str.maketrans({'I': 'ı', 'İ': 'i'}),
+}
+_DEFAULT_FOLD_TABLE = str.maketrans({'İ': 'i'})
+
+MIN_KEYWORD_LENGTH = 3
+
+
+def fold(token, language='tr'):
+    """Lowercases one token with the casing rules of `language`."""
+    if token.isascii():
+        return token.lower()
+    return token.translate(_FOLD_TABLES.get(language, _DEFAULT_FOLD_TABLE)).lower()
+
+
+def _token_split(token):
+    if '/' in token and max(len(part) for part in token.split('/')) > _MAX_SLASH_PART:
+        return token.split('/')
+    return (token,)
+
+
+@lru_cache(maxsize=4096)
+def _piece_tokens(piece):
+    # The same few technical terms (c++, node.js, ci/cd) make up most of these pieces
+    return tuple(part for token in _FOLDED_TOKEN_PATTERN.findall(piece) for part in _token_split(token))
+
+
+@lru_cache(maxsize=4096)
+def _unmark(token):
+    ascii_token = token.replace(_DOTLESS_MARK, 'i')
+    if ascii_token.isascii():
+        return ascii_token
+    return token.replace(_DOTLESS_MARK, 'ı').replace(_DOTTED_MARK, 'i')
+
+
+def _indices_with(tokens, char):
+    return list(compress(range(len(tokens)), map(contains, tokens, repeat(char))))
+
+
+def _chunk_tokens(chunk, language):
+    """
+    Folded tokens of one string, as a list. The chunk is folded and cleaned as a whole
+    with str methods and split on whitespace; only the pieces that are not a plain word
+    are looked at in Python.
+    """
+    marked = dotted = False
+    if chunk.isascii():
+        text = chunk.lower()
+    elif language not in _FOLD_TABLES or 'I' not in chunk:
+        text = chunk.replace('İ', 'i').lower()
+    elif _DOTLESS_MARK in chunk or _DOTTED_MARK in chunk:
+        return [fold(part, language) for token in _TOKEN_PATTERN.findall(chunk) for part in _token_split(token)]
+    else:
+        marked = True
+        dotted = 'İ' in chunk
+        text = chunk.replace('I', _DOTLESS_MARK).replace('İ', _DOTTED_MARK if dotted else 'i').lower()
+    for char in _BLANKS:
+        if char in text:
+            text = text.replace(char, ' ')
+    # A dot before whitespace ends a sentence; it never joins two words
+    tokens = text.replace('. ', ' ').replace('.\n', '\n').split()
+
+    splices = []
+    for i in list(compress(range(len(tokens)), map(not_, map(str.isalnum, tokens)))):
+        found = _piece_tokens(tokens[i])
+        if len(found) == 1:
+            tokens[i] = found[0]
+        else:
+            splices.append((i, found))
+    if splices:
+        pieces = tokens
+        tokens = []
+        start = 0
+        for i, found in splices:
+            tokens += pieces[start:i]
+            tokens += found
+            start = i + 1
+        tokens += pieces[start:]
+
+    if marked:
+        for i in _indices_with(tokens, _DOTLESS_MARK):
+            tokens[i] = _unmark(tokens[i])
+        if dotted:
+            for i in _indices_with(tokens, _DOTTED_MARK):
+                tokens[i] = tokens[i].replace(_DOTTED_MARK, 'i')
+    return tokens
+
+
+def tokens(source, language='tr'):
+    """The folded tokens of `source`, a string or an iterable of strings (lines, chunks), as a list."""
+    if isinstance(source, str):
+        return _chunk_tokens(source, language)
+    result = []
+    for chunk in source:
+        result += _chunk_tokens(chunk, language)
+    return result
+
+
+def iter_tokens(source, language='tr'):
+    """Yields the folded tokens of `source`, a string or an iterable of strings, one chunk at a time."""
+    for chunk in (source,) if isinstance(source, str) else source:
+        yield from _chunk_tokens(chunk, language)
+
+
+def normalize(text, language='tr'):
+    """Tokens joined by single spaces: the form phrase and keyword lookups compare against."""
+    return ' '.join(tokens(text, language))
+
+
+def iter_keywords(source, language='tr', stop_words=(), min_length=MIN_KEYWORD_LENGTH, keep_numbers=True):
+    """
+    Tokens worth comparing. Short tokens are dropped unless they carry symbols
+    (c#, .net); stop words and, optionally, plain numbers are dropped.
+    """
+    for chunk in (source,) if isinstance(source, str) else source:
+        yield from [
+            token for token in _chunk_tokens(chunk, language)
+            if (len(token) >= min_length or not token.isalnum()) and token not in stop_words
+            and (keep_numbers or not token.replace('.', '').isdigit())
+        ]
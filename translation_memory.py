@@ -0,0 +1,167 @@
+"""
+Local translation memory (SQLite).
+The translator looks segments up here before calling the remote service, so an
+unchanged profile is re-translated without any network calls.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ats-resume-builder', 'translation_memory.sqlite3')
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS segments_key ON segments (source_lang, target_lang, text_hash);
+CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used);
+"""
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    Stores (source_lang, target_lang, text) -> translation.
+    When the stored text exceeds `max_bytes`, the least recently used entries are evicted.
+    Use path=':memory:' for a throwaway store.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Shared by the translation worker threads, access is serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, texts, source_lang='tr', target_lang='en'):
+        """Returns {text: translation} for every text found in the memory."""
+        hashes = {text_hash(text): text for text in texts}
+        found = {}
+        with self._lock:
+            keys = list(hashes)
+            for i in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[i:i + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, source_text, translated_text FROM segments "
+                    f"WHERE source_lang = ? AND target_lang = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [source_lang, target_lang] + chunk
+                ).fetchall()
+                for key, source_text, translated_text in rows:
+                    # Guard against hash collisions
+                    if hashes[key] == source_text:
+                        found[source_text] = translated_text
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE segments SET last_used = ? WHERE source_lang = ? AND target_lang = ? AND text_hash = ?",
+                    [(now, source_lang, target_lang, text_hash(text)) for text in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def get(self, text, source_lang='tr', target_lang='en'):
+        return self.get_many([text], source_lang, target_lang).get(text)
+
+    def put_many(self, translations, source_lang='tr', target_lang='en'):
+        """Stores {text: translation} pairs, then evicts down to `max_bytes`."""
+        if not translations:
+            return
+        now = time.time()
+        rows = [
+            (source_lang, target_lang, text_hash(text), text, translated,
+             len(text.encode('utf-8')) + len(translated.encode('utf-8')), now)
+            for text, translated in translations.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments "
+                "(source_lang, target_lang, text_hash, source_text, translated_text, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def put(self, text, translated, source_lang='tr', target_lang='en'):
+        self.put_many({text: translated}, source_lang, target_lang)
+
+    def _evict(self):
+        # Caller holds the lock
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM segments").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT rowid, size FROM segments ORDER BY last_used").fetchall()
+        evict = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            evict.append((rowid,))
+            total -= size
+        self._conn.executemany("DELETE FROM segments WHERE rowid = ?", evict)
+        self.evictions += len(evict)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM segments").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_memory():
+    """Process-wide memory at $ATS_TRANSLATION_MEMORY (or DEFAULT_PATH), opened on first use."""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(os.environ.get('ATS_TRANSLATION_MEMORY') or DEFAULT_PATH)
+        return _memory
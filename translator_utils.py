@@ -1,6 +1,24 @@
-from deep_translator import GoogleTranslator
-import streamlit as st
 import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import translation_memory
+
+# Pipeline defaults: Google's web endpoint rejects requests above 5000 characters
+MAX_BATCH_CHARS = 4500
+MAX_BATCH_ITEMS = 40
+MAX_WORKERS = 4
+CALL_TIMEOUT = 20
+# Whole run_batches() call; hung calls keep their worker threads, so later ones may never start
+TOTAL_TIMEOUT = 120
+RETRIES = 2
+RETRY_DELAY = 0.5
+
+# Joins the segments of one batch into a single request, must survive translation untouched
+BATCH_SEPARATOR = "\n\n§§§\n\n"
+_SEPARATOR_PATTERN = re.compile(r'\s*§§§\s*')
 
 def preserve_links_and_numbers(text):
     """
@@ -40,13 +58,82 @@ def clean_date(date_str):
     # Replace dot with slash
     return date_str.replace('.', '/')
 
-def translate_resume_data(data):
+class TranslationError(Exception):
+    """Raised when a required segment could not be translated after all retries."""
+
+
+# One translatable field: `path` locates it in the output structure, e.g. ('experience', 0, 'title').
+# Optional segments (place names) keep the source text if translation fails.
+Segment = namedtuple('Segment', ['path', 'text', 'preserve', 'required'])
+
+
+class GoogleBackend:
     """
-    Translates the entire resume data structure from Turkish to English.
-    Preserves URLs, emails, and number patterns.
+    Translates batches through deep_translator's GoogleTranslator.
+    A batch is sent as one request, joined with BATCH_SEPARATOR; if the separators
+    do not come back intact the batch is translated segment by segment instead.
+    """
+
+    def __init__(self, source='tr', target='en'):
+        # Imported here so the pipeline can run with other backends without deep_translator
+        from deep_translator import GoogleTranslator
+        self.source = source
+        self.target = target
+        self._local = threading.local()
+        self._translator_class = GoogleTranslator
+
+    def _translator(self):
+        # One client per worker thread, GoogleTranslator keeps per-request state
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._translator_class(source=self.source, target=self.target)
+            self._local.translator = translator
+        return translator
+
+    def translate_batch(self, texts):
+        translator = self._translator()
+        if len(texts) == 1:
+            return [translator.translate(texts[0])]
+
+        translated = translator.translate(BATCH_SEPARATOR.join(texts)) or ''
+        parts = _SEPARATOR_PATTERN.split(translated.strip())
+        if len(parts) == len(texts):
+            return parts
+        return [translator.translate(text) for text in texts]
+
+
+class FakeBackend:
+    """
+    Local stand-in for a remote translator, for tests and benchmarks.
+    Sleeps `latency` seconds per call and returns `transform(text)` for every segment.
     """
-    translator = GoogleTranslator(source='tr', target='en')
 
+    def __init__(self, latency=0.0, transform=None, fail_first=0):
+        self.latency = latency
+        self.transform = transform or (lambda text: f"EN({text})")
+        self.fail_first = fail_first
+        self.calls = 0
+        self.segments = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts):
+        with self._lock:
+            self.calls += 1
+            self.segments += len(texts)
+            fail = self.calls <= self.fail_first
+        time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("simulated translator failure")
+        return [self.transform(text) for text in texts]
+
+
+def collect_segments(data):
+    """
+    Splits a Turkish profile into (translated_data, segments).
+    `translated_data` already holds everything that is not sent to the translator
+    (copied fields, cleaned dates, mapped skill headers); `segments` lists the
+    fields to translate, in document order.
+    """
     translated_data = {
         'personal': {},
         'experience': [],
@@ -55,78 +142,54 @@ def translate_resume_data(data):
         'projects': [],
         'certificates': []
     }
+    segments = []
 
     # 1. Personal
     p = data.get('personal', {})
     translated_data['personal'] = p.copy()
+    # City/country are passed through if they cannot be translated,
+    # e.g. "Ankara, Türkiye" -> "Ankara, Turkey"
     if p.get('city'):
-        try:
-            # Check if city name contains "Turkey" or "Türkiye" to avoid "Ankara, Turkey Turkey"
-            city_val = p['city']
-            # Simple check: just pass it through or translate? 
-            # User wants "Ankara, Turkey"
-            # If input is "Ankara", translate might give "Ankara"
-            # If input is "Ankara, Türkiye", translate might give "Ankara, Turkey"
-            translated_city = translator.translate(city_val)
-            translated_data['personal']['city'] = translated_city
-        except:
-            pass
-            
+        segments.append(Segment(('personal', 'city'), p['city'], False, False))
     if p.get('country'):
-         try:
-            translated_data['personal']['country'] = translator.translate(p['country'])
-         except:
-            pass
-            
+        segments.append(Segment(('personal', 'country'), p['country'], False, False))
     if p.get('summary'):
-        summary_text, summary_replacements = preserve_links_and_numbers(p['summary'])
-        translated_summary = translator.translate(summary_text)
-        translated_data['personal']['summary'] = restore_links_and_numbers(translated_summary, summary_replacements)
-        
+        segments.append(Segment(('personal', 'summary'), p['summary'], True, True))
+
     # 2. Experience
-    for exp in data.get('experience', []):
+    for i, exp in enumerate(data.get('experience', [])):
         new_exp = exp.copy()
         if exp.get('title'):
-            new_exp['title'] = translator.translate(exp['title'])
-        
+            segments.append(Segment(('experience', i, 'title'), exp['title'], False, True))
+
         # Clean Dates
         if exp.get('startDate'):
             new_exp['startDate'] = clean_date(exp['startDate'])
         if exp.get('endDate'):
             new_exp['endDate'] = clean_date(exp['endDate'])
-            
-        if exp.get('location'):
-             try:
-                 new_exp['location'] = translator.translate(exp['location'])
-             except:
-                 pass
 
+        if exp.get('location'):
+            segments.append(Segment(('experience', i, 'location'), exp['location'], False, False))
         if exp.get('description'):
             # Description might be long, preserve numbers and URLs
-            desc_text, desc_replacements = preserve_links_and_numbers(exp['description'])
-            translated_desc = translator.translate(desc_text)
-            new_exp['description'] = restore_links_and_numbers(translated_desc, desc_replacements)
+            segments.append(Segment(('experience', i, 'description'), exp['description'], True, True))
 
         translated_data['experience'].append(new_exp)
-        
+
     # 3. Education
-    for edu in data.get('education', []):
+    for i, edu in enumerate(data.get('education', [])):
         new_edu = edu.copy()
         if edu.get('school'):
             # Check for specific university names if needed, otherwise translate
             if "Türk Hava Kurumu" in edu['school']:
                 new_edu['school'] = "Turkish Aeronautical Association University"
             else:
-                new_edu['school'] = translator.translate(edu['school'])
-                
+                segments.append(Segment(('education', i, 'school'), edu['school'], False, True))
         if edu.get('degree'):
-            new_edu['degree'] = translator.translate(edu['degree'])
-            
-        # Education dates usually in "year" field "2020 - 2025" or similar
-        # If it has specific date format, handle it. Assuming year string for now.
-        
+            segments.append(Segment(('education', i, 'degree'), edu['degree'], False, True))
+
         translated_data['education'].append(new_edu)
-        
+
     # 4. Skills
     skill_key_map = {
         'Programlama': 'Programming Languages',
@@ -135,57 +198,296 @@ def translate_resume_data(data):
         'Diller': 'Languages',
         'Yabancı Dil': 'Languages'
     }
-    
-    translated_skills = {}
+
     for key, val in data.get('skills', {}).items():
-        new_key = skill_key_map.get(key, key) 
-        
-        if val:
-            # Special handling for Language values "İngilizce" -> "English"
-            if key in ['Diller', 'Yabancı Dil']:
-                 val_trans = translator.translate(val)
-                 translated_skills[new_key] = val_trans
-            else:
-                 # Usually tech skills like "Python, SQL" don't bloom from translation well if they are proper nouns
-                 # But "Veri Analizi" -> "Data Analysis" might be needed.
-                 # Let's try translating but preserving specific capital words if possible? 
-                 # For now, just translate.
-                 translated_skills[new_key] = val # translator.translate(val) # Keeping tech stack as is usually better?
-                 # Actually user example: "Python, SQL" -> "Python, SQL". 
-                 # If user entered "Veri Madenciliği", we want "Data Mining".
-                 # So we should translate but maybe careful.
-                 # Let's translate for safety, user can edit.
-                 pass
-                 translated_skills[new_key] = val # User complained about headers mainly. Content is usually keywords.
-                 # Actually, let's NOT translate content of technical skills to avoid "Piton" for "Python".
-                 # Most tech skills are international.
-        else:
-            translated_skills[new_key] = val
-            
-    translated_data['skills'] = translated_skills
-    
-    # 5. Projects (New)
-    for proj in data.get('projects', []):
-        new_proj = proj.copy()
+        new_key = skill_key_map.get(key, key)
+        translated_data['skills'][new_key] = val
+        # Only language lists are translated ("İngilizce" -> "English"); technical
+        # skills are mostly international names and translate badly ("Piton" for "Python")
+        if val and key in ['Diller', 'Yabancı Dil']:
+            segments.append(Segment(('skills', new_key), val, False, True))
+
+    # 5. Projects
+    for i, proj in enumerate(data.get('projects', [])):
+        translated_data['projects'].append(proj.copy())
         if proj.get('name'):
-            new_proj['name'] = translator.translate(proj['name'])
+            segments.append(Segment(('projects', i, 'name'), proj['name'], False, True))
         if proj.get('description'):
-            d_text, d_rep = preserve_links_and_numbers(proj['description'])
-            t_desc = translator.translate(d_text)
-            new_proj['description'] = restore_links_and_numbers(t_desc, d_rep)
-        translated_data['projects'].append(new_proj)
-        
-    # 6. Certificates (New)
-    for cert in data.get('certificates', []):
+            segments.append(Segment(('projects', i, 'description'), proj['description'], True, True))
+
+    # 6. Certificates
+    for i, cert in enumerate(data.get('certificates', [])):
         new_cert = cert.copy()
         if cert.get('name'):
-            new_cert['name'] = translator.translate(cert['name'])
+            segments.append(Segment(('certificates', i, 'name'), cert['name'], False, True))
         if cert.get('authority'):
-            new_cert['authority'] = translator.translate(cert['authority'])
+            segments.append(Segment(('certificates', i, 'authority'), cert['authority'], False, True))
         # Date cleaning
         if cert.get('date'):
             new_cert['date'] = clean_date(cert['date'])
-            
+
         translated_data['certificates'].append(new_cert)
-    
+
+    return translated_data, segments
+
+
+def make_batches(texts, max_chars=MAX_BATCH_CHARS, max_items=MAX_BATCH_ITEMS):
+    """Groups consecutive texts into batches of at most `max_chars` characters / `max_items` texts."""
+    batches = []
+    current = []
+    size = 0
+    for text in texts:
+        extra = len(text) + (len(BATCH_SEPARATOR) if current else 0)
+        if current and (size + extra > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            size = 0
+            extra = len(text)
+        current.append(text)
+        size += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _call_backend(backend, texts, attempt, started):
+    if attempt > 1:
+        time.sleep(RETRY_DELAY * (attempt - 1))
+    started[0] = time.monotonic()
+    return backend.translate_batch(texts)
+
+
+def run_batches(backend, batches, max_workers=MAX_WORKERS, timeout=CALL_TIMEOUT, retries=RETRIES,
+                total_timeout=TOTAL_TIMEOUT):
+    """
+    Translates `batches` concurrently on a bounded thread pool.
+    Each call gets `timeout` seconds and up to `retries` retries; batches still unfinished
+    after `total_timeout` seconds fail with TimeoutError.
+    Returns (results, errors): per batch either the translated list or the last error.
+    """
+    results = [None] * len(batches)
+    errors = [None] * len(batches)
+    attempts = [0] * len(batches)
+    queue = list(range(len(batches)))
+    in_flight = {}  # future -> (batch index, [start time])
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+
+    def submit(index):
+        attempts[index] += 1
+        started = [None]
+        future = executor.submit(_call_backend, backend, batches[index], attempts[index], started)
+        in_flight[future] = (index, started)
+
+    def failed(index, error):
+        errors[index] = error
+        if attempts[index] <= retries:
+            queue.append(index)
+
+    give_up = time.monotonic() + total_timeout
+    try:
+        while queue or in_flight:
+            if time.monotonic() >= give_up:
+                for index in queue + [index for index, _ in in_flight.values()]:
+                    errors[index] = TimeoutError(f"Translation did not finish within {total_timeout}s")
+                break
+
+            while queue and len(in_flight) < max_workers:
+                submit(queue.pop(0))
+
+            # Wake up for the first finished call or the earliest deadline
+            now = time.monotonic()
+            deadlines = [s[0] + timeout for _, s in in_flight.values() if s[0] is not None]
+            wait_for = max(0.0, min(deadlines + [give_up]) - now)
+            done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, _ = in_flight.pop(future)
+                try:
+                    translated = future.result()
+                    if translated is None:
+                        raise TranslationError("Translator returned no result")
+                    if len(translated) != len(batches[index]):
+                        raise TranslationError(
+                            f"Translator returned {len(translated)} segments for {len(batches[index])}"
+                        )
+                    results[index] = translated
+                    errors[index] = None
+                except Exception as e:
+                    failed(index, e)
+
+            # Abandon calls past their deadline; a hung request cannot be interrupted,
+            # its result is simply ignored
+            now = time.monotonic()
+            for future, (index, started) in list(in_flight.items()):
+                if started[0] is not None and now - started[0] > timeout:
+                    del in_flight[future]
+                    failed(index, TimeoutError(f"Translation call timed out after {timeout}s"))
+    finally:
+        executor.shutdown(wait=False)
+
+    return results, errors
+
+
+def translate_segments(segments, backend=None, max_workers=MAX_WORKERS, timeout=CALL_TIMEOUT,
+                       retries=RETRIES, max_chars=MAX_BATCH_CHARS, memory=None, source='tr', target='en'):
+    """
+    Translates a list of Segments and returns the translated texts in the same order.
+    Identical texts are sent once. Failed optional segments keep their source text;
+    a failed required segment raises TranslationError.
+
+    Segments found in the translation memory (`memory`, default: the shared one,
+    False to bypass it) are not sent; new translations are stored there.
+    """
+    if memory is None:
+        memory = translation_memory.get_memory()
+
+    # URLs/emails are swapped for placeholders before sending
+    prepared = []
+    for segment in segments:
+        if segment.preserve:
+            prepared.append(preserve_links_and_numbers(segment.text))
+        else:
+            prepared.append((segment.text, {}))
+
+    unique = list(dict.fromkeys(text for text, _ in prepared))
+    translations = memory.get_many(unique, source, target) if memory else {}
+    pending = [text for text in unique if text not in translations]
+
+    failures = {}
+    if pending:
+        if backend is None:
+            backend = GoogleBackend(source=source, target=target)
+        batches = make_batches(pending, max_chars=max_chars)
+        results, errors = run_batches(backend, batches, max_workers=max_workers, timeout=timeout, retries=retries)
+
+        fresh = {}
+        for batch, translated, error in zip(batches, results, errors):
+            if translated is None:
+                for text in batch:
+                    failures[text] = error
+            else:
+                for text, result in zip(batch, translated):
+                    # A segment the translator returned nothing for fails on its own
+                    if result is None:
+                        failures[text] = TranslationError("Translator returned no text")
+                    else:
+                        fresh[text] = result
+
+        if memory:
+            memory.put_many(fresh, source, target)
+        translations.update(fresh)
+
+    output = []
+    for segment, (text, replacements) in zip(segments, prepared):
+        if text in translations:
+            output.append(restore_links_and_numbers(translations[text], replacements))
+        elif segment.required:
+            raise TranslationError(f"Could not translate {'/'.join(map(str, segment.path))}: {failures[text]}")
+        else:
+            output.append(segment.text)
+    return output
+
+
+def apply_segments(translated_data, segments, texts):
+    """Writes translated texts back into `translated_data` at each segment's path."""
+    for segment, text in zip(segments, texts):
+        target = translated_data
+        for key in segment.path[:-1]:
+            target = target[key]
+        target[segment.path[-1]] = text
     return translated_data
+
+
+def translate_resume_data(data, backend=None, max_workers=MAX_WORKERS, timeout=CALL_TIMEOUT, retries=RETRIES,
+                          max_chars=MAX_BATCH_CHARS, memory=None, sources=None):
+    """
+    Translates the entire resume data structure from Turkish to English.
+    Preserves URLs, emails, and number patterns.
+    All fields are collected first and sent in size-bounded batches that run
+    concurrently; `backend` defaults to Google Translate. Segments already in the
+    translation memory are not sent again.
+    A `sources` dict receives a hash of each field's Turkish source, for sync_translation.
+    It is kept beside the profile rather than in it, so it never reaches renders or backups.
+    """
+    translated_data, segments = collect_segments(data)
+    fields = _source_fields(translated_data, segments)
+    texts = translate_segments(segments, backend=backend, max_workers=max_workers, timeout=timeout,
+                               retries=retries, max_chars=max_chars, memory=memory)
+    # Remember what each field was translated from, for sync_translation
+    _record_sources(sources, fields)
+    return apply_segments(translated_data, segments, texts)
+
+
+def _source_hash(value):
+    return translation_memory.text_hash(str(value))[:16]
+
+
+def _path_key(path):
+    return '/'.join(str(part) for part in path)
+
+
+def _source_fields(skeleton, segments):
+    """{path: source value} for every field of the translated profile."""
+    fields = {}
+    for section, value in skeleton.items():
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                for field, field_value in item.items():
+                    fields[(section, i, field)] = field_value
+        elif isinstance(value, dict):
+            for field, field_value in value.items():
+                fields[(section, field)] = field_value
+    # Translated fields are derived from the Turkish text, not the copied placeholder
+    for segment in segments:
+        fields[segment.path] = segment.text
+    return fields
+
+
+def _lookup(data, path):
+    target = data
+    for key in path:
+        try:
+            target = target[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return target
+
+
+def _record_sources(sources, fields):
+    """Replaces `sources` with {field path: hash of the Turkish source it was made from}."""
+    if sources is not None:
+        sources.clear()
+        sources.update((_path_key(path), _source_hash(value)) for path, value in fields.items())
+
+
+def sync_translation(data, translated, sources=None, **kwargs):
+    """
+    Brings an existing English variant up to date with the Turkish profile `data`.
+    `sources` is the dict filled by the last translate_resume_data or sync_translation
+    call; fields whose Turkish source is unchanged since then keep their current English
+    value, including manual edits, and only new or changed segments are translated.
+    `sources` is updated in place. Returns (synced_data, number_of_translated_segments).
+    Accepts the same keyword arguments as translate_resume_data.
+    """
+    skeleton, segments = collect_segments(data)
+    fields = _source_fields(skeleton, segments)
+    recorded = sources or {}
+
+    unchanged = set()
+    for path, value in fields.items():
+        current = _lookup(translated, path)
+        if current is not None and recorded.get(_path_key(path)) == _source_hash(value):
+            unchanged.add(path)
+            target = skeleton
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = current
+
+    pending = [segment for segment in segments if segment.path not in unchanged]
+    if pending:
+        texts = translate_segments(pending, **kwargs)
+        apply_segments(skeleton, pending, texts)
+
+    _record_sources(sources, fields)
+    return skeleton, len(pending)
@@ -0,0 +1,107 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import batch_match
+import jd_index
+from inverted_index import InvertedIndex
+from matcher_utils import calculate_match_score, resume_terms
+from verify_jd_index import make_jd
+
+JD_COUNT = int(os.environ.get('ATS_VERIFY_JDS') or 10000)
+
+RESUME = (
+    "Backend developer. Python and Docker services on Kubernetes, deployed to AWS. "
+    "Built Machine Learning pipelines."
+)
+BEST_JD = "Backend Developer\nPython, Docker, Kubernetes, AWS and Machine Learning. Python services."
+
+
+def main():
+    print("Starting verification for batch matching...")
+    workdir = tempfile.mkdtemp(prefix='batch_match_')
+    try:
+        index = InvertedIndex(os.path.join(workdir, 'index'))
+        rng = random.Random(11)
+        texts = [(f"synthetic:{i}", make_jd(rng, i)) for i in range(JD_COUNT - 1)] + [("synthetic:best", BEST_JD)]
+        records = [(source, text.splitlines()[0], text) for source, text in texts]
+        t0 = time.perf_counter()
+        jd_index.add_records(index, records, 'en')
+        print(f"Indexed {index.n_docs} JDs in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        matrix = batch_match.get_matrix(index, 'en')
+        print(f"Matrix {matrix.shape[0]} x {matrix.shape[1]}, {matrix.nnz} entries, built in {time.perf_counter() - t0:.2f}s")
+        assert batch_match.get_matrix(index, 'en') is matrix
+
+        keywords = resume_terms(RESUME, 'en')
+        best = None
+        for _ in range(3):
+            t0 = time.perf_counter()
+            rows = matrix.rank(keywords, top=10)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"Scored and ranked {matrix.shape[0]} JDs in {best * 1000:.1f} ms")
+        assert best < 1.0
+
+        for row in rows[:3]:
+            print(f"  %{row['score']} {row['title']} matched={row['matched']} missing={row['missing'][:4]}")
+        top = rows[0]
+        assert top['source'] == "synthetic:best" and top['score'] == 100, top
+        for term in ('python', 'docker', 'kubernetes', 'aws', 'machine learning'):
+            assert term in top['matched'], term
+        # Covered by "machine learning", not scored on its own
+        assert 'learning' not in matrix.terms_of(top['doc_id'])
+        assert all(rows[i]['score'] >= rows[i + 1]['score'] for i in range(len(rows) - 1))
+        for row in rows:
+            assert set(row['matched']) <= keywords and not set(row['missing']) & keywords
+            # The same score and lists as a single IDF-weighted match of that JD
+            single = calculate_match_score(None, index.payload(row['doc_id']), 'en', resume_keywords=keywords, index=index)
+            assert single == (row['score'], row['matched'], row['missing']), (row, single)
+
+        # Adding a JD only computes its own row
+        jd_index.add_records(index, [("synthetic:new", "New", "Rust and Go developer, Kubernetes.")], 'en')
+        t0 = time.perf_counter()
+        updated = batch_match.get_matrix(index, 'en')
+        elapsed = time.perf_counter() - t0
+        print(f"Matrix updated for 1 new JD in {elapsed * 1000:.1f} ms")
+        assert updated is not matrix and updated.shape[0] == JD_COUNT + 1
+        assert updated.terms_of(JD_COUNT) and matrix.shape[0] == JD_COUNT
+        assert elapsed < 0.5
+
+        # One matrix per language: switching back and forth rebuilds nothing
+        tr_matrix = batch_match.get_matrix(index, 'tr')
+        assert batch_match.get_matrix(index, 'en') is updated and batch_match.get_matrix(index, 'tr') is tr_matrix
+
+        # A new process reads the rows stored beside the segments instead of re-tokenizing every JD
+        path = index.path
+        index.close()
+        batch_match._matrices.clear()
+        index = InvertedIndex(path)
+        t0 = time.perf_counter()
+        reloaded = batch_match.get_matrix(index, 'en')
+        print(f"Matrix loaded from the stored rows in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        assert reloaded.shape == updated.shape and reloaded.values == updated.values and reloaded.terms == updated.terms
+
+        # A merge renumbers the doc ids and carries the rows over
+        jd_index.add_records(index, [("synthetic:newer", "Newer", "Go developer with Kubernetes and AWS.")], 'en')
+        index.delete([jd_index.jd_key(BEST_JD)])
+        index.merge()
+        merged = batch_match.get_matrix(index, 'en')
+        assert merged.shape[0] == JD_COUNT + 1 and len(index.segments) == 1
+        assert index.read_sidecar(index.segments[0], 'rows-en') is not None
+        rows = merged.rank(keywords, top=10)
+        assert all(row['source'] != "synthetic:best" for row in rows)
+        for row in rows:
+            single = calculate_match_score(None, index.payload(row['doc_id']), 'en', resume_keywords=keywords, index=index)
+            assert single == (row['score'], row['matched'], row['missing']), (row, single)
+        index.close()
+        print("SUCCESS: batch matching")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
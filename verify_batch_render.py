@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+import tempfile
+
+import batch_render
+from profile_store import load_profile, normalize_store
+
+
+def main():
+    user_profile = normalize_store(load_profile())['tr']
+
+    print("Starting verification for the batch renderer...")
+    workdir = tempfile.mkdtemp(prefix='batch_render_')
+    try:
+        cohort = os.path.join(workdir, 'cohort.jsonl')
+        rows = [
+            dict({'tr': user_profile, 'en': user_profile}, id="both"),
+            # No English variant: skipped for en, never rendered from the Turkish data
+            dict({'tr': user_profile}, id="tr_only"),
+            # Ids that reduce to the same file name
+            dict({'tr': user_profile}, id="team/ayse"),
+            dict({'tr': user_profile}, id="team?ayse"),
+            # The same id twice would overwrite the first profile's files
+            dict({'tr': user_profile}, id="both"),
+        ]
+        with open(cohort, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+        out_dir = os.path.join(workdir, 'out')
+        summary = batch_render.run_batch(
+            cohort, out_dir, templates=["Klasik"], languages=["tr", "en"], formats=["pdf", "docx"], workers=2
+        )
+        files = sorted(os.listdir(out_dir))
+        print(f"Rendered {summary['renders']} files in {summary['seconds']:.2f}s: {files}")
+        print(f"Skipped: {summary['skipped']}")
+        print(f"Failures: {summary['failures']}")
+
+        assert sorted(summary['skipped']) == sorted(
+            (f"{batch_render.safe_name(key)}_en", "No 'en' profile data")
+            for key in ("tr_only", "team/ayse", "team?ayse")
+        ), summary['skipped']
+        assert [name for name, _ in summary['failures']] == ["both"], summary['failures']
+        assert not any(name.startswith("tr_only") and "_en" in name for name in files)
+        assert batch_render.safe_name("team/ayse") != batch_render.safe_name("team?ayse")
+        assert batch_render.safe_name("ayse_yilmaz") == "ayse_yilmaz"
+        # both: 2 languages x (1 PDF + 1 DOCX); the other three: tr only
+        assert summary['renders'] == len(files) == 4 + 3 * 2, files
+        for name in files:
+            with open(os.path.join(out_dir, name), 'rb') as f:
+                header = f.read(4)
+            assert header == (b'%PDF' if name.endswith('.pdf') else b'PK\x03\x04'), name
+        print("SUCCESS: batch render")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
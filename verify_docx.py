@@ -1,7 +1,10 @@
 from cv_generator_docx import ATSResumeDocx
-from user_data import user_profile
+from profile_store import load_profile, normalize_store
 import os
 
+# The store holds one profile per language; render the Turkish one
+user_profile = normalize_store(load_profile())['tr']
+
 print("Testing DOCX Generator...")
 try:
     docx = ATSResumeDocx()
@@ -0,0 +1,92 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import export
+import render_cache
+from profile_store import load_profile
+
+
+def main():
+    user_profile = load_profile()
+    if 'tr' in user_profile:
+        user_profile = user_profile['tr']
+
+    print("Starting verification for the concurrent export...")
+    export.warm_up()
+
+    # Serial baseline, straight through the generators (warmed first, like the workers)
+    export._init_worker()
+    export._render('docx', user_profile, None, 'tr', None, None)
+    t0 = time.perf_counter()
+    serial = {
+        'pdf': export._render('pdf', user_profile, "Modern", 'tr', render_cache.DEFAULT_THEME_COLOR, None),
+        'docx': export._render('docx', user_profile, None, 'tr', None, None),
+        'pdf_en': export._render('pdf', user_profile, "Modern", 'en', render_cache.DEFAULT_THEME_COLOR, 1)
+    }
+    serial_time = time.perf_counter() - t0
+
+    render_cache.cache.clear()
+    t0 = time.perf_counter()
+    exports = export.ExportCoordinator()
+    exports.submit_pdf('pdf', user_profile, "Modern")
+    exports.submit_docx('docx', user_profile)
+    exports.submit_pdf('pdf_en', user_profile, "Modern", language='en', fit_pages=1)
+    # A broken profile: its artifact fails, the others must not
+    exports.submit_pdf('broken', dict(user_profile, experience=[42]), "Modern")
+
+    finished = []
+    for name, file_bytes, error in exports.as_completed(timeout=120):
+        elapsed = time.perf_counter() - t0
+        finished.append(name)
+        if error is not None:
+            print(f"{name}: FAILED after {elapsed:.2f}s ({type(error).__name__}: {error})")
+        else:
+            print(f"{name}: {len(file_bytes)} bytes after {elapsed:.2f}s")
+    concurrent_time = time.perf_counter() - t0
+
+    assert sorted(finished) == ['broken', 'docx', 'pdf', 'pdf_en']
+    assert exports.futures['broken'].exception() is not None, "The broken profile should fail"
+    # PDFs embed their creation time, compare size and header instead of bytes
+    for name in ('pdf', 'pdf_en'):
+        assert exports.result(name).startswith(b'%PDF')
+        assert len(exports.result(name)) == len(serial[name]), name
+    assert len(exports.result('docx')) > 0
+
+    # A second export of the same data is served from the render cache, one lookup per artifact
+    before = render_cache.cache.stats()
+    t0 = time.perf_counter()
+    again = export.ExportCoordinator()
+    again.submit_pdf('pdf', user_profile, "Modern")
+    again.submit_docx('docx', user_profile)
+    list(again.as_completed())
+    cached_time = time.perf_counter() - t0
+    after = render_cache.cache.stats()
+    assert after['misses'] == before['misses'], "A cached export should not count a miss"
+    assert after['hits'] == before['hits'] + 2
+
+    # A pool shut down or reset by another dispatcher: the job still renders, here
+    pool = export._pool
+    closed = ThreadPoolExecutor(max_workers=1)
+    closed.shutdown()
+
+    class CancellingPool:
+        def submit(self, *args):
+            future = Future()
+            future.cancel()
+            return future
+
+    job = ('pdf', user_profile, "Modern", 'tr', render_cache.DEFAULT_THEME_COLOR, None)
+    try:
+        for replaced in (closed, CancellingPool()):
+            export._pool = replaced
+            assert export._run(job).startswith(b'%PDF'), type(replaced).__name__
+    finally:
+        export._pool = pool
+
+    print(f"Serial: {serial_time:.2f}s, concurrent ({export._worker_count()} workers): {concurrent_time:.2f}s, "
+          f"cached: {cached_time * 1000:.1f} ms")
+    print("SUCCESS: concurrent export")
+
+
+if __name__ == '__main__':
+    main()
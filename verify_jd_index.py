@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import inverted_index
+import jd_index
+from matcher_utils import calculate_match_score, get_job_matcher, resume_terms
+
+CORPUS_SIZE = int(os.environ.get('ATS_VERIFY_JDS') or 100000)
+
+BOILERPLATE = (
+    "We are a dynamic team looking for a motivated colleague with strong communication skills.",
+    "You will work in a fast-paced environment and collaborate with stakeholders.",
+    "Competitive salary, flexible working hours and a great team culture.",
+)
+SKILLS = (
+    "Python", "SQL", "Power BI", "Tableau", "Machine Learning", "Docker", "Kubernetes", "AWS",
+    "React", "Java", "Spring Boot", "Excel", "SAP", "Supply Chain", "Scrum", "Go", "R",
+)
+ROLES = ("Data Analyst", "Backend Developer", "Frontend Developer", "Supply Planner", "DevOps Engineer")
+
+JOB_DESC = (
+    "Data Analyst. We are a dynamic team looking for a motivated colleague with strong communication "
+    "skills. Competitive salary and a great team culture. Tableau and SQL are required, Tableau "
+    "dashboards daily. Power BI is a plus. You will work with stakeholders in a fast-paced environment."
+)
+RESUME = "Data analyst building Tableau and Power BI dashboards on SQL warehouses."
+
+
+def make_jd(rng, i):
+    role = rng.choice(ROLES)
+    skills = ", ".join(rng.sample(SKILLS, 4))
+    return f"{role} #{i}\n{rng.choice(BOILERPLATE)} {rng.choice(BOILERPLATE)} Required: {skills}."
+
+
+def write_corpus(path, count, start=0, seed=7):
+    rng = random.Random(seed + start)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({'id': i, 'text': make_jd(rng, i)}) + "\n")
+
+
+def main():
+    print("Starting verification for the JD corpus index...")
+    workdir = tempfile.mkdtemp(prefix='jd_index_')
+    try:
+        index_path = os.path.join(workdir, 'index')
+        first = os.path.join(workdir, 'first.jsonl')
+        second = os.path.join(workdir, 'second.jsonl')
+        write_corpus(first, CORPUS_SIZE)
+        write_corpus(second, 1000, start=CORPUS_SIZE)
+
+        index = inverted_index.InvertedIndex(index_path)
+        t0 = time.perf_counter()
+        added = jd_index.add_corpus(index, first, 'en')
+        print(f"Indexed {added} JDs in {time.perf_counter() - t0:.1f}s: {index.stats()}")
+        assert added == index.n_docs == CORPUS_SIZE
+
+        # Incremental: known JDs are skipped, new ones go into a new segment
+        segments = len(index.segments)
+        t0 = time.perf_counter()
+        assert jd_index.add_corpus(index, first, 'en') == 0
+        assert jd_index.add_corpus(index, second, 'en') == 1000
+        print(f"Incremental add of 1000 JDs (after re-scanning {CORPUS_SIZE}): {time.perf_counter() - t0:.1f}s")
+        assert index.n_docs == CORPUS_SIZE + 1000
+        assert len(index.segments) == segments + 1 or len(index.segments) == 1
+        assert index.payload(CORPUS_SIZE).startswith(make_jd(random.Random(7 + CORPUS_SIZE), CORPUS_SIZE)[:10])
+
+        # A second reader (e.g. the app while the CLI adds JDs) sees the new documents
+        reader = inverted_index.InvertedIndex(index_path)
+        assert reader.n_docs == index.n_docs and reader.df('tableau') == index.df('tableau')
+
+        # Boilerplate is in most postings, skills in a few: IDF ranks the skills first
+        matcher = get_job_matcher(JOB_DESC, 'en')
+        weights = matcher.weights(index)
+        top = matcher.top_terms(index)
+        print(f"Frequency-ranked terms: {matcher.terms[:8]}")
+        print(f"BM25-ranked terms:      {top[:8]}")
+        for boilerplate in ('dynamic', 'motivated', 'communication'):
+            assert boilerplate in matcher.terms[:8] and boilerplate not in top[:8], boilerplate
+            assert weights[boilerplate] < weights['tableau'], boilerplate
+
+        plain = calculate_match_score(RESUME, JOB_DESC, 'en')
+        weighted = calculate_match_score(RESUME, JOB_DESC, 'en', index=index)
+        print(f"Score without corpus: {plain[0]}, with corpus: {weighted[0]}, missing: {weighted[2][:5]}")
+        assert weighted[0] > plain[0]
+        assert calculate_match_score(None, JOB_DESC, 'en', resume_keywords=resume_terms(RESUME, 'en'), index=index) == weighted
+
+        # Queries stay in milliseconds on the full corpus
+        t0 = time.perf_counter()
+        for term in weights:
+            index.df(term)
+        print(f"{len(weights)} df lookups: {(time.perf_counter() - t0) * 1000:.2f} ms")
+        job_desc = JOB_DESC + " Kubernetes and Docker experience."
+        t0 = time.perf_counter()
+        calculate_match_score(RESUME, job_desc, 'en', index=index)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"New JD scored against the corpus: {elapsed:.2f} ms")
+        assert elapsed < 50
+
+        # Segments a refresh retires stay open for a reader still iterating them
+        with reader.reading() as pinned:
+            df = reader.df('tableau')
+            postings = [segment.postings('tableau') for segment in pinned]
+            t0 = time.perf_counter()
+            index.merge()
+            print(f"Merged into {len(index.segments)} segment in {time.perf_counter() - t0:.1f}s")
+            assert reader.refresh() and len(reader.segments) == 1
+            assert reader.df('tableau') == index.df('tableau')
+            assert sum(len(doc_ids) for doc_ids, _ in postings) == sum(segment.df('tableau') for segment in pinned) == df
+            del postings
+        assert all(segment._refs == 0 for segment in pinned) and reader.segments[0]._refs == 1
+        assert index.n_docs == CORPUS_SIZE + 1000
+        reader.close()
+        index.close()
+        print("SUCCESS: JD corpus index")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import random
+import re
+import time
+
+import ats_keyword_analyzer
+import keyword_automaton
+import tokenizer
+from keyword_automaton import KeywordAutomaton
+from profile_store import load_profile, normalize_store
+
+KEYWORD_COUNT = 5000
+DOCUMENT_SIZE = 6000
+
+
+def check_runs():
+    # The split-based run cutter must give exactly the regex runs
+    rng = random.Random(1)
+    alphabet = ['a', 'ş', '1', '_', ' ', ' ', '  ', '/', '+', '.', '-', '\n', 'é']
+    for _ in range(20000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert keyword_automaton._runs(text) == keyword_automaton._RUN_PATTERN.findall(text), text
+
+
+def regex_counts(keywords, text):
+    counts = {}
+    for keyword in keywords:
+        count = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+        if count:
+            counts[keyword] = count
+    return counts
+
+
+def best_time(function, rounds=30, repeat=10):
+    best = None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        elapsed = (time.perf_counter() - t0) / repeat
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    user_profile = normalize_store(load_profile())['tr']
+    print("Starting verification for the keyword automaton...")
+    check_runs()
+
+    # Same counts as one \b-wrapped regex per keyword, symbols and phrases included
+    text = tokenizer.normalize(ats_keyword_analyzer.extract_text_from_profile(user_profile) + " CI/CD, C++ and .NET", 'en')
+    automaton = ats_keyword_analyzer.get_keyword_automaton()
+    assert automaton.count(text) == regex_counts(automaton.keywords, text)
+    print(f"SUCCESS: {len(automaton.keywords)} ATS keywords counted as the regexes do")
+
+    # A large keyword set against a resume-sized document
+    rng = random.Random(0)
+    letters = "abcdefghijklmnoprstuvyz"
+    keywords = set(automaton.keywords)
+    while len(keywords) < KEYWORD_COUNT:
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(rng.choice((1, 1, 2, 3)))]
+        keywords.add(' '.join(words))
+    keywords = sorted(keywords)
+    document = text
+    while len(document) < DOCUMENT_SIZE:
+        document += " " + " ".join(rng.sample(keywords, 5)) + " " + text
+    document = document[:DOCUMENT_SIZE]
+
+    t0 = time.perf_counter()
+    large = KeywordAutomaton(keywords)
+    print(f"Built the automaton for {len(keywords)} keywords in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    counts = large.count(document)
+    assert counts == regex_counts(keywords, document)
+    elapsed = best_time(lambda: large.count(document))
+    print(f"Counted {len(keywords)} keywords in a {len(document)} character document: {elapsed * 1000:.3f} ms "
+          f"({len(counts)} found)")
+    assert elapsed < 0.001
+
+    elapsed = best_time(lambda: ats_keyword_analyzer.analyze_keywords(user_profile))
+    print(f"analyze_keywords: {elapsed * 1000:.3f} ms")
+    print("SUCCESS: keyword automaton")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import time
+
+from matcher_utils import calculate_match_score, find_short_skills, get_job_matcher, get_resume_text, resume_terms
+from profile_store import load_profile
+
+JOB_DESC = (
+    "We are hiring a Data Analyst. Machine Learning and Power BI are required; "
+    "experience with R or Go is a plus. You will run A/B Testing programs for our "
+    "Supply Chain team and build Machine Learning models. Python and SQL daily."
+)
+RESUME = (
+    "Built machine learning models in R, reported in Power BI and ran A/B testing "
+    "for supply chain planning. Daily Python and SQL. Happy to go the extra mile."
+)
+
+
+def main():
+    print("Starting verification for phrase matching...")
+    matcher = get_job_matcher(JOB_DESC, 'en')
+    print(f"JD terms: {matcher.terms}")
+    for phrase in ('machine learning', 'power bi', 'a/b testing', 'supply chain', 'r', 'go'):
+        assert phrase in matcher.terms, f"{phrase!r} should be a JD term"
+    # Covered by "machine learning", not scored on its own
+    assert 'learning' not in matcher.terms
+
+    score, matched, missing = calculate_match_score(RESUME, JOB_DESC, 'en')
+    print(f"Score: {score}, matched: {matched}, missing: {missing}")
+    for phrase in ('machine learning', 'power bi', 'a/b testing', 'supply chain', 'r'):
+        assert phrase in matched, f"{phrase!r} should match"
+    # "go the extra mile" is not the Go language
+    assert 'go' in missing
+
+    # Neither "R&D" nor a sentence-initial "Go ahead" is a language; a listed one is
+    assert not find_short_skills("Led the R&D team. Go ahead and apply.")
+    assert 'r' not in get_job_matcher("R&D engineer for our AT&T account. Go ahead and apply.", 'en').terms
+    assert 'go' not in resume_terms("Go ahead and ask. Managed R&D budgets.", 'en')
+    assert find_short_skills("Languages: Go, Python\nR\n- Go/SQL") == {'go': 2, 'r': 1}
+
+    # The cached path (precomputed resume terms) gives the same result
+    assert calculate_match_score(None, JOB_DESC, 'en', resume_keywords=resume_terms(RESUME, 'en')) == (score, matched, missing)
+    user_profile = load_profile()
+    if 'tr' in user_profile:
+        user_profile = user_profile['tr']
+    profile_text = get_resume_text(user_profile)
+    assert calculate_match_score(profile_text, JOB_DESC, 'en') == \
+        calculate_match_score(None, JOB_DESC, 'en', resume_keywords=resume_terms(profile_text, 'en'))
+
+    # Linear in the text length
+    for factor in (1, 10, 100):
+        job_desc = " ".join(f"{JOB_DESC} Ref {i}." for i in range(factor))
+        resume = RESUME * factor
+        t0 = time.perf_counter()
+        calculate_match_score(resume, job_desc, 'en')
+        print(f"{len(job_desc) + len(resume):>8} chars: {(time.perf_counter() - t0) * 1000:.2f} ms")
+    print("SUCCESS: phrase matching")
+
+
+if __name__ == '__main__':
+    main()
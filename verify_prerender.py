@@ -0,0 +1,40 @@
+import copy
+import time
+
+import export
+import render_cache
+from prerender import CANCELLED, DONE, Prefetcher
+from profile_store import load_profile
+
+user_profile = load_profile()
+if 'tr' in user_profile:
+    user_profile = user_profile['tr']
+
+print("Starting verification for background pre-rendering...")
+prefetcher = Prefetcher(max_workers=1)
+
+# Version 1 is superseded right away: its queued renders are cancelled
+job_v1 = prefetcher.prefetch('session', 1, user_profile)
+edited = copy.deepcopy(user_profile)
+edited['personal']['fullName'] = edited['personal'].get('fullName', '') + " (edited)"
+job_v2 = prefetcher.prefetch('session', 2, edited)
+assert prefetcher.prefetch('session', 2, edited) is job_v2, "Same version must reuse the job"
+
+assert prefetcher.wait('session', timeout=60), "Pre-rendering did not finish"
+print(f"Version 1: {job_v1.status()}")
+print(f"Version 2: {job_v2.status()}")
+assert CANCELLED in job_v1.status().values()
+assert all(state == DONE for state in job_v2.status().values())
+
+# The final step finds every template in the render cache
+for template in ["Klasik", "Modern", "Akademik"]:
+    t0 = time.perf_counter()
+    pdf_bytes = render_cache.render_pdf(edited, template)
+    elapsed = (time.perf_counter() - t0) * 1000
+    assert pdf_bytes == prefetcher.result('session', template)
+    print(f"{template}: {len(pdf_bytes)} bytes from cache in {elapsed:.2f} ms")
+assert render_cache.render_docx(edited) == prefetcher.result('session', 'docx')
+
+print(f"Prefetcher: {prefetcher.stats()}, rendered on {export.workers() or 'no'} worker processes")
+print(f"Render cache: {render_cache.cache.stats()}")
+print("SUCCESS: pre-rendering")
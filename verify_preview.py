@@ -0,0 +1,53 @@
+import urllib.error
+import urllib.request
+
+from cv_generator import get_generator
+from preview_server import PreviewServer
+from profile_store import load_profile
+
+user_profile = load_profile()
+if 'tr' in user_profile:
+    user_profile = user_profile['tr']
+
+print("Starting verification for the PDF preview server...")
+
+pdf_bytes = bytes(get_generator("Klasik").generate(user_profile))
+server = PreviewServer(port=0, max_entries=2).start()
+
+try:
+    url = server.publish(pdf_bytes)
+    print(f"Preview URL: {url}")
+    assert server.publish(pdf_bytes) == url, "Same bytes must keep the same URL"
+
+    with urllib.request.urlopen(url) as response:
+        body = response.read()
+        etag = response.headers['ETag']
+        print(f"200: {len(body)} bytes, Cache-Control: {response.headers['Cache-Control']}")
+        assert body == pdf_bytes
+        assert response.headers['Content-Type'] == 'application/pdf'
+        assert 'immutable' in response.headers['Cache-Control']
+
+    # A revalidating browser gets an empty 304
+    request = urllib.request.Request(url, headers={'If-None-Match': etag})
+    try:
+        urllib.request.urlopen(request)
+        raise AssertionError("Expected 304 Not Modified")
+    except urllib.error.HTTPError as e:
+        assert e.code == 304, e.code
+        print("304: unchanged preview costs no body bytes")
+
+    # Changed PDF, new URL; the oldest entries are dropped beyond max_entries
+    changed_url = server.publish(pdf_bytes + b"\n%changed")
+    assert changed_url != url
+    server.publish(pdf_bytes + b"\n%changed again")
+    try:
+        urllib.request.urlopen(url)
+        raise AssertionError("Expected the evicted preview to be gone")
+    except urllib.error.HTTPError as e:
+        assert e.code == 404, e.code
+        print("404: evicted preview no longer served")
+
+    print(f"Stats: {server.stats()}")
+    print("SUCCESS: preview server")
+finally:
+    server.stop()
@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import resource
+import time
+
+import resume_index
+from inverted_index import InvertedIndex
+
+PROFILE_COUNT = int(os.environ.get('ATS_VERIFY_PROFILES') or 50000)
+
+SKILLS = (
+    "Python", "SQL", "Power BI", "Tableau", "Machine Learning", "Docker", "Kubernetes", "AWS",
+    "React", "Java", "Spring Boot", "Excel", "SAP", "Scrum", "Go", "R", "Figma", "Terraform",
+)
+TITLES = ("Data Analyst", "Backend Developer", "Frontend Developer", "Supply Planner", "DevOps Engineer")
+
+JOB_DESC = (
+    "Senior Data Engineer. Kubernetes and Terraform are required, Kubernetes daily. "
+    "Machine Learning pipelines on AWS. Terraform modules for AWS."
+)
+
+
+def make_profile(rng, i):
+    skills = rng.sample(SKILLS, 4)
+    title = rng.choice(TITLES)
+    return {
+        'id': f"candidate-{i}",
+        'personal': {'fullName': f"Candidate {i}", 'summary': f"{title} with {rng.randint(1, 12)} years of experience."},
+        'experience': [{
+            'title': title, 'company': f"Company {i % 500}", 'startDate': "01/2020", 'endDate': "Present",
+            'description': f"• Worked with {skills[0]} and {skills[1]}\n• Delivered projects with the team"
+        }],
+        'education': [{'school': "Boğaziçi Üniversitesi", 'degree': "Bilgisayar Mühendisliği"}],
+        'skills': {'Programlama': ", ".join(skills[:3]), 'Araçlar': skills[3]},
+        'projects': [], 'certificates': []
+    }
+
+
+def write_profiles(path, count, start=0):
+    rng = random.Random(start)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(json.dumps(make_profile(rng, i), ensure_ascii=False) + "\n")
+
+
+def main():
+    print("Starting verification for the resume index...")
+    workdir = tempfile.mkdtemp(prefix='resume_index_')
+    try:
+        cohort = os.path.join(workdir, 'cohort.jsonl')
+        write_profiles(cohort, PROFILE_COUNT)
+        index = InvertedIndex(os.path.join(workdir, 'index'))
+
+        # Profiles stream through in batches of BATCH_SIZE, the cohort is never loaded at once
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        added = resume_index.add_profiles(index, cohort, 'en')
+        elapsed = time.perf_counter() - t0
+        rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        print(f"Indexed {added} profiles in {elapsed:.1f}s, peak RSS +{rss_growth / 1024:.0f} MB "
+              f"(cohort file {os.path.getsize(cohort) / 1024 / 1024:.0f} MB): {index.stats()}")
+        assert added == index.n_docs == PROFILE_COUNT
+
+        # Incremental: unchanged profiles are skipped, a changed one replaces its old version
+        star = make_profile(random.Random(1), 1)
+        star['id'] = "candidate-7"
+        star['personal'] = {'fullName': "Star Candidate", 'summary': "Senior data engineer building pipelines."}
+        star['skills'] = {'Programlama': "Python, Terraform", 'Araçlar': "Kubernetes, AWS, Machine Learning"}
+        update = os.path.join(workdir, 'update.jsonl')
+        with open(update, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(make_profile(random.Random(0), 0)) + "\n")
+            f.write(json.dumps(star) + "\n")
+        t0 = time.perf_counter()
+        added = resume_index.add_profiles(index, update, 'en')
+        print(f"Update: {added} profile re-indexed in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        assert added == 1 and index.n_docs == PROFILE_COUNT and len(index.deleted) == 1
+
+        best = None
+        for _ in range(3):
+            t0 = time.perf_counter()
+            rows = resume_index.rank(index, JOB_DESC, 'en', top=5)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"Ranked {index.n_docs} profiles in {best * 1000:.0f} ms")
+        for row in rows[:3]:
+            print(f"  %{row['score']} {row['name']} ({row['key']}) matched={row['matched']} missing={row['missing']}")
+        top = rows[0]
+        assert top['key'] == "candidate-7" and top['name'] == "Star Candidate", top
+        assert dict(top['matched'])['terraform'] == ['skills']
+        assert all(rows[i]['score'] >= rows[i + 1]['score'] for i in range(len(rows) - 1))
+
+        # Rows without an id are keyed per file: a second file does not replace the first one's rows
+        for name, people in (('a.jsonl', ("Ayse", "Mehmet")), ('b.jsonl', ("Zeynep",))):
+            with open(os.path.join(workdir, name), 'w', encoding='utf-8') as f:
+                for person in people:
+                    profile = make_profile(random.Random(person), 0)
+                    del profile['id']
+                    profile['personal']['fullName'] = person
+                    f.write(json.dumps(profile, ensure_ascii=False) + "\n")
+            assert resume_index.add_profiles(index, os.path.join(workdir, name), 'en') == len(people)
+        assert {"a.jsonl:1", "a.jsonl:2", "b.jsonl:1"} <= set(index.keys())
+        assert index.n_docs == PROFILE_COUNT + 3
+        assert index.delete(["a.jsonl:1", "a.jsonl:2", "b.jsonl:1"]) == 3
+
+        # Removed profiles disappear from results, and a merge drops them for good
+        assert index.delete(["candidate-7"]) == 1
+        assert all(row['key'] != "candidate-7" for row in resume_index.rank(index, JOB_DESC, 'en', top=5))
+        t0 = time.perf_counter()
+        index.merge()
+        print(f"Merged in {time.perf_counter() - t0:.1f}s: {index.stats()}")
+        assert index.n_docs == PROFILE_COUNT - 1 and not index.deleted
+        assert resume_index.rank(index, JOB_DESC, 'en', top=5)[0]['key'] != "candidate-7"
+        index.close()
+
+        # A repeated JD phrase only matches where its words are adjacent, as in calculate_match_score
+        from matcher_utils import calculate_match_score
+        from resume_document import compile_resume
+        phrase_jd = "Data pipelines in Python. You own our data pipelines and streaming."
+        apart = make_profile(random.Random(2), 2)
+        apart['experience'][0]['description'] = "• Data quality checks\n• Maintained ETL pipelines"
+        adjacent = make_profile(random.Random(3), 3)
+        adjacent['experience'][0]['description'] = "• Built data pipelines for reporting"
+        phrases = os.path.join(workdir, 'phrases.jsonl')
+        with open(phrases, 'w', encoding='utf-8') as f:
+            for profile in (apart, adjacent):
+                f.write(json.dumps(profile, ensure_ascii=False) + "\n")
+        small = InvertedIndex(os.path.join(workdir, 'phrase_index'))
+        resume_index.add_profiles(small, phrases, 'en')
+        rows = {row['key']: row for row in resume_index.rank(small, phrase_jd, 'en', top=2)}
+        for profile in (apart, adjacent):
+            resume = compile_resume(profile, 'en')
+            text = " ".join(resume.text(spec) for _, spec in resume_index.SECTIONS)
+            score, matched, _ = calculate_match_score(text, phrase_jd, 'en')
+            row = rows.get(profile['id'], {'score': 0, 'matched': []})
+            print(f"  {profile['id']}: index %{row['score']} {sorted(dict(row['matched']))}, direct %{score} {sorted(matched)}")
+            assert row['score'] == score and sorted(dict(row['matched'])) == sorted(matched)
+            assert ('data pipelines' in matched) == (profile is adjacent)
+        small.close()
+        print("SUCCESS: resume index")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Import-time profile of what app.py loads before step 0 is painted.
+Runs the top-level imports of app.py under `python -X importtime` in a fresh
+interpreter, prints the slowest modules (self and cumulative time) and fails if
+a heavy dependency is loaded at startup or the total exceeds the budget.
+Streamlit itself is imported first and not counted: `streamlit run` loads it
+before app.py.
+"""
+import ast
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, 'app.py')
+
+BUDGET_MS = float(os.environ.get('ATS_IMPORT_BUDGET_MS', 150))
+RUNS = 3
+TOP = 15
+
+# Must only be imported by the steps that need them
+HEAVY_MODULES = (
+    'fpdf', 'fontTools', 'PIL', 'docx', 'lxml', 'deep_translator', 'requests',
+    'cv_generator', 'cv_generator_docx', 'font_registry', 'translator_utils',
+    'translation_memory', 'sqlite3', 'ats_keyword_analyzer', 'pdf_utils'
+)
+
+
+def app_imports(path=APP_PATH):
+    """Module names imported at the top level of app.py."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return [name for name in dict.fromkeys(modules) if name != 'streamlit']
+
+
+def profile_imports(modules):
+    """Returns [(module, self_us, cumulative_us, depth)] for imports after streamlit."""
+    code = "import streamlit\n" + "".join(f"import {name}\n" for name in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing the app modules failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    # -X importtime prints children before parents; everything up to the streamlit line is its tree
+    for i, (name, _, _, depth) in enumerate(rows):
+        if name == 'streamlit' and depth == 0:
+            return rows[i + 1:]
+    return rows
+
+
+def main():
+    modules = app_imports()
+    print(f"app.py imports at startup: {', '.join(modules)}")
+
+    best = None
+    for _ in range(RUNS):
+        rows = profile_imports(modules)
+        total_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, rows)
+    total_ms, rows = best
+
+    print(f"\n{'module':<40} {'self ms':>9} {'cumul ms':>9}")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[1])[:TOP]:
+        print(f"{name:<40} {self_us / 1000:>9.2f} {cumulative_us / 1000:>9.2f}")
+    print(f"\nTotal (best of {RUNS}): {total_ms:.1f} ms, budget {BUDGET_MS:.0f} ms")
+
+    loaded = {name for name, _, _, _ in rows}
+    heavy = sorted(name for name in loaded if name.split('.')[0] in HEAVY_MODULES)
+    assert not heavy, f"Heavy modules imported at startup: {', '.join(heavy)}"
+    assert total_ms <= BUDGET_MS, f"Startup imports took {total_ms:.1f} ms, budget is {BUDGET_MS:.0f} ms"
+    print("SUCCESS: startup imports within budget")
+
+
+if __name__ == '__main__':
+    main()
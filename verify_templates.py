@@ -1,7 +1,10 @@
 from cv_generator import get_generator
-from user_data import user_profile
+from profile_store import load_profile, normalize_store
 import os
 
+# The store holds one profile per language; render the Turkish one
+user_profile = normalize_store(load_profile())['tr']
+
 templates = ["Klasik", "Modern", "Akademik"]
 
 print("Starting verification for templates...")
@@ -16,7 +19,7 @@ for t_name in templates:
         # Save to disk to verify file creation
         filename = f"test_cv_{t_name}.pdf"
         with open(filename, "wb") as f:
-            f.write(output)
+            f.write(output.view)
             
         file_size = os.path.getsize(filename)
         print(f"SUCCESS: {t_name} generated. Size: {file_size} bytes")
@@ -0,0 +1,83 @@
+import io
+import re
+import time
+
+import tokenizer
+
+SAMPLE_JD_TR = (
+    "Veri Analisti arıyoruz. Python, SQL ve Power BI ile raporlama deneyimi; C#, .NET ve "
+    "Node.js bilgisi tercih sebebidir. CI/CD süreçleri, A/B testleri ve İLETİŞİM becerileri "
+    "önemlidir. İstanbul ofisimizde IŞIK Teknoloji ekibine katılacak, %20 büyüme hedefli. "
+)
+SAMPLE_JD_EN = (
+    "We are looking for a Data Analyst with Python, SQL, Power BI and C++ experience. "
+    "Business Intelligence, scikit-learn, ASP.NET Core and CI/CD pipelines are a plus. "
+    "You will run A/B tests, build dashboards and work with e-commerce stakeholders. "
+)
+
+CORPUS_BYTES = 1024 * 1024
+RUNS = 3
+
+
+def check_tokens():
+    tokens = tokenizer.tokens(SAMPLE_JD_TR, 'tr')
+    for expected in ('c#', '.net', 'node.js', 'ci/cd', 'a/b', 'iletişim', 'ışık', 'istanbul', 'power', 'bi'):
+        assert expected in tokens, f"{expected!r} missing from {tokens}"
+    tokens = tokenizer.tokens(SAMPLE_JD_EN, 'en')
+    for expected in ('c++', 'intelligence', 'scikit-learn', 'asp.net', 'e-commerce', 'ci/cd'):
+        assert expected in tokens, f"{expected!r} missing from {tokens}"
+
+    # Turkish casing for Turkish words, ASCII casing for ASCII words (English terms, acronyms)
+    assert tokenizer.fold("IŞIK", 'tr') == "ışık"
+    assert tokenizer.fold("İZMİR", 'tr') == "izmir"
+    assert tokenizer.fold("Intelligence", 'tr') == "intelligence"
+
+    # Streaming over a file-like object gives the same tokens as the whole string
+    text = SAMPLE_JD_TR + "\n" + SAMPLE_JD_EN
+    assert list(tokenizer.iter_tokens(io.StringIO(text))) == tokenizer.tokens(text)
+    print("Tokens: OK")
+
+
+def make_corpus(size=CORPUS_BYTES):
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = (SAMPLE_JD_TR if i % 2 else SAMPLE_JD_EN) + f"Ref {i}.\n"
+        lines.append(line)
+        total += len(line.encode('utf-8'))
+        i += 1
+    return "".join(lines)
+
+
+def bench(label, fn, corpus):
+    best = None
+    count = 0
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        count = fn(corpus)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<42} {count:>9} tokens {best * 1000:>8.1f} ms {count / best / 1e6:>6.2f} M tokens/s")
+
+
+def main():
+    print("Starting verification for the tokenizer...")
+    check_tokens()
+
+    corpus = make_corpus()
+    print(f"Corpus: {len(corpus.encode('utf-8')) / 1024:.0f} KB")
+
+    # Previous matcher_utils approach, for reference (drops C#/.NET/CI/CD, not Turkish-aware)
+    old_pattern = re.compile(r'[^a-z0-9\s\+#üğışçö]')
+    bench("regex cleanup + split (old matcher)", lambda text: len(old_pattern.sub(' ', text.lower()).split()), corpus)
+    bench("tokenizer.tokens", lambda text: len(tokenizer.tokens(text)), corpus)
+    bench("tokenizer.iter_tokens", lambda text: sum(1 for _ in tokenizer.iter_tokens(text)), corpus)
+    bench("tokenizer.iter_tokens (streamed lines)",
+          lambda text: sum(1 for _ in tokenizer.iter_tokens(io.StringIO(text))), corpus)
+    bench("tokenizer.iter_keywords", lambda text: sum(1 for _ in tokenizer.iter_keywords(text, stop_words={'ve', 'and'})), corpus)
+    print("SUCCESS: tokenizer")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from translation_memory import TranslationMemory
+from translator_utils import (FakeBackend, Segment, collect_segments, run_batches, sync_translation,
+                              translate_resume_data, translate_segments)
+from profile_store import load_profile
+import copy
+import time
+
+user_profile = load_profile()
+
+# Runs the translation pipeline against a local fake translator, no network needed
+data = user_profile.get('tr', user_profile)
+translated_data, segments = collect_segments(data)
+print(f"Testing translation pipeline... {len(segments)} segments")
+
+try:
+    # Serial baseline: one round trip per segment, like the old implementation
+    serial = FakeBackend(latency=0.1)
+    start = time.perf_counter()
+    for segment in segments:
+        serial.translate_batch([segment.text])
+    serial_time = time.perf_counter() - start
+
+    backend = FakeBackend(latency=0.1)
+    start = time.perf_counter()
+    result = translate_resume_data(data, backend=backend, memory=False)
+    pipeline_time = time.perf_counter() - start
+
+    print(f"Serial:   {serial.calls} calls, {serial_time:.2f}s")
+    print(f"Pipeline: {backend.calls} calls, {pipeline_time:.2f}s")
+
+    # Same structure, every translated field went through the fake translator
+    assert all(key in result for key in translated_data)
+    assert len(result['experience']) == len(data.get('experience', []))
+    if data.get('personal', {}).get('summary'):
+        assert result['personal']['summary'].startswith("EN(")
+    print("SUCCESS: Output structure preserved")
+
+    # Small batches run concurrently on the thread pool
+    backend = FakeBackend(latency=0.1)
+    start = time.perf_counter()
+    translate_resume_data(data, backend=backend, max_workers=4, max_chars=300, memory=False)
+    print(f"SUCCESS: {backend.segments} segments in {backend.calls} calls, {time.perf_counter() - start:.2f}s")
+
+    # A failing first call is retried
+    flaky = FakeBackend(latency=0.05, fail_first=1)
+    translate_resume_data(data, backend=flaky, memory=False)
+    print(f"SUCCESS: Recovered from a failed call ({flaky.calls} calls)")
+
+    # A segment the translator returns None for fails alone, and is not stored in the memory
+    memory = TranslationMemory(':memory:')
+    gappy = FakeBackend(transform=lambda text: None if text == "Boş" else f"EN({text})")
+    texts = translate_segments(
+        [Segment(('a',), "Dolu", False, True), Segment(('b',), "Boş", False, False)], backend=gappy, memory=memory
+    )
+    assert texts == ["EN(Dolu)", "Boş"] and memory.get_many(["Boş"], 'tr', 'en') == {}
+    print("SUCCESS: A missing segment translation keeps its source text")
+
+    # Hung calls hold their worker thread; the whole run still gives up after total_timeout
+    start = time.perf_counter()
+    results, errors = run_batches(FakeBackend(latency=5), [["a"], ["b"]], max_workers=1, timeout=0.2,
+                                  retries=1, total_timeout=0.5)
+    elapsed = time.perf_counter() - start
+    assert results == [None, None] and all(isinstance(error, TimeoutError) for error in errors)
+    assert elapsed < 2, elapsed
+    print(f"SUCCESS: Hung translator abandoned after {elapsed:.2f}s")
+
+    # Second translation of an unchanged profile is served from the translation memory
+    memory = TranslationMemory(':memory:')
+    backend = FakeBackend(latency=0.1)
+    first = translate_resume_data(data, backend=backend, memory=memory)
+    calls = backend.calls
+    start = time.perf_counter()
+    second = translate_resume_data(data, backend=backend, memory=memory)
+    elapsed = time.perf_counter() - start
+    assert first == second and backend.calls == calls
+    print(f"SUCCESS: Re-translation with 0 remote calls in {elapsed * 1000:.1f} ms ({memory.stats()})")
+
+    # Sync after one edit: only the edited field is translated, manual English edits stay
+    if data.get('experience'):
+        edited = copy.deepcopy(data)
+        edited['experience'][0]['description'] = edited['experience'][0].get('description', '') + "\n• Yeni madde"
+        sources = {}
+        english = translate_resume_data(data, backend=FakeBackend(), memory=False, sources=sources)
+        # The source hashes are kept beside the profile, never in its rendered data
+        assert sources and all(not key.startswith('_') for key in english)
+        english['personal']['summary'] = "Manually edited summary"
+        synced, count = sync_translation(edited, english, sources=sources, backend=FakeBackend(), memory=False)
+        assert count == 1
+        assert synced['personal']['summary'] == "Manually edited summary"
+        assert synced['experience'][0]['description'].endswith("Yeni madde)")
+        print(f"SUCCESS: Sync re-translated {count} field, kept manual edits")
+
+except Exception as e:
+    print(f"FAILED: {str(e)}")
+    import traceback
+    traceback.print_exc()